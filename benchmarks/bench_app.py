@@ -0,0 +1,239 @@
+"""
+🏁 بنچمارک بدون مرورگر اجرای دوباره اسکریپت و حافظه نشست‌ها
+
+اپ با AppTest (بدون مرورگر) اجرا و این موارد اندازه‌گیری می‌شود:
+
+- زمان هر اجرای کامل main() بدون قیمت و با قیمت بارگذاری‌شده
+- هزینه یک دور بروزرسانی قیمت (poll_once)
+- حافظه هر نشست (tracemalloc)، کل و سهم هسته اپ
+- N نشست هم‌زمان که هرکدام چند بار اجرا می‌شوند
+
+هر سناریو در یک پروسه جدا اجرا می‌شود تا کش‌های سطح پروسه روی هم اثر
+نگذارند. خروجی JSON است و برای مقایسه نسخه‌ها مناسب است:
+
+    python benchmarks/bench_app.py --reruns 30 --sessions 20 -o bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, 'streamlit_app')
+APP = os.path.join(APP_DIR, 'app.py')
+
+# آدرسی که هیچ سروری روی آن نیست (برای سناریوی «بدون قیمت»)
+DEAD_URL = 'http://127.0.0.1:9/'
+
+
+def summarize(samples):
+    """خلاصه آماری زمان‌ها (میلی‌ثانیه)"""
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        'n': len(ordered),
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'p50_ms': pick(0.5) * 1000,
+        'p95_ms': pick(0.95) * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def new_session(timeout=60):
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(APP, default_timeout=timeout)
+
+
+def wait_for_quotes(at, timeout=10.0):
+    """اجرای دوباره تا زمانی که کارت قیمت نمایش داده شود"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        at.run()
+        if at.metric and any('ارزش' in m.label or 'تغییر' in m.label for m in at.metric):
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def bench_rerun(reruns):
+    """زمان اجرای دوباره در یک نشست"""
+    at = new_session()
+    at.run()
+    if os.environ.get('SILVER_BENCH_QUOTES') == '1':
+        wait_for_quotes(at)
+    samples = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - started)
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+    return summarize(samples)
+
+
+def bench_refresh(rounds):
+    """هزینه یک دور دریافت، قیمت‌گذاری، کندل و ثبت در انبار"""
+    sys.path.insert(0, APP_DIR)
+    from silver.analytics import PremiumAnalytics
+    from silver.bars import BarAggregator
+    from silver.poller import PricePoller
+    from silver.pricing import PriceModel
+    from silver.quote_cache import QuoteCache
+    from silver.ring_buffer import TickRingBuffer
+    from silver.tick_store import TickStore
+
+    model = PriceModel()
+    poller = PricePoller(model, QuoteCache(ttl=0), store=TickStore(), buffer=TickRingBuffer(),
+                         bars=BarAggregator(), analytics=PremiumAnalytics(model))
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        poller.poll_once()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def bench_memory(sessions):
+    """حافظه افزوده‌شده به ازای هر نشست جدید (بایت)"""
+    warm = new_session()
+    wait_for_quotes(warm)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = []
+    for _ in range(sessions):
+        at = new_session()
+        at.run()
+        kept.append(at)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    grown = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    # سهم هسته اپ (silver/) جدا از سربار Streamlit و AppTest
+    core = [tracemalloc.Filter(True, os.path.join(APP_DIR, 'silver', '*'))]
+    core_grown = sum(stat.size_diff for stat in after.filter_traces(core).compare_to(
+        before.filter_traces(core), 'filename'))
+    return {'sessions': sessions, 'total_bytes': grown, 'per_session_bytes': grown / sessions,
+            'core_bytes': core_grown, 'core_per_session_bytes': core_grown / sessions}
+
+
+def bench_concurrent(sessions, reruns):
+    """N نشست هم‌زمان، هرکدام reruns بار اجرا"""
+    warm = new_session()
+    wait_for_quotes(warm)
+
+    samples, errors = [], []
+    lock = threading.Lock()
+
+    def worker():
+        try:
+            at = new_session()
+            for _ in range(reruns):
+                started = time.perf_counter()
+                at.run()
+                with lock:
+                    samples.append(time.perf_counter() - started)
+        except Exception as exc:  # خطای هر نشست ثبت می‌شود و بقیه ادامه می‌دهند
+            with lock:
+                errors.append(repr(exc))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    result = summarize(samples) if samples else {}
+    result.update(sessions=sessions, wall_s=wall, reruns_per_s=len(samples) / wall, errors=errors)
+    return result
+
+
+SCENARIOS = {
+    'rerun_empty': lambda args: bench_rerun(args.reruns),
+    'rerun_loaded': lambda args: bench_rerun(args.reruns),
+    'refresh': lambda args: bench_refresh(args.reruns),
+    'session_memory': lambda args: bench_memory(args.sessions),
+    'concurrent_sessions': lambda args: bench_concurrent(args.sessions, args.reruns),
+}
+
+
+def source_keys():
+    """کلید همه منابع فهرست نمادها"""
+    sys.path.insert(0, APP_DIR)
+    from silver.instruments import DEFAULT_INSTRUMENTS
+    return [spec.key for item in DEFAULT_INSTRUMENTS for spec in item.sources]
+
+
+def scenario_env(name, workdir):
+    """متغیرهای محیطی هر سناریو (انبار موقت و منابع مرده برای حالت بدون قیمت)"""
+    env = dict(os.environ)
+    env['SILVER_TICK_DB'] = os.path.join(workdir, f'{name}.sqlite3')
+    env['SILVER_ALERTS_DB'] = os.path.join(workdir, f'{name}-alerts.sqlite3')
+    env['SILVER_BENCH_QUOTES'] = '0' if name == 'rerun_empty' else '1'
+    if name == 'rerun_empty':
+        for key in source_keys():
+            env[f'SILVER_SOURCE_{key.upper()}_URL'] = DEAD_URL
+    return env
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reruns', type=int, default=20, help='تعداد اجرا در هر سناریو')
+    parser.add_argument('--sessions', type=int, default=10, help='تعداد نشست‌های هم‌زمان')
+    parser.add_argument('--only', choices=sorted(SCENARIOS), action='append', help='فقط این سناریوها')
+    parser.add_argument('-o', '--output', help='مسیر فایل JSON خروجی (پیش‌فرض: stdout)')
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # اجرای یک سناریو در پروسه فرزند
+    if args.scenario:
+        json.dump(SCENARIOS[args.scenario](args), sys.stdout)
+        return
+
+    import streamlit
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'streamlit': streamlit.__version__,
+        'timestamp': time.time(),
+        'scenarios': {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.only or SCENARIOS:
+            command = [sys.executable, __file__, '--scenario', name,
+                       '--reruns', str(args.reruns), '--sessions', str(args.sessions)]
+            done = subprocess.run(command, env=scenario_env(name, workdir), capture_output=True, text=True)
+            if done.returncode:
+                results['scenarios'][name] = {'error': done.stderr.strip().splitlines()[-1:]}
+            else:
+                results['scenarios'][name] = json.loads(done.stdout.strip().splitlines()[-1])
+            print(f"✓ {name}", file=sys.stderr)
+
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
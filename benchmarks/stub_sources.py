@@ -0,0 +1,115 @@
+"""
+🧪 سرور محلی منابع قیمت برای آزمایش کلاینت HTTP
+
+هر منبع در مسیر /<key> یک JSON قیمت برمی‌گرداند و ETag / Last-Modified
+می‌فرستد؛ تا زمانی که قیمت عوض نشده، درخواست شرطی پاسخ 304 می‌گیرد.
+تأخیر و خطا برای هر منبع قابل تزریق است:
+
+    python benchmarks/stub_sources.py --port 8700 --latency 0.05 \\
+        --error kitco=1.0 --slow bloomberg=5 --change-every 10
+
+و سپس:
+
+    export SILVER_SOURCE_KITCO_URL=http://127.0.0.1:8700/kitco
+    ...
+
+با --print-env دستورهای export همه منابع چاپ می‌شود.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from email.utils import formatdate
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit_app'))
+from silver.instruments import DEFAULT_INSTRUMENTS  # noqa: E402
+
+# قیمت پایه هر منبع همه نمادهای فهرست: قیمت مرجع نماد با ضریب همان منبع
+BASE_PRICES = {
+    spec.key: round(item.reference * spec.weight, item.digits + 2)
+    for item in DEFAULT_INSTRUMENTS for spec in item.sources
+}
+
+
+class StubSources:
+    """وضعیت منابع ساختگی (قیمت، تأخیر، خطا و شمارنده‌ها)"""
+
+    def __init__(self, latency=0.0, errors=None, slow=None, change_every=0.0):
+        self.latency = latency
+        self.errors = errors or {}
+        self.slow = slow or {}
+        self.change_every = change_every
+        self.started = time.time()
+        self.hits = {key: 0 for key in BASE_PRICES}
+        self.not_modified = 0
+
+    def price(self, key):
+        """قیمت فعلی؛ هر change_every ثانیه یک بار عوض می‌شود"""
+        if not self.change_every:
+            return BASE_PRICES[key]
+        epoch = int(time.time() // self.change_every)
+        return round(BASE_PRICES[key] * (1 + random.Random(f'{key}{epoch}').uniform(-0.003, 0.003)), 4)
+
+    async def handle(self, request):
+        key = request.match_info['key']
+        if key not in BASE_PRICES:
+            raise web.HTTPNotFound()
+        self.hits[key] += 1
+
+        await asyncio.sleep(self.slow.get(key, self.latency))
+        if random.random() < self.errors.get(key, 0.0):
+            raise web.HTTPServiceUnavailable(text='injected error')
+
+        body = json.dumps({'price': self.price(key)})
+        etag = '"' + hashlib.md5(body.encode()).hexdigest()[:16] + '"'
+        changed_at = time.time() // self.change_every * self.change_every if self.change_every else self.started
+        modified = formatdate(changed_at, usegmt=True)
+        if request.headers.get('If-None-Match') == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(text=body, content_type='application/json',
+                            headers={'ETag': etag, 'Last-Modified': modified})
+
+    async def handle_stats(self, request):
+        return web.json_response({'hits': self.hits, 'not_modified': self.not_modified})
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get('/_stats', self.handle_stats)
+        app.router.add_get('/{key}', self.handle)
+        return app
+
+
+def _pairs(values, cast=float):
+    return {key: cast(value) for key, value in (item.split('=', 1) for item in values or ())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8700)
+    parser.add_argument('--latency', type=float, default=0.0, help='تأخیر پایه هر پاسخ (ثانیه)')
+    parser.add_argument('--error', action='append', metavar='KEY=RATE', help='احتمال خطای 503 یک منبع')
+    parser.add_argument('--slow', action='append', metavar='KEY=SECONDS', help='تأخیر مخصوص یک منبع')
+    parser.add_argument('--change-every', type=float, default=0.0, help='فاصله تغییر قیمت‌ها (0 = ثابت)')
+    parser.add_argument('--print-env', action='store_true', help='چاپ متغیرهای محیطی منابع و خروج')
+    args = parser.parse_args()
+
+    if args.print_env:
+        for key in BASE_PRICES:
+            print(f"export SILVER_SOURCE_{key.upper()}_URL=http://{args.host}:{args.port}/{key}")
+        return
+
+    stub = StubSources(args.latency, _pairs(args.error), _pairs(args.slow), args.change_every)
+    web.run_app(stub.app(), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
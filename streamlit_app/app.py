@@ -3,10 +3,43 @@
 نسخه با قیمت‌های دقیق امروز - دسامبر ۲۰۲۴
 """
 
+import atexit
+import io
+import os
 import streamlit as st
 from datetime import datetime, timedelta
-import time
-import random
+
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import markup
+from silver.alerts import AlertBook
+from silver.bars import local_utc_offset
+from silver.derived import CARD_VALUES, GraphPool, price_graph
+from silver.downsample import DownsampleMemo
+from silver.pricing import GRAMS_PER_OUNCE, PriceModel
+from silver.profiling import PROFILER
+from silver.ring_buffer import DEFAULT_CAPACITY, TickRingBuffer
+from silver.sessions import DEFAULT_IDLE_AFTER, SessionRegistry, release_state
+from silver.shared import INGEST_MODE, SnapshotReader, SnapshotStore
+from silver.tick_store import TickStore
+from silver.valuation import to_grams, value_csv
+
+# بازه‌های قابل انتخاب تاریخچه و سقف نقاط ارسالی به مرورگر
+HISTORY_WINDOWS = (10, 100, 1_000, 10_000, 100_000)
+CHART_POINTS = 800
+TABLE_ROWS = 10
+
+# تعداد ستون کارت‌های فشرده نمادهای دیگر
+CARD_COLUMNS = 3
+
+# حالت نشستی که پس از بیکاری نگه داشته می‌شود (تنظیمات کاربر)؛ بقیه آزاد می‌شود
+SESSION_SETTINGS = ('auto_refresh', 'refresh_every', 'manual_rate', 'manual_exchange_rate', 'alert_seq')
+
+# فاصله‌های قابل انتخاب بروزرسانی خودکار بخش‌های زنده (ثانیه)
+REFRESH_INTERVALS = (5, 10, 15, 30, 60)
+DEFAULT_REFRESH = 15
 
 # تنظیمات صفحه
 st.set_page_config(
@@ -15,217 +48,173 @@ st.set_page_config(
     layout="wide"
 )
 
-# استایل سفارشی
-st.markdown("""
-<style>
-    .main-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem;
-        border-radius: 15px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .price-card {
-        padding: 1.5rem;
-        border-radius: 12px;
-        background: white;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.05);
-        border: 1px solid #e5e7eb;
-        margin-bottom: 1rem;
-    }
-    
-    .global-card {
-        border-top: 4px solid #3b82f6;
-    }
-    
-    .iran-card {
-        border-top: 4px solid #10b981;
-    }
-    
-    .real-time-badge {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        display: inline-block;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
+# استایل سفارشی (یک بار در هر پروسه ساخته و فشرده شده)
+st.markdown(markup.CUSTOM_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def get_tick_store():
+    """انبار دائمی تاریخچه تیک‌ها (مسیر از SILVER_TICK_DB)"""
+    store = TickStore()
+    # تیک‌های در صف نوشتن دسته‌ای هنگام خروج پروسه از دست نمی‌روند
+    atexit.register(store.flush)
+    return store
+
+
+@st.cache_resource
+def get_tick_buffer():
+    """بافر حلقوی تاریخچه در حافظه، پرشده از انبار دائمی"""
+    buffer = TickRingBuffer(int(os.environ.get('SILVER_HISTORY_CAPACITY', DEFAULT_CAPACITY)))
+    buffer.extend(get_tick_store().last(buffer.capacity))
+    return buffer
+
+
+@st.cache_resource
+def get_alert_book():
+    """دفتر هشدارهای قیمت مشترک (مسیر از SILVER_ALERTS_DB)"""
+    return AlertBook()
+
+
+@st.cache_resource
+def get_poller():
+    """منبع عکس‌فوری‌ها: نخ دریافت درون اپ یا خواننده پروسه ingest.py (SILVER_INGEST)"""
+    if INGEST_MODE == 'external':
+        # فقط خواندن از انبار مشترک؛ دریافت در پروسه جدا انجام می‌شود
+        store = get_tick_store()
+        return SnapshotReader(PriceModel(), SnapshotStore(store.path), store, get_tick_buffer())
     
-    .footer {
-        margin-top: 3rem;
-        padding: 1rem;
-        background: #f8fafc;
-        border-radius: 10px;
-        text-align: center;
-        color: #64748b;
-    }
-</style>
-""", unsafe_allow_html=True)
+    # زنجیره دریافت فقط در حالت دریافت درون اپ وارد می‌شود (شروع سرد سبک‌تر در حالت external)
+    from silver.pipeline import build_poller
+    poller = build_poller(
+        store=get_tick_store(),
+        buffer=get_tick_buffer(),
+        alerts=get_alert_book()
+    )
+    poller.start()
+    return poller
+
+
+@st.cache_resource
+def get_derived_graphs(_model):
+    """گراف‌های مقادیر مشتق‌شده کارت‌ها، مشترک بین نشست‌ها"""
+    return GraphPool(lambda: price_graph(_model))
+
+
+@st.cache_resource
+def get_chart_picks():
+    """اندیس‌های کاهش نمونه نمودار تاریخچه، مشترک بین نشست‌ها"""
+    return DownsampleMemo()
+
+
+@st.cache_resource
+def get_session_registry():
+    """زمان آخرین تعامل نشست‌ها (مدت بیکاری از SILVER_SESSION_IDLE)"""
+    return SessionRegistry(float(os.environ.get('SILVER_SESSION_IDLE', DEFAULT_IDLE_AFTER)))
+
+
+@st.cache_resource
+def get_api_server():
+    """API JSON/SSE روی همان منبع و انبار اپ (فقط با SILVER_API_PORT)"""
+    from silver.api import ApiServer
+    server = ApiServer(get_poller(), get_tick_store())
+    server.start()
+    return server
+
+
+@st.cache_data(max_entries=4, show_spinner="🧮 در حال ارزش‌گذاری دارایی‌ها...")
+def value_portfolio(file_id, _uploaded, usd_per_ounce, toman_per_gram):
+    """ارزش‌گذاری فایل آپلودشده (کش بر اساس شناسه فایل و قیمت‌ها)
+
+    خروجی تکه‌به‌تکه در یک بافر دودویی نوشته و همان بافر به دکمه دریافت
+    داده می‌شود (بدون کپی متنی و بایتی کل فایل).
+    """
+    _uploaded.seek(0)
+    output = io.BytesIO()
+    totals = value_csv(_uploaded, output, usd_per_ounce, toman_per_gram)
+    output.seek(0)
+    return totals, output
 
 
 class SilverPriceTracker:
     """ردیاب قیمت نقره با قیمت‌های دقیق امروز"""
     
     def __init__(self):
-        # قیمت‌های واقعی امروز (دسامبر 2024)
-        self.today_prices = {
-            'global': {
-                'current': 77.665,  # قیمت دقیق از Investing.com
-                'change': 7.205,    # تغییر امروز
-                'change_percent': 10.23,  # درصد تغییر
-                'symbol': 'SIH6',   # نماد معاملاتی
-                'currency': 'USD',
-                'unit': 'ounce',
-                'sources': [
-                    {'name': 'Investing.com', 'weight': 1.0},
-                    {'name': 'Kitco', 'weight': 1.001},
-                    {'name': 'Bloomberg', 'weight': 0.999}
-                ],
-                'range_today': {
-                    'high': 78.20,
-                    'low': 76.50,
-                    'open': 76.80
-                }
-            },
-            'iran': {
-                # قیمت امروز ایران (بر اساس نرخ دلار ~600,000 ریال)
-                'current_per_gram': 470000,  # تومان/گرم (محاسبه شده)
-                'range_today': {
-                    'min': 460000,
-                    'max': 480000
-                },
-                'sources': [
-                    {'name': 'TGJU', 'weight': 1.0},
-                    {'name': 'طلاچارت', 'weight': 1.02},
-                    {'name': 'نرخ‌یاب', 'weight': 0.98}
-                ]
-            }
-        }
-        
-        # نرخ دلار امروز (دسامبر 2024)
-        self.base_exchange_rate = 600000  # ریال
-        
-        # مقداردهی اولیه session state
-        if 'prices' not in st.session_state:
-            st.session_state.prices = {
-                'global': None,
-                'iran': None,
-                'last_update': None,
-                'history': []
-            }
-        
-        if 'exchange_rate' not in st.session_state:
-            st.session_state.exchange_rate = self.base_exchange_rate
+        self.poller = get_poller()
+        if os.environ.get('SILVER_API_PORT'):
+            get_api_server()
+        self.model = self.poller.model
+        self.base_exchange_rate = self.model.base_exchange_rate
+        
+        # آخرین عکس‌فوری بازار؛ در طول این اجرا ثابت می‌ماند. عکس‌فوری و
+        # قیمت‌هایش با ارجاع بین نشست‌ها مشترک‌اند و در session state نیستند
+        self.snapshot = self.poller.snapshot
+        
+        # مقادیر مشتق‌شده کارت‌ها؛ فقط با تغییر ورودی‌ها دوباره حساب می‌شوند
+        self.derived = get_derived_graphs(self.model)
+        
+        # اجرای کامل یعنی تعامل کاربر، مگر اجرایی که خود اپ برای توقف نشست
+        # بیکار درخواست کرده است
+        ctx = get_script_run_ctx()
+        self.session_id = ctx.session_id if ctx else ''
+        self.sessions = get_session_registry()
+        if not st.session_state.pop('pausing', False):
+            self.sessions.sweep()
+            self.sessions.touch(self.session_id)
+        
+        # فاصله بروزرسانی بخش‌های زنده در اجرای کامل فعلی
+        self.interval = None
+        
+        # هشدارهای اجراشده پیش از باز شدن این نشست اعلان نمی‌شوند
+        self.alerts = get_alert_book()
+        if 'alert_seq' not in st.session_state:
+            st.session_state.alert_seq = self.alerts.last_seq
+    
+    @property
+    def idle(self):
+        """این نشست مدتی تعاملی نداشته و بروزرسانی خودکارش متوقف است"""
+        return self.sessions.is_idle(self.session_id)
+    
+    @property
+    def refresh_interval(self):
+        """فاصله بروزرسانی خودکار بخش‌های زنده (None = خاموش)"""
+        if not st.session_state.get('auto_refresh', True) or self.idle:
+            return None
+        return st.session_state.get('refresh_every', DEFAULT_REFRESH)
     
-    def get_todays_global_price(self):
-        """دریافت قیمت جهانی امروز با تغییرات لحظه‌ای"""
-        base_price = self.today_prices['global']['current']
-        
-        # تغییرات لحظه‌ای کوچک (±0.3%)
-        minute_change = random.uniform(-0.003, 0.003)
-        current_price = base_price * (1 + minute_change)
-        
-        # محدود کردن به بازه روز
-        current_price = max(self.today_prices['global']['range_today']['low'],
-                           min(self.today_prices['global']['range_today']['high'], current_price))
-        
-        # انتخاب تصادفی منبع
-        source = random.choice(self.today_prices['global']['sources'])
-        final_price = current_price * source['weight']
-        
-        # تغییر لحظه‌ای
-        instant_change = random.uniform(-0.1, 0.1)
-        
-        return {
-            'price': round(final_price + instant_change, 3),  # 3 رقم اعشار
-            'change': round(self.today_prices['global']['change'] + instant_change, 3),
-            'change_percent': round(self.today_prices['global']['change_percent'] + (minute_change * 100), 2),
-            'source': source['name'],
-            'symbol': self.today_prices['global']['symbol'],
-            'timestamp': datetime.now(),
-            'weight': 'ounce',
-            'currency': 'USD',
-            'high_today': self.today_prices['global']['range_today']['high'],
-            'low_today': self.today_prices['global']['range_today']['low'],
-            'open_today': self.today_prices['global']['range_today']['open']
-        }
+    def sync_snapshot(self):
+        """خواندن آخرین عکس‌فوری در ابتدای اجرای هر بخش زنده"""
+        if self.interval is not None and self.idle:
+            # زبانه رهاشده: حالت نشست به‌جز تنظیمات کاربر آزاد می‌شود و یک
+            # اجرای کامل بدون زمان‌سنج بخش‌های زنده انجام می‌شود
+            release_state(st.session_state, SESSION_SETTINGS)
+            st.session_state.pausing = True
+            st.rerun()
+        self.snapshot = self.poller.snapshot
     
-    def get_todays_iran_price(self):
-        """دریافت قیمت ایران امروز"""
-        base_price = self.today_prices['iran']['current_per_gram']
-        
-        # تغییرات روزانه ایران (بین -0.5% تا +1.5%)
-        daily_change = random.uniform(-0.005, 0.015)
-        current_price = base_price * (1 + daily_change)
-        
-        # محدود کردن به بازه روز
-        current_price = max(self.today_prices['iran']['range_today']['min'],
-                           min(self.today_prices['iran']['range_today']['max'], current_price))
-        
-        # انتخاب تصادفی منبع
-        source = random.choice(self.today_prices['iran']['sources'])
-        final_price = current_price * source['weight']
-        
-        # محاسبه معادل دلاری
-        usd_price = (final_price * 10) / st.session_state.exchange_rate
-        
-        # محاسبه پریمیوم نسبت به جهانی
-        global_per_gram_usd = self.today_prices['global']['current'] / 31.1035
-        premium = ((usd_price - global_per_gram_usd) / global_per_gram_usd) * 100
-        
-        return {
-            'price': round(final_price, 0),
-            'usd_equivalent': round(usd_price, 4),
-            'premium_percent': round(premium, 2),
-            'source': source['name'],
-            'timestamp': datetime.now(),
-            'weight': 'گرم',
-            'currency': 'TOMAN'
-        }
+    def touch(self):
+        """ثبت تعامل کاربر با ویجت‌های بخش‌های زنده"""
+        self.sessions.touch(self.session_id)
+    
+    @property
+    def exchange_rate(self):
+        """نرخ دلار این نشست: نرخ دستی کاربر یا آخرین نرخ منابع"""
+        if st.session_state.get('manual_rate'):
+            return st.session_state.get('manual_exchange_rate', self.feed_exchange_rate)
+        return self.feed_exchange_rate
+    
+    @property
+    def feed_exchange_rate(self):
+        """آخرین نرخ دلار منابع ارز (یا نرخ مرجع پیش از اولین دریافت)"""
+        return self.snapshot.exchange_rate if self.snapshot else self.base_exchange_rate
     
     def update_prices(self):
-        """به‌روزرسانی قیمت‌ها"""
+        """درخواست بروزرسانی فوری از نخ پس‌زمینه"""
         with st.spinner("📡 در حال دریافت قیمت‌های لحظه‌ای..."):
-            time.sleep(1.2)
-            
-            global_price = self.get_todays_global_price()
-            iran_price = self.get_todays_iran_price()
-            
-            st.session_state.prices['global'] = global_price
-            st.session_state.prices['iran'] = iran_price
-            st.session_state.prices['last_update'] = datetime.now()
-            
-            # اضافه به تاریخچه
-            st.session_state.prices['history'].append({
-                'time': datetime.now(),
-                'global': global_price['price'],
-                'iran': iran_price['price'],
-                'global_change': global_price['change_percent'],
-                'iran_premium': iran_price['premium_percent']
-            })
-            
-            # محدود کردن تاریخچه به 30 رکورد
-            if len(st.session_state.prices['history']) > 30:
-                st.session_state.prices['history'] = st.session_state.prices['history'][-30:]
-            
-            return True
+            return self.poller.refresh()
     
     def display_header(self):
         """نمایش هدر"""
-        st.markdown("""
-        <div class="main-header">
-            <h1 style="margin:0; font-size: 2.8rem;">💰 ردیاب لحظه‌ای قیمت نقره</h1>
-            <p style="margin:0.5rem 0 0 0; opacity: 0.9; font-size: 1.1rem;">
-                قیمت واقعی امروز - بروزرسانی لحظه‌ای | داده‌های زنده بازار
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # نشانگر Real-time
-        st.markdown('<div class="real-time-badge">📈 REAL-TIME DATA | دسامبر ۲۰۲۴</div>', unsafe_allow_html=True)
+        st.markdown(markup.HEADER_HTML, unsafe_allow_html=True)
     
     def display_real_time_info(self):
         """نمایش اطلاعات لحظه‌ای"""
@@ -242,8 +231,8 @@ class SilverPriceTracker:
             st.metric("🏛️ وضعیت بازار", market_status)
         
         with col4:
-            if st.session_state.prices['last_update']:
-                time_diff = (datetime.now() - st.session_state.prices['last_update']).seconds
+            if self.snapshot:
+                time_diff = (datetime.now() - self.snapshot.timestamp).seconds
                 status = "🟢 لحظه‌ای" if time_diff < 60 else "🟡 چند دقیقه قبل"
                 st.metric("🔄 آخرین بروزرسانی", status)
             else:
@@ -259,18 +248,21 @@ class SilverPriceTracker:
             if st.button("🔄 دریافت قیمت لحظه‌ای", 
                         type="primary", 
                         use_container_width=True,
-                        help="دریافت آخرین قیمت‌های لحظه‌ای از بازار"):
+                        help="دریافت آخرین قیمت‌های لحظه‌ای از بازار",
+                        on_click=self.touch):
                 if self.update_prices():
+                    # کارت‌های پایین همین بخش با عکس‌فوری تازه رسم می‌شوند
+                    self.sync_snapshot()
                     st.success("✅ قیمت‌های لحظه‌ای دریافت شدند")
-                    time.sleep(1)
-                    st.rerun()
+                else:
+                    st.error("❌ هیچ منبعی در مهلت مقرر پاسخ نداد")
     
     def display_global_price_card(self):
         """نمایش کارت قیمت جهانی"""
         st.markdown("### 🌍 قیمت جهانی نقره")
         
-        if st.session_state.prices['global']:
-            price = st.session_state.prices['global']
+        if self.snapshot:
+            price = self.snapshot.global_quote
             
             st.markdown(f'<div class="price-card global-card">', unsafe_allow_html=True)
             
@@ -278,9 +270,12 @@ class SilverPriceTracker:
             col1, col2, col3 = st.columns([2, 1, 1])
             
             with col1:
-                st.markdown(f"#### 💰 {price['source']}")
-                st.markdown(f"### **${price['price']:,.3f}**")
-                st.markdown(f"**نماد:** {price['symbol']}")
+                st.markdown(markup.lines(
+                    f"#### 💰 {price['source']}",
+                    f"### **${price['price']:,.3f}**",
+                    f"**نماد:** {price['symbol']}"
+                ))
+                st.caption(markup.deviations_line(price))
             
             with col2:
                 st.metric(
@@ -291,30 +286,38 @@ class SilverPriceTracker:
                 )
             
             with col3:
-                st.markdown("**📊 بازه امروز:**")
-                st.markdown(f"🔺 **سقف:** ${price['high_today']:.2f}")
-                st.markdown(f"🔻 **کف:** ${price['low_today']:.2f}")
-                st.markdown(f"🟡 **آغاز:** ${price['open_today']:.2f}")
+                st.markdown(markup.lines(
+                    "**📊 بازه امروز:**",
+                    f"🔺 **سقف:** ${price['high_today']:.2f}",
+                    f"🔻 **کف:** ${price['low_today']:.2f}",
+                    f"🟡 **آغاز:** ${price['open_today']:.2f}"
+                ))
             
             # ردیف دوم: اطلاعات تکمیلی
             st.markdown("---")
             col4, col5, col6 = st.columns(3)
             
             with col4:
-                st.markdown("**📈 اطلاعات:**")
-                st.markdown(f"• واحد: {price['weight']}")
-                st.markdown(f"• ارز: {price['currency']}")
-                st.markdown(f"• هر اونس: 31.1035 گرم")
+                st.markdown(markup.lines(
+                    "**📈 اطلاعات:**",
+                    f"• واحد: {price['weight']}",
+                    f"• ارز: {price['currency']}",
+                    "• هر اونس: 31.1035 گرم"
+                ))
             
             with col5:
-                st.markdown("**⏰ زمان:**")
-                st.markdown(f"• بروزرسانی: {price['timestamp'].strftime('%H:%M:%S')}")
-                st.markdown(f"• تاریخ: {price['timestamp'].strftime('%Y-%m-%d')}")
+                st.markdown(markup.lines(
+                    "**⏰ زمان:**",
+                    f"• بروزرسانی: {price['timestamp'].strftime('%H:%M:%S')}",
+                    f"• تاریخ: {price['timestamp'].strftime('%Y-%m-%d')}"
+                ))
             
             with col6:
-                st.markdown("**💡 محاسبه:**")
-                st.markdown(f"• هر گرم: ${price['price']/31.1035:.4f}")
-                st.markdown(f"• هر کیلو: ${(price['price']/31.1035)*1000:.2f}")
+                st.markdown(markup.lines(
+                    "**💡 محاسبه:**",
+                    f"• هر گرم: ${price['price']/31.1035:.4f}",
+                    f"• هر کیلو: ${(price['price']/31.1035)*1000:.2f}"
+                ))
             
             st.markdown('</div>', unsafe_allow_html=True)
         else:
@@ -333,8 +336,20 @@ class SilverPriceTracker:
         """نمایش کارت قیمت ایران"""
         st.markdown("### 🇮🇷 قیمت نقره در ایران")
         
-        if st.session_state.prices['iran']:
-            price = st.session_state.prices['iran']
+        if self.snapshot:
+            price = self.snapshot.iran_quote
+            
+            # ورودی‌های گراف مشترک (نرخ منابع یا همین نرخ دستی)؛ مقادیر مشتق
+            # فقط در صورت تغییر ورودی حساب می‌شوند
+            exchange_rate = self.exchange_rate
+            key = exchange_rate if st.session_state.get('manual_rate') else 'feed'
+            derived = self.derived.evaluate(key, {
+                'iran_price': price['price'],
+                'global_price': self.snapshot.global_quote['price'],
+                'exchange_rate': exchange_rate,
+            }, CARD_VALUES)
+            usd_equivalent = derived['usd_equivalent']
+            premium_percent = derived['premium_percent']
             
             st.markdown(f'<div class="price-card iran-card">', unsafe_allow_html=True)
             
@@ -342,49 +357,59 @@ class SilverPriceTracker:
             col1, col2, col3 = st.columns([2, 1, 1])
             
             with col1:
-                st.markdown(f"#### 🏛️ {price['source']}")
-                st.markdown(f"### **{price['price']:,.0f} تومان**")
-                st.markdown(f"**واحد:** {price['weight']}")
+                st.markdown(markup.lines(
+                    f"#### 🏛️ {price['source']}",
+                    f"### **{price['price']:,.0f} تومان**",
+                    f"**واحد:** {price['weight']}"
+                ))
+                st.caption(markup.deviations_line(price))
             
             with col2:
-                if price.get('usd_equivalent'):
+                if usd_equivalent:
                     st.metric(
                         label="معادل دلاری",
-                        value=f"${price['usd_equivalent']:.4f}",
+                        value=f"${usd_equivalent:.4f}",
                         delta=None
                     )
             
             with col3:
-                if price.get('premium_percent'):
-                    premium_status = "بالاتر از جهانی" if price['premium_percent'] > 0 else "پایین‌تر"
+                if premium_percent:
+                    premium_status = "بالاتر از جهانی" if premium_percent > 0 else "پایین‌تر"
                     st.metric(
                         label="پریمیوم بازار",
-                        value=f"{price['premium_percent']:+.1f}%",
+                        value=f"{premium_percent:+.1f}%",
                         delta=premium_status,
-                        delta_color="inverse" if price['premium_percent'] > 10 else "normal"
+                        delta_color="inverse" if premium_percent > 10 else "normal"
                     )
+                st.caption(markup.premium_stats_line(self.snapshot.premium_stats))
             
             # ردیف دوم: اطلاعات تکمیلی
             st.markdown("---")
             col4, col5, col6 = st.columns(3)
             
             with col4:
-                st.markdown("**💰 تبدیل واحد:**")
-                st.markdown(f"• هر گرم: {price['price']:,.0f} تومان")
-                st.markdown(f"• هر کیلو: {price['price']*1000:,.0f} تومان")
-                st.markdown(f"• هر مثقال: {price['price']*4.6:,.0f} تومان")
+                st.markdown(markup.lines(
+                    "**💰 تبدیل واحد:**",
+                    f"• هر گرم: {price['price']:,.0f} تومان",
+                    f"• هر کیلو: {derived['per_kilo']:,.0f} تومان",
+                    f"• هر مثقال: {derived['per_mesghal']:,.0f} تومان"
+                ))
             
             with col5:
-                st.markdown("**💱 نرخ ارز:**")
-                st.markdown(f"• دلار: {st.session_state.exchange_rate:,.0f} ریال")
-                st.markdown(f"• هر دلار: {st.session_state.exchange_rate/10:,.0f} تومان")
-                st.markdown("• تاریخ: دسامبر ۲۰۲۴")
+                st.markdown(markup.lines(
+                    "**💱 نرخ ارز:**",
+                    f"• دلار: {exchange_rate:,.0f} ریال",
+                    f"• هر دلار: {derived['toman_per_usd']:,.0f} تومان",
+                    "• تاریخ: دسامبر ۲۰۲۴"
+                ))
             
             with col6:
-                st.markdown("**📅 اطلاعات:**")
-                st.markdown(f"• بروزرسانی: {price['timestamp'].strftime('%H:%M:%S')}")
-                st.markdown(f"• کیفیت: ۹۹۹ عیار")
-                st.markdown(f"• مالیات: شامل")
+                st.markdown(markup.lines(
+                    "**📅 اطلاعات:**",
+                    f"• بروزرسانی: {price['timestamp'].strftime('%H:%M:%S')}",
+                    "• کیفیت: ۹۹۹ عیار",
+                    "• مالیات: شامل"
+                ))
             
             st.markdown('</div>', unsafe_allow_html=True)
         else:
@@ -399,6 +424,48 @@ class SilverPriceTracker:
             برای دریافت قیمت لحظه‌ای، دکمه بالا را بزنید.
             """)
     
+    def display_live_prices(self):
+        """بخش زنده: پنل کنترل و کارت‌های قیمت جهانی و ایران"""
+        self.sync_snapshot()
+        if self.interval is None and st.session_state.get('auto_refresh', True):
+            st.info("⏸️ بروزرسانی خودکار این زبانه به دلیل بی‌تعاملی متوقف شده است.")
+            if st.button("▶️ ادامه بروزرسانی"):
+                st.rerun()
+        self.display_control_panel()
+        
+        # کارت‌ها از فهرست نمادها: نمادهای اصلی کارت مخصوص، بقیه کارت فشرده
+        renderers = {'global': self.display_global_price_card, 'iran': self.display_iran_price_card}
+        compact = []
+        for item in self.model.registry:
+            if item.key in renderers:
+                renderers[item.key]()
+            elif item.card:
+                compact.append(item)
+        self.display_instrument_cards(compact)
+        self.notify_alerts()
+    
+    def display_instrument_cards(self, instruments):
+        """کارت‌های فشرده نمادهای دیگر فهرست (فلزات، سکه و ارزها)"""
+        if not instruments:
+            return
+        st.markdown("### 🪙 فلزات، سکه و ارزها")
+        quotes = self.snapshot.quotes if self.snapshot and self.snapshot.quotes else {}
+        columns = st.columns(CARD_COLUMNS)
+        for index, item in enumerate(instruments):
+            quote = quotes.get(item.key)
+            with columns[index % CARD_COLUMNS]:
+                label = f"{item.icon} {item.name} ({item.unit})"
+                if quote is None:
+                    st.metric(label, "—")
+                    continue
+                st.metric(
+                    label=label,
+                    value=markup.format_price(item.currency, quote['price'], item.digits),
+                    delta=f"{quote['change_percent']:+.2f}%",
+                    help=f"تغییر نسبت به قیمت مرجع امروز {markup.format_price(item.currency, item.reference, item.digits)}"
+                )
+                st.caption(markup.instrument_card_caption(quote))
+    
     def display_calculator(self):
         """ماشین‌حساب تبدیل"""
         st.markdown("---")
@@ -411,104 +478,151 @@ class SilverPriceTracker:
             unit = st.selectbox("واحد", ["گرم", "اونس", "کیلوگرم", "مثقال"])
         
         with col2:
-            if st.session_state.prices['global']:
-                global_price = st.session_state.prices['global']['price']
-                
-                # تبدیل به اونس
-                if unit == "گرم":
-                    amount_in_ounce = amount / 31.1035
-                elif unit == "کیلوگرم":
-                    amount_in_ounce = (amount * 1000) / 31.1035
-                elif unit == "مثقال":
-                    amount_in_ounce = (amount * 4.6) / 31.1035
-                else:
-                    amount_in_ounce = amount
-                
-                value_usd = amount_in_ounce * global_price
+            if self.snapshot:
+                global_price = self.snapshot.global_quote['price']
+                value_usd = to_grams(amount, unit) / GRAMS_PER_OUNCE * global_price
                 st.metric("💰 ارزش به دلار", f"${value_usd:,.2f}")
         
         with col3:
-            if st.session_state.prices['iran']:
-                iran_price = st.session_state.prices['iran']['price']
-                
-                # تبدیل به گرم
-                if unit == "اونس":
-                    amount_in_gram = amount * 31.1035
-                elif unit == "کیلوگرم":
-                    amount_in_gram = amount * 1000
-                elif unit == "مثقال":
-                    amount_in_gram = amount * 4.6
-                else:
-                    amount_in_gram = amount
-                
-                value_toman = amount_in_gram * iran_price
+            if self.snapshot:
+                iran_price = self.snapshot.iran_quote['price']
+                value_toman = to_grams(amount, unit) * iran_price
                 st.metric("💰 ارزش به تومان", f"{value_toman:,.0f} تومان")
+        
+        self.display_portfolio_upload()
+    
+    def display_portfolio_upload(self):
+        """ارزش‌گذاری فایل دارایی‌ها (CSV با ستون‌های amount, unit, purity)"""
+        uploaded = st.file_uploader(
+            "📁 ارزش‌گذاری فایل دارایی (CSV)",
+            type="csv",
+            key="portfolio_file",
+            help="ستون‌ها: amount، unit (گرم/اونس/کیلوگرم/مثقال یا g/oz/kg)، purity (اختیاری، مثلاً 999)"
+        )
+        if uploaded is None or not self.snapshot:
+            return
+        
+        try:
+            totals, result = value_portfolio(
+                uploaded.file_id, uploaded,
+                self.snapshot.global_quote['price'], self.snapshot.iran_quote['price']
+            )
+        except ValueError as exc:
+            st.error(f"❌ خطا در خواندن فایل: {exc}")
+            return
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("📄 تعداد ردیف", f"{totals['rows']:,}",
+                    delta=f"{totals['invalid']:,} نامعتبر" if totals['invalid'] else None,
+                    delta_color="inverse")
+        col2.metric("💰 مجموع به دلار", f"${totals['value_usd']:,.2f}")
+        col3.metric("💰 مجموع به تومان", f"{totals['value_toman']:,.0f} تومان")
+        
+        st.download_button(
+            "⬇️ دریافت فایل ارزش‌گذاری",
+            data=result,
+            file_name="silver_valuation.csv",
+            mime="text/csv"
+        )
     
     def display_history(self):
-        """نمایش تاریخچه"""
-        if len(st.session_state.prices['history']) > 0:
-            st.markdown("---")
-            st.markdown("### 📊 تاریخچه لحظه‌ای (آخرین ۱۰ بروزرسانی)")
-            
-            # نمایش آخرین ۱۰ رکورد
-            recent = st.session_state.prices['history'][-10:]
-            
-            for entry in reversed(recent):
-                col1, col2, col3, col4, col5 = st.columns(5)
-                
-                with col1:
-                    st.markdown(f"**{entry['time'].strftime('%H:%M:%S')}**")
-                
-                with col2:
-                    st.markdown(f"🌍 **${entry['global']:.3f}**")
-                
-                with col3:
-                    st.markdown(f"📈 **{entry.get('global_change', 0):+.1f}%**")
-                
-                with col4:
-                    st.markdown(f"🇮🇷 **{entry['iran']:,.0f}**")
-                
-                with col5:
-                    if entry.get('iran_premium'):
-                        premium_text = f"{entry['iran_premium']:+.1f}%"
-                        st.markdown(f"⚖️ **{premium_text}**")
+        """نمایش تاریخچه (یک نمودار و یک جدول، مستقل از طول بازه)"""
+        self.sync_snapshot()
+        buffer = get_tick_buffer()
+        if len(buffer) == 0:
+            return
+        
+        st.markdown("---")
+        st.markdown("### 📊 تاریخچه لحظه‌ای")
+        
+        windows = [n for n in HISTORY_WINDOWS if n < len(buffer)] + [len(buffer)]
+        window = windows[0]
+        if len(windows) > 1:
+            window = st.select_slider(
+                "تعداد بروزرسانی‌ها",
+                options=windows,
+                value=window,
+                format_func=lambda n: f"آخرین {n:,}",
+                on_change=self.touch
+            )
+        
+        # نمای بدون کپی از بافر حلقوی؛ فقط نقاط منتخب به مرورگر فرستاده می‌شوند.
+        # نقاط هر (نسخه بافر، بازه) یک بار برای همه نشست‌ها انتخاب می‌شوند
+        version, recent = buffer.versioned(window)
+        picked = get_chart_picks().pick(version, recent, CHART_POINTS)
+        offset_ns = local_utc_offset() * 10**9
+        times = (recent.ts[picked] + offset_ns).astype('datetime64[ns]')
+        
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        fig.add_trace(go.Scattergl(x=times, y=recent.global_price[picked], name="🌍 جهانی ($)",
+                                   line=dict(color="#3b82f6")), secondary_y=False)
+        fig.add_trace(go.Scattergl(x=times, y=recent.iran_price[picked], name="🇮🇷 ایران (تومان)",
+                                   line=dict(color="#10b981")), secondary_y=True)
+        
+        # سطوح حمایت/مقاومت پیوت از شاخص‌های آماده عکس‌فوری
+        indicators = self.snapshot.indicators if self.snapshot else None
+        for instrument, color, secondary in (('global', "#3b82f6", False), ('iran', "#10b981", True)):
+            levels = markup.key_levels(indicators, instrument)
+            if levels is not None:
+                for level in levels[:2]:
+                    fig.add_hline(y=level, line=dict(color=color, dash="dot", width=1),
+                                  opacity=0.5, secondary_y=secondary)
+        fig.update_layout(height=360, margin=dict(l=10, r=10, t=30, b=10),
+                          legend=dict(orientation="h", y=1.1), hovermode="x unified")
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # آمار غلتان پریمیوم (از عکس‌فوری، بدون پیمایش تاریخچه)
+        stats = self.snapshot.premium_stats if self.snapshot else None
+        if stats and any(stats.values()):
+            st.dataframe(markup.premium_stats_table(stats), hide_index=True, use_container_width=True)
+        
+        # جدول آخرین رکوردها (جدیدترین در بالا)
+        rows = slice(-1, -min(window, TABLE_ROWS) - 1, -1)
+        st.dataframe(
+            {
+                "زمان": (recent.ts[rows] + offset_ns).astype('datetime64[ns]').astype('datetime64[s]'),
+                "🌍 جهانی ($)": recent.global_price[rows].round(3),
+                "📈 تغییر (%)": recent.global_change[rows].round(2),
+                "🇮🇷 ایران (تومان)": recent.iran_price[rows].round(0),
+                "⚖️ پریمیوم (%)": recent.iran_premium[rows].round(2),
+            },
+            hide_index=True,
+            use_container_width=True
+        )
     
     def display_sidebar(self):
         """نمایش نوار کناری"""
         with st.sidebar:
-            # لوگو و عنوان
-            st.markdown("<h1 style='text-align: center; font-size: 3rem;'>💰</h1>", unsafe_allow_html=True)
-            st.markdown("### 📈 ردیاب نقره")
-            st.markdown("---")
+            # لوگو، عنوان، اطلاعات امروز و تیتر تنظیمات
+            st.markdown(markup.SIDEBAR_TITLE_HTML, unsafe_allow_html=True)
+            st.markdown(markup.SIDEBAR_TODAY_MD.format(date=datetime.now().strftime('%Y-%m-%d')))
+            
+            # نرخ دلار: خودکار از منابع ارز یا ورود دستی
+            feed_rate = self.feed_exchange_rate
+            if st.toggle("✍️ نرخ دلار دستی", key="manual_rate"):
+                # نرخ دستی از آخرین نرخ منابع شروع می‌شود
+                st.session_state.setdefault('manual_exchange_rate', int(feed_rate))
+                st.number_input(
+                    "💵 نرخ دلار (ریال)",
+                    min_value=100000,
+                    max_value=2000000,  # تا 2 میلیون ریال
+                    step=10000,
+                    key="manual_exchange_rate",
+                    help=f"نرخ دلار برای محاسبه معادل‌ها - نرخ منابع: {feed_rate:,.0f} ریال"
+                )
+            else:
+                st.caption(f"💵 نرخ دلار (منابع ارز): **{feed_rate:,.0f} ریال**")
             
-            # اطلاعات امروز
-            st.markdown("**📅 اطلاعات امروز:**")
-            st.markdown(f"• **تاریخ:** {datetime.now().strftime('%Y-%m-%d')}")
-            st.markdown("• **قیمت جهانی:** ~$77.66")
-            st.markdown("• **تغییر روز:** +10.23%")
-            st.markdown("• **نماد:** SIH6")
-            
-            st.markdown("---")
-            
-            # تنظیمات
-            st.markdown("### ⚙️ تنظیمات")
-            
-            # نرخ دلار با مقدار منطقی
-            new_rate = st.number_input(
-                "💵 نرخ دلار (ریال)",
-                min_value=100000,
-                max_value=2000000,  # تا 2 میلیون ریال
-                value=st.session_state.exchange_rate,
-                step=10000,
-                help="نرخ دلار برای محاسبه معادل‌ها - امروز حدود 600,000 ریال"
-            )
-            st.session_state.exchange_rate = new_rate
+            # بروزرسانی خودکار: فقط کارت‌ها و تاریخچه دوباره اجرا می‌شوند
+            if st.toggle("🔁 بروزرسانی خودکار", value=True, key="auto_refresh"):
+                st.select_slider("فاصله بروزرسانی", options=REFRESH_INTERVALS, value=DEFAULT_REFRESH,
+                                 key="refresh_every", format_func=lambda s: f"{s} ثانیه")
             
             st.markdown("---")
             
             # اطلاعات سیستم
-            if st.session_state.prices['last_update']:
-                update_time = st.session_state.prices['last_update']
+            if self.snapshot:
+                update_time = self.snapshot.timestamp
                 time_diff = datetime.now() - update_time
                 
                 if time_diff.seconds < 60:
@@ -524,40 +638,68 @@ class SilverPriceTracker:
                 ({time_diff.seconds//60} دقیقه قبل)
                 """)
             
-            st.metric("📈 تعداد بروزرسانی", len(st.session_state.prices['history']))
+            st.metric("📈 تعداد بروزرسانی", self.snapshot.version if self.snapshot else 0)
+            
+            # آمار کش مشترک قیمت (فقط وقتی دریافت در همین پروسه است)
+            if self.poller.cache is not None:
+                cache_stats = self.poller.cache.stats()
+                st.caption(
+                    f"📦 کش قیمت (TTL {cache_stats['ttl']:.0f}s): "
+                    f"hit {cache_stats['hits']} · miss {cache_stats['misses']} · "
+                    f"coalesced {cache_stats['coalesced']} · "
+                    f"نرخ اصابت {cache_stats['hit_ratio']:.0%}"
+                )
+
+            # نشست‌های این پروسه؛ نشست‌های بیکار بروزرسانی خودکار ندارند و پاک می‌شوند
+            st.caption(f"👥 نشست‌های فعال: {len(self.sessions)} · بیکار پاک‌شده: {self.sessions.evicted}")
+            
+            self.display_alerts_panel()
             
             # اطلاعات بازار
             with st.expander("📊 اطلاعات بازار امروز"):
-                st.markdown("""
-                **🌍 بازار جهانی:**
-                • قیمت: $77.665
-                • تغییر: +$7.205 (+10.23%)
-                • نماد: SIH6
-                • واحد: دلار/اونس
-                
-                **🇮🇷 بازار ایران:**
-                • قیمت: ~470,000 تومان/گرم
-                • نرخ دلار: 600,000 ریال
-                • پریمیوم: +15-20%
-                • واحد: تومان/گرم
-                
-                **📈 تحلیل تکنیکال:**
-                • روند: صعودی قوی
-                • مقاومت: $78.50
-                • حمایت: $76.00
-                • پیش‌بینی: رشد ادامه‌دار
-                """)
-            
-            st.markdown("---")
+                st.markdown(markup.MARKET_INFO_MD)
+                st.markdown(markup.technical_analysis_md(self.snapshot.indicators if self.snapshot else None))
             
             # لینک‌های مفید
-            st.markdown("### 🔗 منابع واقعی")
-            st.markdown("""
-            [🌍 Investing.com Silver](https://www.investing.com/commodities/silver)  
-            [🌍 Kitco Live Silver](https://www.kitco.com/charts/livesilver.html)  
-            [🇮🇷 TGJU طلا و نقره](https://www.tgju.org/)  
-            [🇮🇷 طلاچارت](https://www.goldchart.ir/)
-            """)
+            st.markdown(markup.SOURCES_MD)
+    
+    def display_alerts_panel(self):
+        """ثبت و مدیریت هشدارهای قیمت"""
+        with st.expander(f"🔔 هشدار قیمت ({len(self.alerts)} فعال)"):
+            with st.form("new_alert"):
+                instrument = st.selectbox("بازار", [item.key for item in self.model.registry if item.card],
+                                          format_func=lambda name: markup.INSTRUMENT_LABELS[name])
+                threshold = st.number_input("آستانه (دلار، تومان یا ریال)", min_value=0.0, value=78.50, step=0.5,
+                                            help="مثلاً مقاومت $78.50 یا ۴۸۰,۰۰۰ تومان برای ایران")
+                direction = st.selectbox("جهت", ("cross", "above", "below"),
+                                         format_func=lambda name: markup.DIRECTION_LABELS[name])
+                if st.form_submit_button("➕ افزودن هشدار"):
+                    self.alerts.add(instrument, threshold, direction)
+            
+            # گزینه‌ها شناسه هشدارند تا تغییر فهرست در نشست‌های دیگر هشدار
+            # دیگری را انتخاب نکند؛ حذف هم با همان شناسه انجام می‌شود
+            active = {alert.id: alert for alert in self.alerts.active()}
+            if active:
+                removed_id = st.selectbox(
+                    "حذف هشدار", [None] + list(active),
+                    format_func=lambda alert_id: "—" if alert_id is None else
+                    f"#{alert_id} · {markup.alert_label(active[alert_id])}",
+                    key="remove_alert"
+                )
+                if removed_id is not None and st.button("🗑️ حذف"):
+                    if not self.alerts.remove(removed_id):
+                        st.warning("این هشدار دیگر فعال نیست")
+                    st.rerun()
+    
+    def notify_alerts(self):
+        """اعلان هشدارهایی که از آخرین اجرای این نشست اجرا شده‌اند"""
+        self.alerts.sync()
+        fired = self.alerts.fired_since(st.session_state.alert_seq)
+        if not fired:
+            return
+        st.session_state.alert_seq = fired[-1].seq
+        for item in fired[-5:]:
+            st.toast(markup.fired_alert_message(item), icon="🔔")
     
     def display_footer(self):
         """نمایش فوتر"""
@@ -566,58 +708,63 @@ class SilverPriceTracker:
         # اطلاعات دقیق امروز
         st.markdown("### 📅 اطلاعات دقیق امروز (دسامبر ۲۰۲۴)")
         
+        global_md, iran_md = markup.reference_markdown(self.model)
         col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("**🌍 داده‌های جهانی:**")
-            st.markdown(f"• قیمت فعلی: **${self.today_prices['global']['current']:,.3f}**")
-            st.markdown(f"• تغییر امروز: **+${self.today_prices['global']['change']:,.3f}**")
-            st.markdown(f"• درصد تغییر: **+{self.today_prices['global']['change_percent']}%**")
-            st.markdown(f"• سقف امروز: ${self.today_prices['global']['range_today']['high']:.2f}")
-        
-        with col2:
-            st.markdown("**🇮🇷 داده‌های ایران:**")
-            st.markdown(f"• قیمت تخمینی: **{self.today_prices['iran']['current_per_gram']:,.0f} تومان**")
-            st.markdown(f"• معادل دلاری: **${self.today_prices['iran']['current_per_gram']*10/self.base_exchange_rate:.4f}**")
-            st.markdown(f"• نرخ دلار: **{self.base_exchange_rate:,.0f} ریال**")
-            st.markdown(f"• بازه روز: {self.today_prices['iran']['range_today']['min']:,.0f}-{self.today_prices['iran']['range_today']['max']:,.0f}")
-        
-        with col3:
-            st.markdown("**📊 محاسبات:**")
-            st.markdown(f"• هر اونس = 31.1035 گرم")
-            st.markdown(f"• هر کیلو = 32.15 اونس")
-            st.markdown(f"• هر مثقال = 4.6 گرم")
-            st.markdown(f"• پریمیوم بازار: +15-25%")
+        col1.markdown(global_md)
+        col2.markdown(iran_md)
+        col3.markdown(markup.CALCULATIONS_MD)
         
         # فوتر اصلی
-        st.markdown("""
-        <div class="footer">
-            <p style="font-size: 1.2rem; font-weight: bold;">💰 <strong>ردیاب لحظه‌ای قیمت نقره | نسخه دسامبر ۲۰۲۴</strong></p>
-            <p>📈 قیمت‌ها بر اساس داده‌های واقعی بازار امروز شبیه‌سازی شده‌اند</p>
-            <p style="font-size: 0.9rem; color: #ef4444; margin-top: 1rem;">
-                ⚠️ توجه: این اپلیکیشن برای اهداف اطلاعاتی و آموزشی است.<br>
-                برای تصمیم‌گیری مالی حتماً با کارشناسان بازار مشورت کنید.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(markup.FOOTER_HTML, unsafe_allow_html=True)
+    
+    def display_debug_panel(self):
+        """پنل اشکال‌زدایی: صدک‌های زمان هر بخش (فقط با SILVER_PROFILE=1)"""
+        with st.sidebar.expander("⏲️ زمان‌سنجی بخش‌ها"):
+            stats = PROFILER.stats()
+            st.dataframe(
+                {
+                    "بخش": list(stats),
+                    "تعداد": [s['count'] for s in stats.values()],
+                    "p50 (ms)": [round(s['p50'] * 1000, 2) for s in stats.values()],
+                    "p95 (ms)": [round(s['p95'] * 1000, 2) for s in stats.values()],
+                    "p99 (ms)": [round(s['p99'] * 1000, 2) for s in stats.values()],
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+            col1, col2 = st.columns(2)
+            col1.download_button("JSON", PROFILER.to_json(), "silver_profile.json", "application/json")
+            col2.download_button("Prometheus", PROFILER.to_prometheus(), "silver_profile.prom", "text/plain")
     
     def run(self):
         """اجرای اصلی"""
-        self.display_header()
-        self.display_real_time_info()
-        self.display_sidebar()
-        self.display_control_panel()
-        self.display_global_price_card()
-        self.display_iran_price_card()
-        self.display_calculator()
-        self.display_history()
-        self.display_footer()
+        # بخش‌های زنده fragment هستند: در هر بازه (یا با کلیک دکمه) فقط
+        # همان بخش دوباره اجرا و به مرورگر فرستاده می‌شود، نه کل صفحه
+        self.interval = self.refresh_interval
+        live = st.fragment(run_every=self.interval)
+        # زمان هر بخش در اجرای کامل و در اجرای جداگانه بخش‌های زنده
+        timed = PROFILER.timed()
+        sections = (
+            timed(self.display_header),
+            timed(self.display_real_time_info),
+            timed(self.display_sidebar),
+            live(timed(self.display_live_prices)),
+            timed(self.display_calculator),
+            live(timed(self.display_history)),
+            timed(self.display_footer),
+        )
+        for section in sections:
+            section()
+        
+        if PROFILER.enabled:
+            self.display_debug_panel()
 
 
 def main():
     """تابع اصلی"""
-    tracker = SilverPriceTracker()
-    tracker.run()
+    with PROFILER.section('rerun'):
+        tracker = SilverPriceTracker()
+        tracker.run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,197 @@
+"""
+📥 پروسه مستقل دریافت قیمت (بدون Streamlit)
+
+زنجیره دریافت، قیمت‌گذاری، کندل‌ها، آمار، هشدارها و ذخیره تیک‌ها را
+بدون مرورگر اجرا می‌کند و هر عکس‌فوری را در انبار مشترک می‌نویسد. اپ
+با SILVER_INGEST=external فقط خواننده همین انبار است:
+
+    python streamlit_app/ingest.py run
+    SILVER_INGEST=external streamlit run streamlit_app/app.py
+
+دستورها:
+
+    run      حلقه دریافت تا دریافت SIGINT/SIGTERM (با --api-port همراه با API)
+    once     یک دور دریافت و چاپ عکس‌فوری (JSON)
+    status   وضعیت انبار مشترک (آخرین نسخه، سن و تعداد تیک‌ها)
+    backfill ورود تاریخچه از فایل‌های CSV/Parquet به انبار تیک‌ها
+    simulate ساخت تیک‌های شبیه‌سازی‌شده (--ticks، --seed) در انبار یا فایل --out
+    replay   پخش دوباره یک فایل تیک ضبط‌شده در زنجیره با سرعت --speed برابر
+"""
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+import time
+
+from silver.alerts import AlertBook
+from silver.api import ApiServer
+from silver.backfill import DEFAULT_CHUNKSIZE, import_file
+from silver.pipeline import build_poller
+from silver.pricing import PriceModel
+from silver.quote_cache import QuoteCache
+from silver.shared import SnapshotStore, snapshot_to_json
+from silver.simulator import MarketSimulator, TickFeed, load_ticks, path_rows, save_ticks
+from silver.tick_store import TickStore
+
+logger = logging.getLogger('silver.ingest')
+
+
+def build(args, model=None, cache=None):
+    """ساخت زنجیره دریافت با انبار مشترک"""
+    store = TickStore(args.db)
+    return build_poller(
+        model=model,
+        cache=cache,
+        store=store,
+        alerts=AlertBook(args.alerts_db),
+        publisher=SnapshotStore(store.path),
+        interval=args.interval,
+    )
+
+
+def serve(poller, args):
+    """اجرای حلقه دریافت در نخ اصلی تا دریافت سیگنال"""
+    def shutdown(signum, frame):
+        logger.info("توقف دریافت (سیگنال %s)", signum)
+        poller.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    if args.api_port:
+        api = ApiServer(poller, poller.store, port=args.api_port)
+        api.start()
+
+    logger.info("شروع دریافت هر %g ثانیه در %s", poller.interval, poller.store.path)
+    # حلقه در نخ اصلی اجرا می‌شود تا سیگنال‌ها فوراً دریافت شوند
+    poller.run()
+    poller.store.close()
+    return 0
+
+
+def command_run(args):
+    return serve(build(args), args)
+
+
+def command_once(args):
+    poller = build(args)
+    snapshot = poller.poll_once()
+    poller.store.close()
+    if snapshot is None:
+        logger.error("هیچ منبعی قیمت معتبر برنگرداند")
+        return 1
+    print(snapshot_to_json(snapshot))
+    return 0
+
+
+def command_status(args):
+    store = TickStore(args.db)
+    head = SnapshotStore(store.path).head()
+    print(f"انبار: {store.path}")
+    print(f"تعداد تیک‌ها: {store.count():,}")
+    if head is None:
+        print("هنوز عکس‌فوری‌ای منتشر نشده است")
+        return 1
+    version, written_at = head
+    print(f"آخرین نسخه: {version} ({time.time() - written_at:.0f} ثانیه قبل)")
+    return 0
+
+
+def command_backfill(args):
+    store = TickStore(args.db)
+
+    def progress(totals):
+        logger.info("%s: %s ردیف خوانده، %s ردیف نوشته شد",
+                    totals['file'], f"{totals['rows']:,}", f"{totals['written']:,}")
+
+    for path in args.files:
+        totals = import_file(path, store, instrument=args.instrument, chunksize=args.chunksize,
+                             offset_s=args.utc_offset, progress=progress if args.verbose else None)
+        rate = totals['rows'] / totals['seconds'] * 60 if totals['seconds'] else 0
+        logger.info("%s: %s ردیف (%s نامعتبر)، %s ردیف جدید یا تکمیل‌شده در %.1f ثانیه (%s ردیف در دقیقه)",
+                    totals['file'], f"{totals['rows']:,}", f"{totals['invalid']:,}",
+                    f"{totals['written']:,}", totals['seconds'], f"{rate:,.0f}")
+    store.close()
+    return 0
+
+
+def command_simulate(args):
+    simulator = MarketSimulator(PriceModel(), seed=args.seed)
+    started = time.perf_counter()
+    path = simulator.generate(args.ticks, dt_s=args.dt)
+    logger.info("%s تیک در %.2f ثانیه شبیه‌سازی شد (seed=%s)",
+                f"{args.ticks:,}", time.perf_counter() - started, args.seed)
+
+    started = time.perf_counter()
+    if args.out:
+        save_ticks(path.ticks, args.out)
+        target = args.out
+    else:
+        store = TickStore(args.db)
+        for rows in path_rows(path.ticks, args.chunksize):
+            store.append_many(rows)
+        store.close()
+        target = store.path
+    logger.info("نوشتن در %s: %.2f ثانیه", target, time.perf_counter() - started)
+    return 0
+
+
+def command_replay(args):
+    ticks = load_ticks(args.files[0], instrument=args.instrument, offset_s=args.utc_offset or 0)
+    if args.interval is None:
+        args.interval = 1.0
+    feed = TickFeed(ticks, speed=args.speed, loop=args.loop)
+    # بدون کش تا هر دور قیمت تازه خوراک را بخواند
+    poller = build(args, model=PriceModel(feed=feed), cache=QuoteCache(ttl=0))
+    logger.info("پخش %s تیک (%.0f ثانیه ضبط‌شده) با سرعت %s برابر", f"{len(ticks.ts):,}",
+                (ticks.ts[-1] - ticks.ts[0]) / 1e9, args.speed)
+
+    def watch():
+        while not feed.exhausted:
+            time.sleep(0.5)
+        logger.info("پایان پخش")
+        poller.stop()
+
+    if not args.loop:
+        threading.Thread(target=watch, name='silver-replay', daemon=True).start()
+    return serve(poller, args)
+
+
+COMMANDS = {'run': command_run, 'once': command_once, 'status': command_status,
+            'backfill': command_backfill, 'simulate': command_simulate, 'replay': command_replay}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=sorted(COMMANDS), help='دستور')
+    parser.add_argument('files', nargs='*', help='فایل‌های تاریخچه (backfill) یا فایل تیک (replay)')
+    parser.add_argument('--db', help='مسیر انبار تیک‌ها (پیش‌فرض: SILVER_TICK_DB)')
+    parser.add_argument('--alerts-db', help='مسیر فایل هشدارها (پیش‌فرض: SILVER_ALERTS_DB)')
+    parser.add_argument('--interval', type=float, help='فاصله دریافت (پیش‌فرض: SILVER_POLL_INTERVAL)')
+    parser.add_argument('--api-port', type=int, help='درگاه API JSON/SSE در دستور run (پیش‌فرض: خاموش)')
+    parser.add_argument('--instrument', choices=('global', 'iran'),
+                        help='بازار فایل‌های تک‌ستونی قیمت در backfill')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='ردیف در هر تکه backfill')
+    parser.add_argument('--utc-offset', type=int, help='اختلاف زمان محلی فایل با UTC به ثانیه (پیش‌فرض: محلی)')
+    parser.add_argument('--ticks', type=int, default=1_000_000, help='تعداد تیک‌های simulate')
+    parser.add_argument('--seed', type=int, help='seed شبیه‌ساز (تکرارپذیر)')
+    parser.add_argument('--dt', type=float, default=1.0, help='فاصله تیک‌های simulate (ثانیه)')
+    parser.add_argument('--out', help='فایل خروجی simulate (CSV/Parquet) به‌جای انبار')
+    parser.add_argument('--speed', type=float, default=1.0, help='سرعت replay نسبت به زمان واقعی')
+    parser.add_argument('--loop', action='store_true', help='تکرار پیوسته replay')
+    parser.add_argument('-v', '--verbose', action='store_true', help='گزارش جزئیات')
+    args = parser.parse_args(argv)
+    if args.command == 'backfill' and not args.files:
+        parser.error("برای backfill دست‌کم یک فایل لازم است")
+    if args.command == 'replay' and len(args.files) != 1:
+        parser.error("برای replay دقیقاً یک فایل تیک لازم است")
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    return COMMANDS[args.command](args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+🎨 نشانه‌گذاری ثابت صفحه
+
+این ماژول (برخلاف app.py که در هر اجرا دوباره اجرا می‌شود) فقط یک بار در
+هر پروسه بارگذاری می‌شود. استایل، هدر، فوتر و متن‌های ثابت نوار کناری
+یک بار ساخته و فشرده می‌شوند و در هر اجرا فقط همان رشته آماده فرستاده
+می‌شود؛ هر بلوک ثابت هم در یک عنصر واحد قرار گرفته است تا تعداد عناصر
+ارسالی به مرورگر کم شود.
+"""
+
+import re
+from functools import lru_cache
+
+from silver.instruments import CORE_INSTRUMENTS, DEFAULT_INSTRUMENTS
+
+
+def _compact(markup):
+    """حذف فاصله‌های اضافه بین برچسب‌ها برای کاهش حجم ارسالی"""
+    return re.sub(r'>\s+<', '><', re.sub(r'\s+', ' ', markup)).strip()
+
+
+def _compact_css(css):
+    """فشرده‌سازی استایل"""
+    return re.sub(r'\s*([{};:,>])\s*', r'\1', _compact(css))
+
+
+# استایل سفارشی
+CUSTOM_CSS = _compact_css("""
+<style>
+    .main-header {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 2rem;
+        border-radius: 15px;
+        color: white;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+
+    .price-card {
+        padding: 1.5rem;
+        border-radius: 12px;
+        background: white;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.05);
+        border: 1px solid #e5e7eb;
+        margin-bottom: 1rem;
+    }
+
+    .global-card {
+        border-top: 4px solid #3b82f6;
+    }
+
+    .iran-card {
+        border-top: 4px solid #10b981;
+    }
+
+    .real-time-badge {
+        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+        color: white;
+        padding: 0.5rem 1rem;
+        border-radius: 20px;
+        display: inline-block;
+        font-weight: bold;
+        margin-bottom: 1rem;
+    }
+
+    .footer {
+        margin-top: 3rem;
+        padding: 1rem;
+        background: #f8fafc;
+        border-radius: 10px;
+        text-align: center;
+        color: #64748b;
+    }
+</style>
+""")
+
+# هدر و نشانگر Real-time
+HEADER_HTML = _compact("""
+<div class="main-header">
+    <h1 style="margin:0; font-size: 2.8rem;">💰 ردیاب لحظه‌ای قیمت نقره</h1>
+    <p style="margin:0.5rem 0 0 0; opacity: 0.9; font-size: 1.1rem;">
+        قیمت واقعی امروز - بروزرسانی لحظه‌ای | داده‌های زنده بازار
+    </p>
+</div>
+<div class="real-time-badge">📈 REAL-TIME DATA | دسامبر ۲۰۲۴</div>
+""")
+
+# لوگو و عنوان نوار کناری
+SIDEBAR_TITLE_HTML = """
+<h1 style='text-align: center; font-size: 3rem;'>💰</h1>
+
+### 📈 ردیاب نقره
+
+---
+""".strip()
+
+# اطلاعات امروز نوار کناری (تاریخ در هر اجرا جایگذاری می‌شود)
+SIDEBAR_TODAY_MD = """
+**📅 اطلاعات امروز:**
+
+• **تاریخ:** {date}
+
+• **قیمت جهانی:** ~$77.66
+
+• **تغییر روز:** +10.23%
+
+• **نماد:** SIH6
+
+---
+
+### ⚙️ تنظیمات
+""".strip()
+
+# اطلاعات بازار امروز
+MARKET_INFO_MD = """
+**🌍 بازار جهانی:**
+• قیمت: $77.665
+• تغییر: +$7.205 (+10.23%)
+• نماد: SIH6
+• واحد: دلار/اونس
+
+**🇮🇷 بازار ایران:**
+• قیمت: ~470,000 تومان/گرم
+• نرخ دلار: 600,000 ریال
+• پریمیوم: +15-20%
+• واحد: تومان/گرم
+""".strip()
+
+# لینک‌های مفید
+SOURCES_MD = """
+---
+
+### 🔗 منابع واقعی
+
+[🌍 Investing.com Silver](https://www.investing.com/commodities/silver)  
+[🌍 Kitco Live Silver](https://www.kitco.com/charts/livesilver.html)  
+[🇮🇷 TGJU طلا و نقره](https://www.tgju.org/)  
+[🇮🇷 طلاچارت](https://www.goldchart.ir/)
+""".strip()
+
+# ستون محاسبات فوتر
+CALCULATIONS_MD = """
+**📊 محاسبات:**
+
+• هر اونس = 31.1035 گرم
+
+• هر کیلو = 32.15 اونس
+
+• هر مثقال = 4.6 گرم
+
+• پریمیوم بازار: +15-25%
+""".strip()
+
+# فوتر اصلی
+FOOTER_HTML = _compact("""
+<div class="footer">
+    <p style="font-size: 1.2rem; font-weight: bold;">💰 <strong>ردیاب لحظه‌ای قیمت نقره | نسخه دسامبر ۲۰۲۴</strong></p>
+    <p>📈 قیمت‌ها بر اساس داده‌های واقعی بازار امروز شبیه‌سازی شده‌اند</p>
+    <p style="font-size: 0.9rem; color: #ef4444; margin-top: 1rem;">
+        ⚠️ توجه: این اپلیکیشن برای اهداف اطلاعاتی و آموزشی است.<br>
+        برای تصمیم‌گیری مالی حتماً با کارشناسان بازار مشورت کنید.
+    </p>
+</div>
+""")
+
+
+def lines(*items):
+    """اتصال چند خط در یک بلوک markdown (هر خط یک پاراگراف)"""
+    return '\n\n'.join(items)
+
+
+@lru_cache(maxsize=None)
+def reference_markdown(model):
+    """ستون‌های داده‌های مرجع امروز در فوتر (یک بار برای هر مدل)"""
+    today = model.today_prices
+    rate = model.base_exchange_rate
+    global_md = lines(
+        "**🌍 داده‌های جهانی:**",
+        f"• قیمت فعلی: **${today['global']['current']:,.3f}**",
+        f"• تغییر امروز: **+${today['global']['change']:,.3f}**",
+        f"• درصد تغییر: **+{today['global']['change_percent']}%**",
+        f"• سقف امروز: ${today['global']['range_today']['high']:.2f}",
+    )
+    iran_md = lines(
+        "**🇮🇷 داده‌های ایران:**",
+        f"• قیمت تخمینی: **{today['iran']['current_per_gram']:,.0f} تومان**",
+        f"• معادل دلاری: **${today['iran']['current_per_gram'] * 10 / rate:.4f}**",
+        f"• نرخ دلار: **{rate:,.0f} ریال**",
+        f"• بازه روز: {today['iran']['range_today']['min']:,.0f}-{today['iran']['range_today']['max']:,.0f}",
+    )
+    return global_md, iran_md
+
+
+def deviations_line(quote, digits=2):
+    """انحراف هر منبع از قیمت اجماعی (منابع پرت با ⛔)"""
+    deviations = quote.get('deviations')
+    if not deviations:
+        return ""
+    rejected = quote.get('rejected', ())
+    parts = [
+        f"{'⛔ ' if name in rejected else ''}{name} {deviation:+.{digits}f}%"
+        for name, deviation in deviations
+    ]
+    return "⚖️ انحراف منابع: " + " · ".join(parts)
+
+
+def premium_stats_line(stats, window='1h'):
+    """خلاصه آمار غلتان پریمیوم یک پنجره برای کارت ایران"""
+    current = stats.get(window) if stats else None
+    if current is None:
+        return ""
+    return (f"📐 پریمیوم {window}: میانگین {current.mean:+.2f}% · "
+            f"σ {current.std:.2f} · بازه {current.min:+.2f}…{current.max:+.2f}% · z {current.zscore:+.2f}")
+
+
+def premium_stats_table(stats):
+    """ستون‌های جدول آمار غلتان پریمیوم برای همه پنجره‌ها"""
+    rows = [(name, current) for name, current in stats.items() if current is not None]
+    return {
+        "پنجره": [name for name, _ in rows],
+        "تعداد": [current.count for _, current in rows],
+        "میانگین (%)": [round(current.mean, 2) for _, current in rows],
+        "انحراف معیار": [round(current.std, 3) for _, current in rows],
+        "کمینه (%)": [round(current.min, 2) for _, current in rows],
+        "بیشینه (%)": [round(current.max, 2) for _, current in rows],
+        "z-score": [round(current.zscore, 2) for _, current in rows],
+    }
+
+
+# برچسب بازارها و جهت هشدارها
+INSTRUMENT_LABELS = {'global': '🌍 جهانی ($)', 'iran': '🇮🇷 ایران (تومان)'}
+INSTRUMENT_LABELS.update(
+    (item.key, f"{item.icon} {item.name}") for item in DEFAULT_INSTRUMENTS if item.key not in CORE_INSTRUMENTS
+)
+CURRENCY_LABELS = {'TOMAN': 'تومان', 'RIAL': 'ریال'}
+_CURRENCIES = {item.key: item.currency for item in DEFAULT_INSTRUMENTS}
+DIRECTION_LABELS = {'cross': '↕️ عبور', 'above': '🔺 بالاتر از', 'below': '🔻 پایین‌تر از'}
+
+
+def format_price(currency, value, digits=2):
+    """قیمت با واحد پول ($ برای دلار، تومان یا ریال)"""
+    if currency == 'USD':
+        return f"${value:,.{digits}f}"
+    return f"{value:,.0f} {CURRENCY_LABELS.get(currency, currency)}"
+
+
+def _format_level(instrument, value):
+    return format_price(_CURRENCIES.get(instrument, 'TOMAN'), value)
+
+
+def instrument_card_caption(quote):
+    """زیرنویس کارت فشرده یک نماد (منبع و حباب نسبت به ارزش فلز)"""
+    parts = [f"📡 {quote['source']}"]
+    if quote.get('premium_percent') is not None:
+        parts.append(f"⚖️ حباب {quote['premium_percent']:+.2f}%")
+    return " · ".join(parts)
+
+
+def alert_label(alert):
+    """متن کوتاه یک هشدار فعال"""
+    return (f"{INSTRUMENT_LABELS[alert.instrument]} {DIRECTION_LABELS[alert.direction]} "
+            f"{_format_level(alert.instrument, alert.threshold)}")
+
+
+def fired_alert_message(item):
+    """متن اعلان هشدار اجراشده"""
+    return (f"{alert_label(item.alert)} — قیمت فعلی "
+            f"{_format_level(item.alert.instrument, item.price)}")
+
+
+# بازه زمانی شاخص‌های روند و بازه سطوح پیوت (به ترتیب اولویت)
+TREND_RESOLUTION = '1h'
+LEVEL_RESOLUTIONS = ('1d', '1h')
+
+
+def key_levels(indicators, instrument):
+    """(حمایت، مقاومت، بازه) از پیوت روزانه یا در نبود آن ساعتی"""
+    by_resolution = indicators.get(instrument) if indicators else None
+    for resolution in LEVEL_RESOLUTIONS:
+        values = by_resolution.get(resolution) if by_resolution else None
+        if values is not None and values.bars:
+            return values.s1, values.r1, resolution
+    return None
+
+
+def _trend_label(values):
+    if values.sma is None or values.ema is None:
+        return "نامشخص"
+    if values.close > values.ema > values.sma:
+        return "صعودی 🟢"
+    if values.close < values.ema < values.sma:
+        return "نزولی 🔴"
+    return "خنثی 🟡"
+
+
+def _rsi_label(rsi):
+    if rsi is None:
+        return "—"
+    state = " (اشباع خرید)" if rsi >= 70 else " (اشباع فروش)" if rsi <= 30 else ""
+    return f"{rsi:.1f}{state}"
+
+
+def technical_analysis_md(indicators):
+    """تحلیل تکنیکال نوار کناری از شاخص‌های عکس‌فوری"""
+    blocks = []
+    for instrument in ('global', 'iran'):
+        by_resolution = indicators.get(instrument) if indicators else None
+        values = by_resolution.get(TREND_RESOLUTION) if by_resolution else None
+        title = f"**📈 تحلیل تکنیکال {INSTRUMENT_LABELS[instrument]} (کندل {TREND_RESOLUTION}):**"
+        if values is None or values.bars == 0:
+            blocks.append(lines(title, "• هنوز کندل بسته‌شده‌ای نیست"))
+            continue
+        items = [title, f"• روند: {_trend_label(values)}", f"• RSI(14): {_rsi_label(values.rsi)}"]
+        if values.sma is not None:
+            items.append(f"• SMA/EMA: {_format_level(instrument, values.sma)} / "
+                         f"{_format_level(instrument, values.ema)}")
+            items.append(f"• بولینگر: {_format_level(instrument, values.bb_lower)} … "
+                         f"{_format_level(instrument, values.bb_upper)}")
+        else:
+            items.append(f"• داده کافی برای میانگین‌ها نیست ({values.bars} کندل)")
+        levels = key_levels(indicators, instrument)
+        if levels is not None:
+            support, resistance, resolution = levels
+            items.append(f"• مقاومت (پیوت {resolution}): {_format_level(instrument, resistance)}")
+            items.append(f"• حمایت (پیوت {resolution}): {_format_level(instrument, support)}")
+        blocks.append(lines(*items))
+    return "\n\n".join(blocks)
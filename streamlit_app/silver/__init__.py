@@ -0,0 +1,3 @@
+"""
+🧩 هسته ردیاب قیمت نقره - بدون وابستگی به Streamlit
+"""
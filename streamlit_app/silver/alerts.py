@@ -0,0 +1,222 @@
+"""
+🔔 هشدار قیمت با نمایه مرتب آستانه‌ها
+
+آستانه‌های هر نماد در یک فهرست مرتب نگه داشته می‌شوند. در هر تیک فقط
+بازه بین قیمت قبلی و فعلی با bisect پیدا و بررسی می‌شود؛ پس هزینه هر
+تیک O(log n + k) است (k تعداد هشدارهای عبورکرده) و با ده‌ها هزار هشدار
+هم زیر یک میلی‌ثانیه می‌ماند.
+
+هشدارها یک‌بارمصرف‌اند و در SQLite ذخیره می‌شوند تا پس از راه‌اندازی
+دوباره باقی بمانند.
+"""
+
+import bisect
+import os
+import sqlite3
+import threading
+import time
+from collections import deque, namedtuple
+from dataclasses import dataclass
+
+from silver.tick_store import DEFAULT_PATH as _TICK_PATH
+
+# مسیر پیش‌فرض فایل هشدارها (کنار انبار تیک‌ها)
+DEFAULT_PATH = os.path.join(os.path.dirname(_TICK_PATH), 'alerts.sqlite3')
+
+# جهت‌های مجاز عبور از آستانه
+DIRECTIONS = ('above', 'below', 'cross')
+
+# تعداد هشدارهای اجراشده‌ای که برای نمایش به نشست‌ها نگه داشته می‌شوند
+RECENT_FIRED = 256
+
+# هشدار اجراشده (seq برای پیگیری هشدارهای دیده‌نشده در هر نشست)
+FiredAlert = namedtuple('FiredAlert', ('seq', 'alert', 'price', 'fired_at'))
+
+
+@dataclass(frozen=True)
+class Alert:
+    """یک هشدار قیمت"""
+
+    id: int
+    instrument: str
+    threshold: float
+    direction: str = 'cross'
+    label: str = ''
+    created_at: float = 0.0
+
+
+class AlertBook:
+    """دفتر هشدارها با نمایه مرتب برای هر نماد"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('SILVER_ALERTS_DB', DEFAULT_PATH)
+        self._alerts = {}      # id -> Alert
+        self._levels = {}      # instrument -> [threshold] (مرتب)
+        self._ids = {}         # instrument -> [id] (هم‌ترتیب با _levels)
+        self._previous = {}    # instrument -> آخرین قیمت بررسی‌شده
+        self._recent = deque(maxlen=RECENT_FIRED)
+        self._seq = 0
+        self._data_version = None
+        self._lock = threading.Lock()
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                instrument TEXT NOT NULL,
+                threshold REAL NOT NULL,
+                direction TEXT NOT NULL,
+                label TEXT NOT NULL DEFAULT '',
+                created_at REAL NOT NULL,
+                fired_at REAL,
+                fired_price REAL
+            );
+        """)
+        self._load()
+        self._data_version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def _load(self):
+        """بارگذاری هشدارهای فعال از دیسک و ساخت نمایه‌ها"""
+        rows = self._conn.execute(
+            'SELECT id, instrument, threshold, direction, label, created_at FROM alerts '
+            'WHERE fired_at IS NULL ORDER BY instrument, threshold'
+        ).fetchall()
+        for row in rows:
+            alert = Alert(*row)
+            self._alerts[alert.id] = alert
+            # ردیف‌ها از قبل مرتب‌اند؛ افزودن به انتها کافی است
+            self._levels.setdefault(alert.instrument, []).append(alert.threshold)
+            self._ids.setdefault(alert.instrument, []).append(alert.id)
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def sync(self):
+        """هم‌گام‌سازی با تغییرات پروسه‌های دیگر (فقط اگر فایل تغییر کرده باشد)
+
+        هشدارهای تازه نمایه می‌شوند، حذف‌شده‌ها کنار می‌روند و هشدارهایی که
+        پروسه دیگر اجرا کرده در فهرست اعلان‌ها قرار می‌گیرند.
+        """
+        with self._lock:
+            version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+            if version == self._data_version:
+                return
+            self._data_version = version
+
+            rows = self._conn.execute(
+                'SELECT id, instrument, threshold, direction, label, created_at FROM alerts WHERE fired_at IS NULL'
+            ).fetchall()
+            active = {row[0] for row in rows}
+            for row in rows:
+                if row[0] not in self._alerts:
+                    self._index(Alert(*row))
+
+            gone = [self._alerts[alert_id] for alert_id in list(self._alerts) if alert_id not in active]
+            for alert in gone:
+                self._unindex(alert)
+                fired = self._conn.execute(
+                    'SELECT fired_at, fired_price FROM alerts WHERE id = ?', (alert.id,)
+                ).fetchone()
+                if fired is not None:
+                    self._seq += 1
+                    self._recent.append(FiredAlert(self._seq, alert, fired[1], fired[0]))
+
+    def add(self, instrument, threshold, direction='cross', label=''):
+        """ثبت هشدار جدید"""
+        if direction not in DIRECTIONS:
+            raise ValueError(f"جهت هشدار نامعتبر است: {direction}")
+        threshold = float(threshold)
+        created_at = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO alerts (instrument, threshold, direction, label, created_at) VALUES (?, ?, ?, ?, ?)',
+                (instrument, threshold, direction, label, created_at)
+            )
+            alert = Alert(cursor.lastrowid, instrument, threshold, direction, label, created_at)
+            self._index(alert)
+        return alert
+
+    def _index(self, alert):
+        levels = self._levels.setdefault(alert.instrument, [])
+        index = bisect.bisect_right(levels, alert.threshold)
+        levels.insert(index, alert.threshold)
+        self._ids.setdefault(alert.instrument, []).insert(index, alert.id)
+        self._alerts[alert.id] = alert
+
+    def _unindex(self, alert):
+        levels, ids = self._levels[alert.instrument], self._ids[alert.instrument]
+        index = bisect.bisect_left(levels, alert.threshold)
+        while ids[index] != alert.id:
+            index += 1
+        del levels[index], ids[index]
+        del self._alerts[alert.id]
+
+    def remove(self, alert_id):
+        """حذف یک هشدار فعال"""
+        with self._lock:
+            alert = self._alerts.get(alert_id)
+            if alert is None:
+                return False
+            self._unindex(alert)
+            self._conn.execute('DELETE FROM alerts WHERE id = ?', (alert_id,))
+        return True
+
+    def active(self, instrument=None):
+        """هشدارهای فعال (به ترتیب آستانه)"""
+        with self._lock:
+            instruments = [instrument] if instrument else sorted(self._ids)
+            return [self._alerts[i] for name in instruments for i in self._ids.get(name, ())]
+
+    def evaluate(self, instrument, price, now=None):
+        """بررسی عبور قیمت از آستانه‌ها از تیک قبلی تا این تیک"""
+        with self._lock:
+            previous = self._previous.get(instrument)
+            self._previous[instrument] = price
+            levels = self._levels.get(instrument)
+            if previous is None or not levels or price == previous:
+                return []
+
+            # فقط آستانه‌های بین قیمت قبلی و فعلی
+            if price > previous:
+                start = bisect.bisect_right(levels, previous)
+                stop = bisect.bisect_right(levels, price)
+                wanted = ('above', 'cross')
+            else:
+                start = bisect.bisect_left(levels, price)
+                stop = bisect.bisect_left(levels, previous)
+                wanted = ('below', 'cross')
+            if start == stop:
+                return []
+
+            ids = self._ids[instrument]
+            crossed = [self._alerts[i] for i in ids[start:stop] if self._alerts[i].direction in wanted]
+            if not crossed:
+                return []
+
+            fired_at = now or time.time()
+            fired = []
+            for alert in crossed:
+                self._unindex(alert)
+                self._seq += 1
+                fired.append(FiredAlert(self._seq, alert, price, fired_at))
+            self._recent.extend(fired)
+            self._conn.executemany(
+                'UPDATE alerts SET fired_at = ?, fired_price = ? WHERE id = ?',
+                [(fired_at, price, item.alert.id) for item in fired]
+            )
+            return fired
+
+    def fired_since(self, seq):
+        """هشدارهای اجراشده پس از شماره seq (برای اعلان در هر نشست)"""
+        with self._lock:
+            return [item for item in self._recent if item.seq > seq]
+
+    @property
+    def last_seq(self):
+        return self._seq
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,133 @@
+"""
+📐 آمار لحظه‌ای پریمیوم بازار ایران
+
+پریمیوم از قیمت زنده جهانی، قیمت ایران و نرخ دلار همان دور حساب می‌شود
+(نه از قیمت ثابت مرجع). برای چند پنجره زمانی میانگین، انحراف معیار،
+کمینه/بیشینه و z-score نگه داشته می‌شود:
+
+- میانگین و واریانس با روش Welford (افزودن و حذف در O(1))
+- کمینه و بیشینه با صف یکنوا (monotonic deque) در O(1) سرشکن
+
+بنابراین هر تیک فقط هزینه ثابت دارد و نمایش آمار نیاز به پیمایش
+تاریخچه ندارد.
+"""
+
+import math
+import threading
+from collections import deque, namedtuple
+
+# پنجره‌های پیش‌فرض (ثانیه)
+DEFAULT_WINDOWS = (('5m', 300), ('1h', 3600), ('1d', 86400))
+
+# بیشترین فاصله مجاز بین زمان قیمت جهانی و ایران (ثانیه)
+DEFAULT_MAX_SKEW = 60.0
+
+# آمار یک پنجره
+RollingStats = namedtuple('RollingStats', ('count', 'mean', 'std', 'min', 'max', 'last', 'zscore'))
+
+
+class RollingWindow:
+    """آمار غلتان یک پنجره زمانی با به‌روزرسانی O(1)"""
+
+    def __init__(self, span_s):
+        self.span_ns = int(span_s * 1e9)
+        self._values = deque()   # (ts_ns, value)
+        self._mins = deque()     # صف یکنوای صعودی
+        self._maxs = deque()     # صف یکنوای نزولی
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self):
+        return len(self._values)
+
+    def append(self, ts_ns, value):
+        """افزودن یک مقدار و بیرون انداختن مقادیر خارج از پنجره"""
+        self._values.append((ts_ns, value))
+        count = len(self._values)
+        delta = value - self._mean
+        self._mean += delta / count
+        self._m2 += delta * (value - self._mean)
+
+        while self._mins and self._mins[-1][1] >= value:
+            self._mins.pop()
+        self._mins.append((ts_ns, value))
+        while self._maxs and self._maxs[-1][1] <= value:
+            self._maxs.pop()
+        self._maxs.append((ts_ns, value))
+
+        self._expire(ts_ns - self.span_ns)
+
+    def _expire(self, cutoff_ns):
+        while self._values and self._values[0][0] <= cutoff_ns:
+            _, value = self._values.popleft()
+            count = len(self._values)
+            if count == 0:
+                self._mean = self._m2 = 0.0
+            else:
+                # حذف معکوس Welford
+                old_mean = self._mean
+                self._mean -= (value - old_mean) / count
+                self._m2 = max(0.0, self._m2 - (value - old_mean) * (value - self._mean))
+        while self._mins and self._mins[0][0] <= cutoff_ns:
+            self._mins.popleft()
+        while self._maxs and self._maxs[0][0] <= cutoff_ns:
+            self._maxs.popleft()
+
+    def stats(self, now_ns=None):
+        """آمار فعلی پنجره (یا None اگر خالی است)
+
+        با now_ns مقادیر قدیمی‌تر از پنجره نسبت به اکنون هم بیرون می‌روند؛
+        بنابراین وقتی تیک تازه‌ای نمی‌رسد آمار کهنه گزارش نمی‌شود.
+        """
+        if now_ns is not None:
+            self._expire(now_ns - self.span_ns)
+        count = len(self._values)
+        if count == 0:
+            return None
+        std = math.sqrt(self._m2 / (count - 1)) if count > 1 else 0.0
+        last = self._values[-1][1]
+        zscore = (last - self._mean) / std if std > 0 else 0.0
+        return RollingStats(count, self._mean, std, self._mins[0][1], self._maxs[0][1], last, zscore)
+
+
+class PremiumAnalytics:
+    """پریمیوم لحظه‌ای ایران نسبت به جهانی و آمار غلتان آن"""
+
+    def __init__(self, model, windows=DEFAULT_WINDOWS, max_skew=DEFAULT_MAX_SKEW):
+        self.model = model
+        self.max_skew = max_skew
+        self.windows = {name: RollingWindow(span) for name, span in windows}
+        self._last_pair = None
+        self._lock = threading.Lock()
+
+    def update(self, ts_ns, global_quote, iran_quote, exchange_rate):
+        """ثبت پریمیوم یک دور؛ قیمت‌های ناهمزمان یا تکراری نادیده گرفته می‌شوند"""
+        if not global_quote or not iran_quote:
+            return None
+        pair = (global_quote.get('updated_at', 0.0), iran_quote.get('updated_at', 0.0))
+        if abs(pair[0] - pair[1]) > self.max_skew or pair == self._last_pair:
+            return None
+        self._last_pair = pair
+        _, premium = self.model.iran_metrics(iran_quote['price'], exchange_rate, global_quote['price'])
+        self.append(ts_ns, premium)
+        return premium
+
+    def append(self, ts_ns, premium):
+        """افزودن مستقیم یک مقدار پریمیوم به همه پنجره‌ها"""
+        with self._lock:
+            for window in self.windows.values():
+                window.append(ts_ns, premium)
+
+    def extend(self, ts, premiums):
+        """پر کردن پنجره‌ها از تاریخچه (فقط در شروع)"""
+        if len(ts) == 0:
+            return
+        cutoff = ts[-1] - max(window.span_ns for window in self.windows.values())
+        for ts_ns, premium in zip(ts.tolist(), premiums.tolist()):
+            if ts_ns > cutoff and premium == premium:  # NaN نادیده گرفته می‌شود
+                self.append(ts_ns, premium)
+
+    def stats(self, now_ns=None):
+        """آمار همه پنجره‌ها به ترتیب تعریف (نسبت به زمان now_ns در صورت وجود)"""
+        with self._lock:
+            return {name: window.stats(now_ns) for name, window in self.windows.items()}
@@ -0,0 +1,251 @@
+"""
+🛰️ API سبک JSON و SSE برای سرویس‌های دیگر
+
+به‌جای خراشیدن صفحه Streamlit، سرویس‌ها مستقیم از همین API می‌خوانند:
+
+    GET /api/snapshot   آخرین عکس‌فوری (جهانی، ایران، نرخ دلار، آمار پریمیوم)
+    GET /api/history    بازه‌ای از تیک‌ها (start/end به نانوثانیه، points برای کاهش نقاط)
+    GET /api/stream     جریان Server-Sent Events؛ هر تیک تازه یک رویداد tick
+
+API از همان منبع عکس‌فوری (PricePoller یا SnapshotReader) و همان انبار
+تیک‌های اپ می‌خواند. فقط یک وظیفه ناظر تغییر عکس‌فوری را تشخیص می‌دهد،
+پیام را یک بار می‌سازد و در صف همه مشترکان می‌گذارد؛ پس هزینه هر مشترک
+فقط یک نوشتن است و هیچ مشترکی جداگانه پرس‌وجو نمی‌کند.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+
+from aiohttp import web
+
+from silver.downsample import downsample
+from silver.shared import snapshot_to_json
+from silver.tick_store import COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# درگاه پیش‌فرض API
+DEFAULT_PORT = 8765
+
+# فاصله بررسی عکس‌فوری تازه توسط ناظر (ثانیه)
+WATCH_INTERVAL = 0.25
+
+# فاصله پیام نگه‌دارنده اتصال SSE (ثانیه)
+KEEPALIVE = 15.0
+
+# حداکثر پیام‌های در صف هر مشترک؛ مشترک کند پیام‌های قدیمی را از دست می‌دهد
+QUEUE_SIZE = 16
+
+# بازه و تعداد نقاط پیش‌فرض تاریخچه و سقف نقاط هر پاسخ
+DEFAULT_HISTORY_S = 86400
+DEFAULT_POINTS = 2000
+MAX_POINTS = 20000
+
+
+class Broadcaster:
+    """پخش عکس‌فوری‌های تازه به همه مشترکان SSE"""
+
+    def __init__(self, source, interval=WATCH_INTERVAL, queue_size=QUEUE_SIZE):
+        self.source = source
+        self.interval = interval
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.sent = 0
+        self.dropped = 0
+        self._snapshot = None
+        self._json = None
+        self._message = None
+        self._broadcast_version = None  # نسخه آخرین عکس‌فوری پخش‌شده به مشترکان
+
+    def latest(self):
+        """(JSON، پیام SSE) آخرین عکس‌فوری"""
+        self._check()
+        return self._json, self._message
+
+    def subscribe(self):
+        queue = asyncio.Queue(self.queue_size)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def _check(self):
+        """ساخت JSON و پیام SSE (یک بار برای هر عکس‌فوری)؛ آخرین عکس‌فوری"""
+        snapshot = self.source.snapshot
+        if snapshot is not None and snapshot is not self._snapshot:
+            self._snapshot = snapshot
+            self._json = snapshot_to_json(snapshot)
+            self._message = f"id: {snapshot.version}\nevent: tick\ndata: {self._json}\n\n".encode('utf-8')
+        return self._snapshot
+
+    def publish(self):
+        """گذاشتن پیام تازه در صف همه مشترکان
+
+        پخش با نسخه خودش ردیابی می‌شود، نه با حافظه پیام: درخواست
+        /api/snapshot پیش از دور ناظر نباید تیک را از مشترکان SSE بگیرد.
+        """
+        snapshot = self._check()
+        if snapshot is None or snapshot.version == self._broadcast_version:
+            return
+        self._broadcast_version = snapshot.version
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(self._message)
+        self.sent += len(self.subscribers)
+
+    async def watch(self):
+        """تنها حلقه بررسی عکس‌فوری تازه برای همه مشترکان"""
+        while True:
+            try:
+                self.publish()
+            except Exception:
+                logger.exception("پخش عکس‌فوری ناموفق بود")
+            await asyncio.sleep(self.interval)
+
+
+async def snapshot_handler(request):
+    payload, _ = request.app['broadcaster'].latest()
+    if payload is None:
+        return web.json_response({'error': 'هنوز قیمتی دریافت نشده است'}, status=503)
+    return web.Response(text=payload, content_type='application/json')
+
+
+def _int_param(request, name, default=None):
+    value = request.query.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise web.HTTPBadRequest(reason=f"پارامتر {name} باید عدد صحیح باشد")
+
+
+def _finite(values):
+    """مقادیر NULL انبار (NaN) به null در JSON؛ NaN در JSON معتبر نیست"""
+    return [value if math.isfinite(value) else None for value in values.tolist()]
+
+
+def _history(store, start_ns, end_ns, points):
+    ticks = store.range(start_ns=start_ns, end_ns=end_ns)
+    if len(ticks.ts) > points:
+        picked = downsample(ticks.ts, (ticks.global_price, ticks.iran_price), points)
+        ticks = type(ticks)(*(column[picked] for column in ticks))
+    data = {'ts': ticks.ts.tolist()}
+    data.update((name, _finite(getattr(ticks, name))) for name in COLUMNS)
+    return data
+
+
+async def history_handler(request):
+    now_ns = time.time_ns()
+    start_ns = _int_param(request, 'start', now_ns - DEFAULT_HISTORY_S * 10**9)
+    end_ns = _int_param(request, 'end')
+    points = _int_param(request, 'points', DEFAULT_POINTS)
+    if not 1 <= points <= MAX_POINTS:
+        raise web.HTTPBadRequest(reason=f"پارامتر points باید بین 1 و {MAX_POINTS} باشد")
+    # خواندن انبار در نخ جدا تا حلقه رویداد مسدود نشود
+    data = await asyncio.get_running_loop().run_in_executor(
+        None, _history, request.app['store'], start_ns, end_ns, points
+    )
+    return web.json_response(data)
+
+
+async def stream_handler(request):
+    broadcaster = request.app['broadcaster']
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    await response.prepare(request)
+
+    queue = broadcaster.subscribe()
+    try:
+        # تیک پخش‌نشده از صف به همه (از جمله این مشترک) می‌رسد؛ وگرنه آخرین تیک پخش‌شده
+        broadcaster.publish()
+        if queue.empty():
+            _, message = broadcaster.latest()
+            if message is not None:
+                await response.write(message)
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), KEEPALIVE)
+            except asyncio.TimeoutError:
+                message = b': keepalive\n\n'
+            await response.write(message)
+    except (ConnectionResetError, asyncio.CancelledError):
+        pass
+    finally:
+        broadcaster.unsubscribe(queue)
+    return response
+
+
+async def stats_handler(request):
+    broadcaster = request.app['broadcaster']
+    return web.json_response({
+        'subscribers': len(broadcaster.subscribers),
+        'sent': broadcaster.sent,
+        'dropped': broadcaster.dropped,
+    })
+
+
+async def _start_watcher(app):
+    app['watcher'] = asyncio.ensure_future(app['broadcaster'].watch())
+
+
+async def _stop_watcher(app):
+    app['watcher'].cancel()
+
+
+def create_app(source, store, interval=WATCH_INTERVAL):
+    """ساخت اپ aiohttp روی منبع عکس‌فوری و انبار تیک‌ها"""
+    app = web.Application()
+    app['broadcaster'] = Broadcaster(source, interval)
+    app['store'] = store
+    app.router.add_get('/api/snapshot', snapshot_handler)
+    app.router.add_get('/api/history', history_handler)
+    app.router.add_get('/api/stream', stream_handler)
+    app.router.add_get('/api/stats', stats_handler)
+    app.on_startup.append(_start_watcher)
+    app.on_cleanup.append(_stop_watcher)
+    return app
+
+
+class ApiServer(threading.Thread):
+    """اجرای API در نخ پس‌زمینه با حلقه رویداد مخصوص خودش"""
+
+    def __init__(self, source, store, host='0.0.0.0', port=None):
+        super().__init__(name='silver-api', daemon=True)
+        self.source = source
+        self.store = store
+        self.host = host
+        self.port = int(port or os.environ.get('SILVER_API_PORT', DEFAULT_PORT))
+        self._loop = None
+        self._started = threading.Event()
+
+    def run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        runner = web.AppRunner(create_app(self.source, self.store))
+        self._loop.run_until_complete(runner.setup())
+        self._loop.run_until_complete(web.TCPSite(runner, self.host, self.port).start())
+        logger.info("API قیمت روی %s:%s", self.host, self.port)
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.run_until_complete(runner.cleanup())
+            self._loop.close()
+
+    def wait_started(self, timeout=5.0):
+        return self._started.wait(timeout)
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
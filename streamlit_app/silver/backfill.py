@@ -0,0 +1,135 @@
+"""
+📦 ورود دسته‌ای تاریخچه قیمت از فایل‌های CSV/Parquet به انبار تیک‌ها
+
+فایل تکه‌به‌تکه خوانده می‌شود تا حافظه محدود بماند؛ زمان و قیمت هر تکه
+به‌صورت برداری تبدیل، ردیف‌های نامعتبر و تکراری حذف و همه ردیف‌های تکه
+در یک تراکنش نوشته می‌شوند. ردیف‌هایی که از قبل در انبار هستند تکراری
+نمی‌شوند؛ فقط ستون‌های خالی آن‌ها تکمیل می‌شود.
+
+دو شکل فایل پشتیبانی می‌شود:
+
+- خروجی سایت‌ها (Investing.com، TGJU و ...): یک ستون زمان (Date/تاریخ) و
+  یک ستون قیمت (Price/Close/قیمت) برای یک بازار (instrument)
+- خروجی خود ردیاب: ستون‌های ts_ns و global_price / iran_price / ...
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from silver.bars import local_utc_offset
+from silver.tick_store import COLUMNS
+
+# نام‌های قابل قبول ستون زمان و قیمت (با حروف کوچک)
+TIME_COLUMNS = ('ts_ns', 'timestamp', 'datetime', 'date', 'time', 'تاریخ', 'زمان')
+PRICE_COLUMNS = ('price', 'close', 'last', 'قیمت', 'پایانی')
+
+# اندازه پیش‌فرض هر تکه (ردیف)
+DEFAULT_CHUNKSIZE = 200_000
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """خواندن تکه‌به‌تکه فایل CSV یا Parquet به‌صورت DataFrame"""
+    if str(path).lower().endswith(('.parquet', '.pq')):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("برای خواندن Parquet بسته pyarrow لازم است (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(path, chunksize=chunksize, skipinitialspace=True, thousands=',')
+
+
+def parse_timestamps(column, offset_s=0):
+    """تبدیل برداری ستون زمان به نانوثانیه epoch (NaT → -1)
+
+    اعداد بر اساس بزرگی به‌عنوان ثانیه، میلی‌، میکرو‌ یا نانوثانیه تفسیر
+    می‌شوند؛ تاریخ‌های متنی بدون منطقه زمانی، زمان محلی (offset_s) فرض
+    می‌شوند.
+    """
+    if pd.api.types.is_numeric_dtype(column):
+        values = column.to_numpy(dtype=np.float64)
+        magnitude = np.nanmedian(np.abs(values)) if len(values) else 0
+        scale = 1 if magnitude > 1e17 else 10**3 if magnitude > 1e14 else 10**6 if magnitude > 1e11 else 10**9
+        if pd.api.types.is_integer_dtype(column):
+            # ستون صحیح بدون گذر از float تا دقت نانوثانیه حفظ شود
+            return column.to_numpy(dtype=np.int64) * scale
+        ts = values * scale
+        return np.where(np.isnan(ts), -1, ts).astype(np.int64)
+
+    parsed = pd.to_datetime(column, errors='coerce')
+    if getattr(parsed.dt, 'tz', None) is not None:
+        parsed = parsed.dt.tz_convert('UTC').dt.tz_localize(None)
+        offset_s = 0
+    ts = parsed.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    valid = ~parsed.isna().to_numpy()
+    return np.where(valid, ts - offset_s * 10**9, -1)
+
+
+def parse_prices(column):
+    """تبدیل برداری ستون قیمت (با جداکننده هزارگان) به float"""
+    if pd.api.types.is_numeric_dtype(column):
+        return column.to_numpy(dtype=np.float64)
+    cleaned = column.astype(str).str.replace(r'[,\s$]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _find(columns, candidates):
+    for name in candidates:
+        if name in columns:
+            return columns[name]
+    return None
+
+
+def chunk_to_rows(chunk, instrument=None, offset_s=0):
+    """(ردیف‌های آماده نوشتن، تعداد ردیف نامعتبر) از یک تکه"""
+    columns = {str(name).strip().lower(): name for name in chunk.columns}
+    time_column = _find(columns, TIME_COLUMNS)
+    if time_column is None:
+        raise ValueError(f"ستون زمان پیدا نشد (یکی از: {', '.join(TIME_COLUMNS)})")
+    ts = parse_timestamps(chunk[time_column], offset_s)
+
+    values = {}
+    for name in COLUMNS:
+        if name in columns:
+            values[name] = parse_prices(chunk[columns[name]])
+    if not values:
+        price_column = _find(columns, PRICE_COLUMNS)
+        if price_column is None or instrument not in ('global', 'iran'):
+            raise ValueError("ستون قیمت یا بازار (global/iran) مشخص نیست")
+        values[f'{instrument}_price'] = parse_prices(chunk[price_column])
+
+    # ردیف معتبر: زمان معتبر و دست‌کم یک قیمت
+    prices = np.column_stack([values.get(name, np.full(len(ts), np.nan)) for name in COLUMNS])
+    valid = (ts >= 0) & ~np.isnan(prices[:, :2]).all(axis=1)
+    ts, prices = ts[valid], prices[valid]
+
+    # تکراری‌های داخل تکه: آخرین مقدار هر زمان می‌ماند
+    _, last = np.unique(ts[::-1], return_index=True)
+    keep = len(ts) - 1 - last
+    ts, prices = ts[keep], prices[keep]
+
+    # NaN به NULL تبدیل می‌شود تا ستون‌های خالی بعداً قابل تکمیل باشند
+    cells = prices.astype(object)
+    cells[np.isnan(prices)] = None
+    rows = list(zip(ts.tolist(), *(cells[:, index].tolist() for index in range(len(COLUMNS)))))
+    return rows, int((~valid).sum())
+
+
+def import_file(path, store, instrument=None, chunksize=DEFAULT_CHUNKSIZE, offset_s=None, progress=None):
+    """ورود یک فایل تاریخچه به انبار؛ آمار ورود برگردانده می‌شود"""
+    offset_s = local_utc_offset() if offset_s is None else offset_s
+    totals = {'file': os.fspath(path), 'rows': 0, 'invalid': 0, 'written': 0, 'seconds': 0.0}
+    started = time.perf_counter()
+    for chunk in read_chunks(path, chunksize):
+        rows, invalid = chunk_to_rows(chunk, instrument, offset_s)
+        totals['rows'] += len(chunk)
+        totals['invalid'] += invalid
+        totals['written'] += store.merge_many(rows)
+        if progress is not None:
+            progress(totals)
+    totals['seconds'] = time.perf_counter() - started
+    return totals
@@ -0,0 +1,180 @@
+"""
+🕯️ تجمیع افزایشی تیک‌ها در کندل‌های OHLC (۱ دقیقه، ۵ دقیقه، ۱ ساعت، ۱ روز)
+
+هر تیک جدید در O(1) در کندل جاری هر بازه زمانی جمع می‌شود. بازسازی از
+تاریخچه ذخیره‌شده با یک گذر برداری NumPy انجام می‌شود. نمودارها و بازه
+روزانه کارت قیمت مستقیماً از کندل‌های آماده خوانده می‌شوند.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# بازه‌های زمانی پشتیبانی‌شده (ثانیه)
+RESOLUTIONS = {
+    '1m': 60,
+    '5m': 300,
+    '1h': 3600,
+    '1d': 86400,
+}
+
+# یک کندل تکی
+Bar = namedtuple('Bar', ('start_ns', 'open', 'high', 'low', 'close', 'count'))
+
+# آرایه‌های ستونی مجموعه‌ای از کندل‌ها
+BarArrays = namedtuple('BarArrays', ('start_ns', 'open', 'high', 'low', 'close', 'count'))
+
+
+def local_utc_offset():
+    """اختلاف ساعت محلی با UTC (ثانیه) برای مرز روزها"""
+    return time.localtime().tm_gmtoff
+
+
+def build_bars(ts, prices, resolution_s, offset_s=0):
+    """ساخت برداری کندل‌ها از تیک‌های مرتب‌شده بر اساس زمان"""
+    ts = np.asarray(ts, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    # تیک‌های بدون قیمت (مثلاً تاریخچه واردشده فقط برای یک بازار) کنار می‌روند
+    valid = ~np.isnan(prices)
+    if not valid.all():
+        ts, prices = ts[valid], prices[valid]
+    if len(ts) == 0:
+        return BarArrays(np.empty(0, np.int64), *(np.empty(0) for _ in range(4)),
+                         np.empty(0, np.int64))
+
+    resolution_ns = resolution_s * 1_000_000_000
+    offset_ns = offset_s * 1_000_000_000
+    buckets = (ts + offset_ns) // resolution_ns
+
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    bounds = np.append(starts, len(ts))
+    return BarArrays(
+        start_ns=buckets[starts] * resolution_ns - offset_ns,
+        open=prices[starts],
+        high=np.maximum.reduceat(prices, starts),
+        low=np.minimum.reduceat(prices, starts),
+        close=prices[bounds[1:] - 1],
+        count=np.diff(bounds),
+    )
+
+
+class BarSeries:
+    """کندل‌های یک نماد در یک بازه زمانی"""
+
+    def __init__(self, resolution_s, max_bars=2000, offset_s=0):
+        self.resolution_ns = resolution_s * 1_000_000_000
+        self.offset_ns = offset_s * 1_000_000_000
+        self.max_bars = max_bars
+        self._bucket = None
+        self._current = None  # [open, high, low, close, count]
+        self._closed = BarArrays(np.empty(0, np.int64), *(np.empty(0) for _ in range(4)),
+                                 np.empty(0, np.int64))
+        self._pending = []
+
+    def update(self, ts_ns, price):
+        """جمع کردن یک تیک در کندل جاری (O(1))؛ کندل بسته‌شده (یا None) برگردانده می‌شود"""
+        bucket = (ts_ns + self.offset_ns) // self.resolution_ns
+        current = self._current
+        if bucket == self._bucket:
+            if price > current[1]:
+                current[1] = price
+            if price < current[2]:
+                current[2] = price
+            current[3] = price
+            current[4] += 1
+            return None
+        closed = None
+        if current is not None:
+            closed = Bar(self._start_ns(), *current)
+            self._pending.append(closed)
+            if len(self._pending) > self.max_bars:
+                del self._pending[0]
+        self._bucket = bucket
+        self._current = [price, price, price, price, 1]
+        return closed
+
+    def _start_ns(self):
+        return self._bucket * self.resolution_ns - self.offset_ns
+
+    def current(self):
+        """کندل جاری (ناتمام) یا None"""
+        if self._current is None:
+            return None
+        return Bar(self._start_ns(), *self._current)
+
+    def load(self, bars):
+        """جایگزینی کندل‌ها با نتیجه بازسازی برداری"""
+        self._pending = []
+        if len(bars.start_ns) == 0:
+            self._bucket = self._current = None
+            self._closed = bars
+            return
+        self._closed = BarArrays(*(column[-self.max_bars - 1:-1] for column in bars))
+        self._bucket = (int(bars.start_ns[-1]) + self.offset_ns) // self.resolution_ns
+        self._current = [float(bars.open[-1]), float(bars.high[-1]), float(bars.low[-1]),
+                         float(bars.close[-1]), int(bars.count[-1])]
+
+    def arrays(self):
+        """همه کندل‌ها (بسته‌شده و جاری) به‌صورت آرایه‌های ستونی"""
+        if self._pending:
+            # کندل‌های بسته‌شده تازه یکجا به آرایه‌ها منتقل می‌شوند
+            fresh = list(zip(*self._pending))
+            self._closed = BarArrays(*(
+                np.concatenate((column, np.asarray(values, dtype=column.dtype)))[-self.max_bars:]
+                for column, values in zip(self._closed, fresh)
+            ))
+            self._pending = []
+        current = self.current()
+        if current is None:
+            return self._closed
+        return BarArrays(*(
+            np.append(column, value).astype(column.dtype, copy=False)
+            for column, value in zip(self._closed, current)
+        ))
+
+
+class BarAggregator:
+    """کندل‌های همه نمادها در همه بازه‌های زمانی"""
+
+    def __init__(self, resolutions=tuple(RESOLUTIONS), max_bars=2000, offset_s=None):
+        self.resolutions = resolutions
+        self.max_bars = max_bars
+        self.offset_s = local_utc_offset() if offset_s is None else offset_s
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _get(self, instrument, resolution):
+        key = (instrument, resolution)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = BarSeries(RESOLUTIONS[resolution], self.max_bars, self.offset_s)
+        return series
+
+    def update(self, instrument, ts_ns, price):
+        """جمع کردن یک تیک در کندل‌های همه بازه‌ها؛ [(بازه، کندل بسته‌شده)] برگردانده می‌شود"""
+        closed = []
+        with self._lock:
+            for resolution in self.resolutions:
+                bar = self._get(instrument, resolution).update(ts_ns, price)
+                if bar is not None:
+                    closed.append((resolution, bar))
+        return closed
+
+    def rebuild(self, instrument, ts, prices):
+        """بازسازی کندل‌های یک نماد از تاریخچه با یک گذر برداری در هر بازه"""
+        with self._lock:
+            for resolution in self.resolutions:
+                bars = build_bars(ts, prices, RESOLUTIONS[resolution], self.offset_s)
+                self._get(instrument, resolution).load(bars)
+
+    def current(self, instrument, resolution):
+        """کندل جاری یک نماد (مثلاً '1d' برای بازه امروز)"""
+        with self._lock:
+            return self._get(instrument, resolution).current()
+
+    def bars(self, instrument, resolution):
+        """کندل‌های آماده یک نماد برای نمودار"""
+        with self._lock:
+            return self._get(instrument, resolution).arrays()
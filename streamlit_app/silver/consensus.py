@@ -0,0 +1,128 @@
+"""
+⚖️ قیمت اجماعی وزن‌دار از چند منبع
+
+به‌جای انتخاب تصادفی یک منبع، همه قیمت‌های موجود با میانه وزن‌دار ترکیب
+می‌شوند:
+
+- وزن هر منبع با افزایش سن قیمتش به‌صورت نمایی کم می‌شود (نیمه‌عمر)
+  و قیمت‌های قدیمی‌تر از max_age کنار گذاشته می‌شوند
+- منبعی که فاصله‌اش از میانه بیش از k برابر MAD باشد پرت حساب شده و حذف
+  می‌شود
+- انحراف هر منبع از قیمت اجماعی گزارش می‌شود
+
+با رسیدن هر قیمت، فهرست مرتب قیمت‌های همان نماد با bisect به‌روز می‌شود
+(record)؛ اجماع هر زمان لازم باشد بدون انتظار برای بقیه منابع از همین
+فهرست حساب می‌شود (update یا consensus).
+"""
+
+import bisect
+import threading
+import time
+from collections import namedtuple
+
+# نتیجه اجماع یک نماد
+Consensus = namedtuple('Consensus', ('price', 'used', 'rejected', 'deviations', 'updated_at'))
+
+# ضریب تبدیل MAD به انحراف معیار در توزیع نرمال
+MAD_SCALE = 1.4826
+
+
+def weighted_median(prices, weights):
+    """میانه وزن‌دار قیمت‌های مرتب‌شده"""
+    total = sum(weights)
+    if total <= 0:
+        return None
+    half = total / 2
+    running = 0.0
+    for index, (price, weight) in enumerate(zip(prices, weights)):
+        running += weight
+        if running > half:
+            return price
+        if running == half:
+            # وزن دقیقاً نصف شد: میانگین دو قیمت میانی
+            return (price + prices[index + 1]) / 2 if index + 1 < len(prices) else price
+    return prices[-1]
+
+
+class ConsensusAggregator:
+    """اجماع افزایشی قیمت هر نماد از منابع مختلف"""
+
+    def __init__(self, half_life=60.0, max_age=300.0, outlier_k=3.0,
+                 min_spread=0.0005, clock=time.time):
+        self.half_life = half_life
+        self.max_age = max_age
+        self.outlier_k = outlier_k
+        self.min_spread = min_spread  # کف نسبی MAD تا منابع تقریباً یکسان پرت حساب نشوند
+        self.clock = clock
+        self._quotes = {}   # instrument -> {source: (price, trust, received_at)}
+        self._sorted = {}   # instrument -> [(price, source)]
+        self._lock = threading.Lock()
+
+    def record(self, instrument, source, price, trust=1.0, received_at=None):
+        """ثبت قیمت تازه یک منبع بدون محاسبه اجماع (O(log n))"""
+        received_at = self.clock() if received_at is None else received_at
+        with self._lock:
+            self._record(instrument, source, price, trust, received_at)
+
+    def update(self, instrument, source, price, trust=1.0, received_at=None):
+        """ثبت قیمت تازه یک منبع و بازگرداندن اجماع جدید نماد"""
+        received_at = self.clock() if received_at is None else received_at
+        with self._lock:
+            self._record(instrument, source, price, trust, received_at)
+            return self._compute(instrument)
+
+    def _record(self, instrument, source, price, trust, received_at):
+        quotes = self._quotes.setdefault(instrument, {})
+        ordered = self._sorted.setdefault(instrument, [])
+        previous = quotes.get(source)
+        if previous is not None:
+            if previous[0] == price and previous[2] == received_at:
+                return
+            del ordered[bisect.bisect_left(ordered, (previous[0], source))]
+        quotes[source] = (price, trust, received_at)
+        bisect.insort(ordered, (price, source))
+
+    def consensus(self, instrument):
+        """اجماع فعلی یک نماد (یا None اگر قیمت تازه‌ای نیست)"""
+        with self._lock:
+            return self._compute(instrument)
+
+    def _compute(self, instrument):
+        ordered = self._sorted.get(instrument)
+        if not ordered:
+            return None
+        quotes = self._quotes[instrument]
+        now = self.clock()
+
+        prices, weights, names = [], [], []
+        for price, source in ordered:
+            _, trust, received_at = quotes[source]
+            age = max(0.0, now - received_at)
+            if age > self.max_age:
+                continue
+            prices.append(price)
+            weights.append(trust * 0.5 ** (age / self.half_life))
+            names.append(source)
+        if not prices:
+            return None
+
+        median = weighted_median(prices, weights)
+
+        # حذف پرت‌ها بر اساس انحراف مطلق از میانه (MAD)
+        deviations = [abs(price - median) for price in prices]
+        order = sorted(range(len(prices)), key=deviations.__getitem__)
+        mad = weighted_median([deviations[i] for i in order], [weights[i] for i in order])
+        limit = self.outlier_k * max(mad * MAD_SCALE, abs(median) * self.min_spread)
+
+        inliers = [i for i in range(len(prices)) if deviations[i] <= limit]
+        rejected = tuple(names[i] for i in range(len(prices)) if deviations[i] > limit)
+        if rejected:
+            median = weighted_median([prices[i] for i in inliers], [weights[i] for i in inliers])
+
+        return Consensus(
+            price=median,
+            used=tuple(names[i] for i in inliers),
+            rejected=rejected,
+            deviations={name: (price - median) / median * 100 for name, price in zip(names, prices)},
+            updated_at=max(quotes[name][2] for name in names),
+        )
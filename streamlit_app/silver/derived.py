@@ -0,0 +1,139 @@
+"""
+🕸️ گراف وابستگی مقادیر مشتق‌شده
+
+مقادیری مثل معادل دلاری، پریمیوم و قیمت هر کیلو/مثقال فقط به چند ورودی
+(قیمت ایران، قیمت جهانی، نرخ دلار) وابسته‌اند. هر مقدار یک گره با
+فهرست وابستگی‌هایش است:
+
+- تغییر یک ورودی فقط وابسته‌های آن را (به‌صورت گذرا) کثیف علامت می‌زند
+- ورودی با مقدار تکراری هیچ چیزی را کثیف نمی‌کند
+- هر گره تنها هنگام خواندن و فقط اگر کثیف باشد دوباره حساب می‌شود
+
+بنابراین در اجرای دوباره‌ای که هیچ ورودی‌اش عوض نشده هیچ محاسبه‌ای
+انجام نمی‌شود.
+
+گراف‌ها با GraphPool بین نشست‌ها مشترک‌اند: یکی برای نرخ منابع و یکی به
+ازای هر نرخ دستی.
+"""
+
+import threading
+from collections import OrderedDict, defaultdict
+
+from silver.valuation import UNIT_GRAMS
+
+# مقادیر کارت ایران که از گراف خوانده می‌شوند
+CARD_VALUES = ('usd_equivalent', 'premium_percent', 'toman_per_usd', 'per_kilo', 'per_mesghal')
+
+# سقف گراف‌های مشترک (نرخ منابع و نرخ‌های دستی)
+DEFAULT_POOL_SIZE = 64
+
+
+class DerivedGraph:
+    """گراف کوچک محاسبه تنبل (lazy) با ردیابی وابستگی"""
+
+    def __init__(self):
+        self._values = {}
+        self._rules = {}                      # name -> (func, deps)
+        self._dependents = defaultdict(set)   # name -> گره‌های وابسته
+        self._dirty = set()
+        self.recomputed = 0
+
+    def rule(self, name, *deps):
+        """ثبت یک گره مشتق‌شده (به‌صورت دکوراتور)"""
+        def register(func):
+            self._rules[name] = (func, deps)
+            for dep in deps:
+                self._dependents[dep].add(name)
+            self._dirty.add(name)
+            return func
+        return register
+
+    def set(self, name, value):
+        """مقداردهی یک ورودی؛ True اگر مقدار واقعاً تغییر کرده باشد"""
+        if name in self._values and self._values[name] == value:
+            return False
+        self._values[name] = value
+        self._invalidate(name)
+        return True
+
+    def _invalidate(self, name):
+        stack = list(self._dependents[name])
+        while stack:
+            node = stack.pop()
+            if node not in self._dirty:
+                self._dirty.add(node)
+                stack.extend(self._dependents[node])
+
+    def get(self, name):
+        """مقدار یک گره (در صورت کثیف بودن دوباره حساب می‌شود)"""
+        if name in self._dirty:
+            func, deps = self._rules[name]
+            self._values[name] = func(*(self.get(dep) for dep in deps))
+            self._dirty.discard(name)
+            self.recomputed += 1
+        return self._values[name]
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+
+def price_graph(model):
+    """گراف مقادیر مشتق‌شده کارت‌ها از قیمت ایران، قیمت جهانی و نرخ دلار"""
+    graph = DerivedGraph()
+
+    @graph.rule('iran_metrics', 'iran_price', 'exchange_rate', 'global_price')
+    def iran_metrics(iran_price, exchange_rate, global_price):
+        return model.iran_metrics(iran_price, exchange_rate, global_price)
+
+    @graph.rule('usd_equivalent', 'iran_metrics')
+    def usd_equivalent(metrics):
+        return metrics[0]
+
+    @graph.rule('premium_percent', 'iran_metrics')
+    def premium_percent(metrics):
+        return metrics[1]
+
+    @graph.rule('toman_per_usd', 'exchange_rate')
+    def toman_per_usd(exchange_rate):
+        return exchange_rate / 10
+
+    @graph.rule('per_kilo', 'iran_price')
+    def per_kilo(iran_price):
+        return iran_price * UNIT_GRAMS['کیلوگرم']
+
+    @graph.rule('per_mesghal', 'iran_price')
+    def per_mesghal(iran_price):
+        return iran_price * UNIT_GRAMS['مثقال']
+
+    return graph
+
+
+class GraphPool:
+    """گراف‌های مشترک بین نشست‌ها، یکی به ازای هر کلید، با حذف کم‌استفاده‌ترین (LRU)
+
+    همه نشست‌هایی که نرخ منابع را می‌بینند یک گراف دارند و فقط نرخ‌های
+    دستی گراف جدا می‌گیرند؛ نشست‌ها هیچ گرافی در حالت خودشان نگه نمی‌دارند.
+    """
+
+    def __init__(self, factory, size=DEFAULT_POOL_SIZE):
+        self.factory = factory
+        self.size = size
+        self._graphs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def evaluate(self, key, inputs, names):
+        """مقداردهی ورودی‌های گراف کلید و خواندن مقادیر names"""
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is None:
+                graph = self._graphs[key] = self.factory()
+                if len(self._graphs) > self.size:
+                    self._graphs.popitem(last=False)
+            else:
+                self._graphs.move_to_end(key)
+            for name, value in inputs.items():
+                graph.set(name, value)
+            return {name: graph[name] for name in names}
+
+    def __len__(self):
+        return len(self._graphs)
@@ -0,0 +1,107 @@
+"""
+📉 کاهش نمونه سمت سرور برای نمودارهای بزرگ
+
+به‌جای فرستادن صدها هزار نقطه به مرورگر، فقط نقاطی که شکل نمودار را حفظ
+می‌کنند انتخاب می‌شوند:
+
+- LTTB (Largest-Triangle-Three-Buckets) برای خطوط قیمت
+- کمینه/بیشینه هر سطل (هر پیکسل) به‌صورت کاملاً برداری
+
+هر دو تابع اندیس نقاط انتخاب‌شده را برمی‌گردانند تا همه ستون‌ها با یک
+اندیس برش بخورند. DownsampleMemo اندیس‌ها را به ازای (نسخه بافر، بازه)
+بین نشست‌ها نگه می‌دارد تا هر نما فقط یک بار کاهش نمونه شود.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# سقف اندیس‌های کش‌شده (نسخه‌های قدیمی بافر دیگر خوانده نمی‌شوند)
+DEFAULT_MEMO_SIZE = 32
+
+
+def lttb_indices(x, y, n_out):
+    """اندیس n_out نقطه منتخب با الگوریتم LTTB"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64) - float(x[0])
+    y = np.asarray(y, dtype=np.float64)
+
+    # مرزهای n_out - 2 سطل میانی (نقطه اول و آخر همیشه نگه داشته می‌شوند)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    next_edges = np.append(edges[2:], n)
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        avg_x = x[hi:next_edges[i]].mean()
+        avg_y = y[hi:next_edges[i]].mean()
+        # مساحت مثلث بین نقطه قبلی، هر نامزد و میانگین سطل بعدی
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def minmax_indices(y, n_buckets):
+    """اندیس کمینه و بیشینه هر سطل (حداکثر 2 * n_buckets نقطه)"""
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    width = -(-n // n_buckets)
+    padded = np.full(width * n_buckets, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(n_buckets, width)
+    offsets = np.arange(n_buckets) * width
+
+    valid = ~np.isnan(blocks).all(axis=1)
+    lows = np.nanargmin(blocks[valid], axis=1) + offsets[valid]
+    highs = np.nanargmax(blocks[valid], axis=1) + offsets[valid]
+    return np.unique(np.concatenate(([0, n - 1], lows, highs)))
+
+
+def downsample(x, ys, n_out, method='lttb'):
+    """اندیس مشترک برای چند سری؛ اجتماع نقاط منتخب هر سری"""
+    if len(x) <= n_out:
+        return np.arange(len(x))
+    if method == 'minmax':
+        picks = [minmax_indices(y, max(1, n_out // 2)) for y in ys]
+    else:
+        picks = [lttb_indices(x, y, n_out) for y in ys]
+    return np.unique(np.concatenate(picks))
+
+
+class DownsampleMemo:
+    """کش مشترک اندیس‌های منتخب با کلید (نسخه بافر، بازه، تعداد نقاط) و حذف LRU"""
+
+    def __init__(self, size=DEFAULT_MEMO_SIZE):
+        self.size = size
+        self._picked = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def pick(self, version, arrays, n_out, method='lttb'):
+        """اندیس مشترک قیمت جهانی و ایران نمای arrays (نمای نسخه version بافر)"""
+        key = (version, len(arrays.ts), n_out, method)
+        with self._lock:
+            picked = self._picked.get(key)
+            if picked is not None:
+                self._picked.move_to_end(key)
+                self.hits += 1
+                return picked
+        picked = downsample(arrays.ts, (arrays.global_price, arrays.iran_price), n_out, method)
+        picked.flags.writeable = False
+        with self._lock:
+            self.misses += 1
+            self._picked[key] = picked
+            if len(self._picked) > self.size:
+                self._picked.popitem(last=False)
+        return picked
@@ -0,0 +1,185 @@
+"""
+📡 موتور دریافت هم‌زمان قیمت از همه منابع
+
+همه منابع با asyncio به‌صورت موازی پرسیده می‌شوند؛ هر منبع مهلت (timeout)
+مخصوص خودش را دارد و منبع کند فقط نتیجه خودش را از دست می‌دهد. بنابراین
+زمان کل یک بروزرسانی برابر کندترین منبع سالم است، نه مجموع همه منابع.
+
+درخواست‌های HTTP از کلاینت مشترک (silver.http_client) با استخر اتصال،
+درخواست شرطی، محدودیت نرخ و قطع‌کننده مدار فرستاده می‌شوند.
+
+برای تست آفلاین کافی است آدرس هر منبع را با متغیر محیطی
+SILVER_SOURCE_<KEY>_URL به یک سرور HTTP محلی اشاره دهید
+(مثلاً benchmarks/stub_sources.py).
+"""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+
+from silver.http_client import default_client
+from silver.profiling import PROFILER
+
+# مهلت پیش‌فرض هر منبع (ثانیه)
+DEFAULT_TIMEOUT = 3.0
+
+# کمترین فاصله بین دو درخواست واقعی به یک منبع (ثانیه)
+DEFAULT_MIN_INTERVAL = 1.0
+
+
+class QuoteSource:
+    """تعریف یک منبع قیمت"""
+
+    def __init__(self, key, name, instrument, weight=1.0, url=None,
+                 timeout=DEFAULT_TIMEOUT, simulate=None, trust=1.0,
+                 min_interval=DEFAULT_MIN_INTERVAL):
+        self.key = key
+        self.name = name
+        self.instrument = instrument
+        self.weight = weight
+        # وزن اعتماد منبع در قیمت اجماعی
+        self.trust = trust
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.simulate = simulate
+        # آدرس واقعی منبع؛ در نبود آن از شبیه‌ساز استفاده می‌شود
+        self.url = url or os.environ.get(f"SILVER_SOURCE_{key.upper()}_URL")
+
+    def __repr__(self):
+        return f"QuoteSource({self.key!r}, instrument={self.instrument!r})"
+
+
+@dataclass(frozen=True)
+class SourceQuote:
+    """نتیجه دریافت از یک منبع"""
+
+    source: str
+    key: str
+    instrument: str
+    price: float = None
+    latency: float = 0.0
+    error: str = None
+    trust: float = 1.0
+    received_at: float = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None and self.price is not None
+
+
+def parse_price(body):
+    """استخراج قیمت از پاسخ منبع (JSON با فیلد price/last یا عدد خام)"""
+    text = body.strip()
+    if text.startswith('{'):
+        data = json.loads(text)
+        for field in ('price', 'last', 'value'):
+            if field in data:
+                return float(data[field])
+        raise ValueError("فیلد قیمت در پاسخ منبع پیدا نشد")
+    return float(text.replace(',', ''))
+
+
+async def _read_price(client, source):
+    """خواندن قیمت خام از منبع (HTTP یا شبیه‌ساز)"""
+    if source.url is None:
+        if source.simulate is None:
+            raise ValueError("منبع نه آدرس دارد نه شبیه‌ساز")
+        return float(source.simulate())
+    return parse_price(await client.get_text(source.url))
+
+
+def _fallback(client, source, reason):
+    """آخرین قیمت سالم منبع (با زمان دریافت خودش) یا نتیجه خطا"""
+    quote = client.last_good.get(source.key)
+    if quote is not None:
+        return quote
+    return SourceQuote(source=source.name, key=source.key, instrument=source.instrument,
+                       error=reason, trust=source.trust, received_at=time.time())
+
+
+async def _fetch_one(client, source, timeout=None, on_quote=None):
+    """دریافت از یک منبع با مهلت مخصوص خودش"""
+    if source.url is not None:
+        allowed, reason = client.allow(source)
+        if not allowed:
+            # منبع خراب یا پرتکرار پرسیده نمی‌شود
+            quote = _fallback(client, source, reason)
+            if on_quote is not None and quote.ok:
+                on_quote(quote)
+            return quote
+
+    started = time.perf_counter()
+    price, error = None, None
+    try:
+        price = await asyncio.wait_for(_read_price(client, source),
+                                       timeout or source.timeout)
+    except asyncio.TimeoutError:
+        error = 'timeout'
+    except Exception as exc:
+        # هر خطای منبع (حتی پاسخ نامعتبری مثل {"price": null}) فقط نتیجه همان
+        # منبع است و باید در قطع‌کننده مدار ثبت شود
+        error = str(exc) or exc.__class__.__name__
+
+    return _finish(client, source, price, error, time.perf_counter() - started, on_quote)
+
+
+def _simulate_one(client, source, on_quote=None):
+    """قیمت منبع شبیه‌سازی‌شده بی‌درنگ و بدون ساخت task"""
+    started = time.perf_counter()
+    price, error = None, None
+    try:
+        price = float(source.simulate())
+    except Exception as exc:
+        error = str(exc) or exc.__class__.__name__
+    return _finish(client, source, price, error, time.perf_counter() - started, on_quote)
+
+
+def _finish(client, source, price, error, latency, on_quote):
+    """ساخت نتیجه منبع، ثبت در کلاینت و اطلاع به مصرف‌کننده"""
+    if PROFILER.enabled:
+        PROFILER.record(f'fetch.{source.key}', latency)
+
+    quote = SourceQuote(
+        source=source.name,
+        key=source.key,
+        instrument=source.instrument,
+        price=price,
+        latency=latency,
+        error=error,
+        trust=source.trust,
+        received_at=time.time(),
+    )
+    if source.url is not None:
+        client.record(source, quote)
+    # اطلاع فوری به مصرف‌کننده بدون انتظار برای بقیه منابع
+    if on_quote is not None and quote.ok:
+        on_quote(quote)
+    return quote
+
+
+async def fetch_all(sources, timeout=None, on_quote=None, client=None):
+    """دریافت هم‌زمان از همه منابع؛ منابع کند یا خراب با خطا برمی‌گردند
+
+    on_quote (اختیاری) با رسیدن هر قیمت سالم بلافاصله صدا زده می‌شود.
+    """
+    client = client or default_client()
+    # منابع شبیه‌سازی‌شده بی‌درنگ پاسخ می‌دهند؛ فقط منابع HTTP هم‌زمان پرسیده می‌شوند
+    results = [None] * len(sources)
+    remote = []
+    for index, source in enumerate(sources):
+        if source.url is None and source.simulate is not None:
+            results[index] = _simulate_one(client, source, on_quote)
+        else:
+            remote.append(index)
+    fetched = await asyncio.gather(*(_fetch_one(client, sources[i], timeout, on_quote) for i in remote))
+    for index, quote in zip(remote, fetched):
+        results[index] = quote
+    return results
+
+
+def fetch_quotes(sources, timeout=None, on_quote=None, client=None):
+    """نسخه همگام fetch_all (روی حلقه ثابت کلاینت مشترک)"""
+    client = client or default_client()
+    return client.run(fetch_all(sources, timeout, on_quote, client))
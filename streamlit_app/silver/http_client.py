@@ -0,0 +1,218 @@
+"""
+🌐 کلاینت HTTP مشترک منابع قیمت
+
+- یک ClientSession با استخر اتصال keep-alive روی یک حلقه رویداد ثابت در
+  نخ پس‌زمینه؛ بنابراین هر بروزرسانی اتصال TCP/TLS تازه باز نمی‌کند
+- درخواست شرطی با ETag / If-Modified-Since؛ پاسخ 304 از بدنه ذخیره‌شده
+  خوانده می‌شود و صفحه دوباره دانلود نمی‌شود
+- محدودیت نرخ (token bucket) و قطع‌کننده مدار (circuit breaker) برای هر
+  منبع؛ منبع خراب پس از چند خطای پیاپی تا مدتی پرسیده نمی‌شود و به‌جای آن
+  آخرین قیمت سالمش برگردانده می‌شود
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+from collections import namedtuple
+
+# تنظیمات پیش‌فرض استخر اتصال
+DEFAULT_POOL_SIZE = 32
+DEFAULT_KEEPALIVE = 60.0
+
+# تنظیمات پیش‌فرض قطع‌کننده مدار
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# اعتبارسنج‌های پاسخ قبلی یک آدرس برای درخواست شرطی
+Validators = namedtuple('Validators', ('etag', 'last_modified', 'body'))
+
+
+class CircuitBreaker:
+    """قطع‌کننده مدار سه‌حالته (بسته، باز، نیمه‌باز)"""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self):
+        """آیا درخواست مجاز است؟ (پس از مهلت، یک درخواست آزمایشی)"""
+        if self.state == self.OPEN:
+            if self.clock() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            return True
+        # در حالت نیمه‌باز فقط همان یک درخواست آزمایشی در جریان است
+        return self.state == self.CLOSED
+
+    def success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = self.clock()
+
+
+class RateLimiter:
+    """محدودیت نرخ token bucket"""
+
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+
+    def allow(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class HttpClient:
+    """کلاینت مشترک با استخر اتصال، درخواست شرطی و محافظت از منابع"""
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, keepalive=DEFAULT_KEEPALIVE,
+                 failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.last_good = {}     # کلید منبع -> آخرین SourceQuote سالم
+        self._validators = {}   # آدرس -> Validators
+        self._breakers = {}
+        self._limiters = {}
+        self._counters = {'requests': 0, 'not_modified': 0, 'connections': 0,
+                          'rate_limited': 0, 'short_circuited': 0}
+        self._loop = None
+        self._session = None
+        self._lock = threading.Lock()
+
+    # --- حلقه رویداد ثابت ---------------------------------------------------
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='silver-http', daemon=True).start()
+            return self._loop
+
+    def run(self, coro):
+        """اجرای یک coroutine روی حلقه کلاینت و انتظار برای نتیجه"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    async def session(self):
+        """نشست HTTP مشترک (در اولین استفاده ساخته می‌شود)"""
+        if self._session is None:
+            # aiohttp فقط با اولین درخواست واقعی وارد می‌شود؛ خواننده‌ها و
+            # منابع شبیه‌سازی‌شده به آن نیازی ندارند
+            import aiohttp
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._on_connection)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive,
+                                               ttl_dns_cache=300),
+                trace_configs=[trace],
+            )
+        return self._session
+
+    async def _on_connection(self, session, context, params):
+        self._counters['connections'] += 1
+
+    def close(self):
+        if self._loop is None:
+            return
+        if self._session is not None:
+            self.run(self._session.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    # --- محافظت از منابع ------------------------------------------------------
+
+    def allow(self, source):
+        """(مجاز بودن درخواست، دلیل رد)"""
+        breaker = self._breakers.get(source.key)
+        if breaker is None:
+            breaker = self._breakers[source.key] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        if not breaker.allow():
+            self._counters['short_circuited'] += 1
+            return False, 'circuit open'
+
+        if source.min_interval:
+            limiter = self._limiters.get(source.key)
+            if limiter is None:
+                limiter = self._limiters[source.key] = RateLimiter(1.0 / source.min_interval)
+            if not limiter.allow():
+                self._counters['rate_limited'] += 1
+                return False, 'rate limited'
+        return True, None
+
+    def record(self, source, quote):
+        """ثبت نتیجه درخواست در قطع‌کننده مدار و آخرین قیمت سالم"""
+        breaker = self._breakers[source.key]
+        if quote.ok:
+            breaker.success()
+            self.last_good[source.key] = quote
+        else:
+            breaker.failure()
+
+    def breaker_state(self, key):
+        breaker = self._breakers.get(key)
+        return breaker.state if breaker else CircuitBreaker.CLOSED
+
+    # --- درخواست شرطی ---------------------------------------------------------
+
+    async def get_text(self, url):
+        """دریافت بدنه با درخواست شرطی؛ پاسخ 304 از بدنه قبلی خوانده می‌شود"""
+        session = await self.session()
+        cached = self._validators.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        self._counters['requests'] += 1
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and cached is not None:
+                self._counters['not_modified'] += 1
+                return cached.body
+            response.raise_for_status()
+            body = await response.text()
+            etag, modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+            if etag or modified:
+                self._validators[url] = Validators(etag, modified, body)
+            return body
+
+    def stats(self):
+        return dict(self._counters, open_circuits=sorted(
+            key for key, breaker in self._breakers.items() if breaker.state != CircuitBreaker.CLOSED
+        ))
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    """کلاینت مشترک پروسه"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpClient()
+            atexit.register(_default.close)
+        return _default
@@ -0,0 +1,255 @@
+"""
+📈 شاخص‌های تکنیکال افزایشی روی کندل‌ها
+
+SMA، EMA، RSI (ویلدر)، باندهای بولینگر و سطوح حمایت/مقاومت پیوت کلاسیک
+برای هر (نماد، بازه زمانی، پنجره) نگه‌داری می‌شوند:
+
+- با بسته شدن هر کندل همه شاخص‌ها در O(1) به‌روز می‌شوند
+- بازسازی از تاریخچه با یک گذر برداری NumPy انجام می‌شود و حالت نهایی آن
+  دقیقاً همان حالت مسیر افزایشی است
+- خلاصه شاخص‌ها فقط با بسته شدن کندل دوباره ساخته می‌شود و در عکس‌فوری
+  منتشر می‌شود؛ نوار کناری و نمودار هیچ محاسبه‌ای در هر اجرا ندارند
+"""
+
+import threading
+from collections import deque, namedtuple
+from types import MappingProxyType
+
+import numpy as np
+
+# پنجره پیش‌فرض SMA / EMA / بولینگر و دوره RSI
+DEFAULT_WINDOW = 20
+RSI_PERIOD = 14
+BOLLINGER_K = 2.0
+
+# (نماد، بازه زمانی) شاخص‌های منتشرشده؛ پیوت روزانه سطوح حمایت/مقاومت است
+DEFAULT_KEYS = (('global', '1h'), ('global', '1d'), ('iran', '1h'), ('iran', '1d'))
+
+# مقادیر شاخص‌ها پس از آخرین کندل بسته‌شده (None تا وقتی داده کافی نیست)
+Indicators = namedtuple('Indicators', (
+    'bars', 'close', 'sma', 'ema', 'rsi', 'bb_upper', 'bb_lower',
+    'pivot', 'r1', 's1', 'r2', 's2',
+))
+
+
+def linear_recurrence(values, decay, start):
+    """بازگشت خطی برداری: x[t] = decay * x[t-1] + values[t]
+
+    در هر بلوک x با ضرایب decay**k و یک cumsum حساب می‌شود؛ طول بلوک طوری
+    انتخاب می‌شود که decay**-k بزرگ نشود و دقت از دست نرود.
+    """
+    out = np.empty(len(values), dtype=np.float64)
+    block = len(values) if decay >= 1 else max(1, int(np.log(1e6) / -np.log(decay)))
+    previous = start
+    for begin in range(0, len(values), block):
+        chunk = values[begin:begin + block]
+        powers = decay ** np.arange(len(chunk))
+        result = powers * (decay * previous + np.cumsum(chunk / powers))
+        out[begin:begin + len(chunk)] = result
+        previous = result[-1]
+    return out
+
+
+def _rsi(avg_gain, avg_loss):
+    if avg_loss == 0:
+        return 50.0 if avg_gain == 0 else 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def _pivots(high, low, close):
+    """پیوت کلاسیک (floor) از سقف، کف و پایانی کندل قبلی"""
+    pivot = (high + low + close) / 3
+    return pivot, 2 * pivot - low, 2 * pivot - high, pivot + (high - low), pivot - (high - low)
+
+
+def indicator_arrays(close, window=DEFAULT_WINDOW, rsi_period=RSI_PERIOD, k=BOLLINGER_K):
+    """محاسبه برداری سری کامل شاخص‌ها (برای نمودار و بازسازی)؛ نقاط ناکافی NaN"""
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    sma, ema, std, rsi = (np.full(n, np.nan) for _ in range(4))
+
+    if n >= window:
+        # میانگین و واریانس لغزان با cumsum روی مقادیر انتقال‌یافته (پایداری عددی)
+        shifted = close - close[0]
+        sums = np.cumsum(np.concatenate(([0.0], shifted)))
+        squares = np.cumsum(np.concatenate(([0.0], shifted * shifted)))
+        window_sum = sums[window:] - sums[:-window]
+        window_sq = squares[window:] - squares[:-window]
+        mean = window_sum / window
+        sma[window - 1:] = mean + close[0]
+        std[window - 1:] = np.sqrt(np.maximum(window_sq / window - mean * mean, 0.0))
+
+        # EMA با شروع از SMA اولین پنجره
+        alpha = 2.0 / (window + 1)
+        ema[window - 1] = sma[window - 1]
+        ema[window:] = linear_recurrence(alpha * close[window:], 1 - alpha, sma[window - 1])
+
+    if n > rsi_period:
+        change = np.diff(close)
+        gain, loss = np.maximum(change, 0.0), np.maximum(-change, 0.0)
+        decay = 1 - 1.0 / rsi_period
+        avg_gain = linear_recurrence(gain[rsi_period:] / rsi_period, decay, gain[:rsi_period].mean())
+        avg_loss = linear_recurrence(loss[rsi_period:] / rsi_period, decay, loss[:rsi_period].mean())
+        avg_gain = np.concatenate(([gain[:rsi_period].mean()], avg_gain))
+        avg_loss = np.concatenate(([loss[:rsi_period].mean()], avg_loss))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        values = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), values)
+        rsi[rsi_period:] = values
+    return sma, ema, sma + k * std, sma - k * std, rsi
+
+
+class IndicatorSet:
+    """شاخص‌های یک (نماد، بازه زمانی، پنجره) با به‌روزرسانی O(1) در هر کندل"""
+
+    def __init__(self, window=DEFAULT_WINDOW, rsi_period=RSI_PERIOD, k=BOLLINGER_K):
+        self.window = window
+        self.rsi_period = rsi_period
+        self.k = k
+        self.alpha = 2.0 / (window + 1)
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self._closes = deque(maxlen=self.window)
+        self._ref = None        # مبدأ انتقال مقادیر برای جمع‌های پایدار
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._ema = None
+        self._previous = None   # پایانی کندل قبلی
+        self._gains = 0.0       # جمع (و سپس میانگین ویلدر) سودها
+        self._losses = 0.0
+        self._last_bar = None   # (high, low, close) برای پیوت
+
+    def add(self, high, low, close):
+        """افزودن یک کندل بسته‌شده"""
+        if self._ref is None:
+            self._ref = close
+        shifted = close - self._ref
+        if len(self._closes) == self.window:
+            dropped = self._closes[0] - self._ref
+            self._sum -= dropped
+            self._sum_sq -= dropped * dropped
+        self._closes.append(close)
+        self._sum += shifted
+        self._sum_sq += shifted * shifted
+        self.count += 1
+
+        if self.count == self.window:
+            self._ema = self._sum / self.window + self._ref
+        elif self.count > self.window:
+            self._ema += self.alpha * (close - self._ema)
+
+        if self._previous is not None:
+            change = close - self._previous
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            period = self.rsi_period
+            if self.count <= period + 1:
+                # دوره اول: جمع ساده، سپس میانگین
+                self._gains += gain
+                self._losses += loss
+                if self.count == period + 1:
+                    self._gains /= period
+                    self._losses /= period
+            else:
+                self._gains += (gain - self._gains) / period
+                self._losses += (loss - self._losses) / period
+        self._previous = close
+        self._last_bar = (high, low, close)
+
+    def load(self, bars):
+        """بازسازی برداری از کندل‌های بسته‌شده (BarArrays)"""
+        self._reset()
+        close = np.asarray(bars.close, dtype=np.float64)
+        n = len(close)
+        if n == 0:
+            return
+        sma, ema, _, _, _ = indicator_arrays(close, self.window, self.rsi_period, self.k)
+
+        self.count = n
+        self._closes.extend(close[-self.window:].tolist())
+        self._ref = float(close[0])
+        tail = close[-self.window:] - self._ref
+        self._sum = float(tail.sum())
+        self._sum_sq = float((tail * tail).sum())
+        self._ema = float(ema[-1]) if n >= self.window else None
+        self._previous = float(close[-1])
+
+        change = np.diff(close)
+        gain, loss = np.maximum(change, 0.0), np.maximum(-change, 0.0)
+        period = self.rsi_period
+        if n <= period:
+            self._gains, self._losses = float(gain.sum()), float(loss.sum())
+        else:
+            decay = 1 - 1.0 / period
+            self._gains = float(linear_recurrence(gain[period:] / period, decay, gain[:period].mean())[-1]
+                                if n > period + 1 else gain[:period].mean())
+            self._losses = float(linear_recurrence(loss[period:] / period, decay, loss[:period].mean())[-1]
+                                 if n > period + 1 else loss[:period].mean())
+        self._last_bar = (float(bars.high[-1]), float(bars.low[-1]), float(close[-1]))
+
+    def values(self):
+        """مقادیر فعلی شاخص‌ها"""
+        if self.count == 0:
+            return Indicators(0, *(None for _ in Indicators._fields[1:]))
+        sma = upper = lower = None
+        if self.count >= self.window:
+            mean = self._sum / self.window
+            std = max(self._sum_sq / self.window - mean * mean, 0.0) ** 0.5
+            sma = mean + self._ref
+            upper, lower = sma + self.k * std, sma - self.k * std
+        rsi = _rsi(self._gains, self._losses) if self.count > self.rsi_period else None
+        return Indicators(self.count, self._previous, sma, self._ema, rsi, upper, lower,
+                          *_pivots(*self._last_bar))
+
+
+class IndicatorEngine:
+    """شاخص‌های همه کلیدها با کش نتیجه به ازای (نماد، بازه زمانی، پنجره)"""
+
+    def __init__(self, keys=DEFAULT_KEYS, window=DEFAULT_WINDOW):
+        self.keys = tuple(keys)
+        self.window = window
+        self._sets = {}
+        self._summary = MappingProxyType({})
+        self._lock = threading.Lock()
+        for instrument, resolution in self.keys:
+            self._sets[(instrument, resolution, window)] = IndicatorSet(window)
+
+    def rebuild(self, bars):
+        """بازسازی برداری همه کلیدها از کندل‌های BarAggregator (بدون کندل جاری)"""
+        with self._lock:
+            for (instrument, resolution, _), indicator_set in self._sets.items():
+                arrays = bars.bars(instrument, resolution)
+                if bars.current(instrument, resolution) is not None:
+                    arrays = type(arrays)(*(column[:-1] for column in arrays))
+                indicator_set.load(arrays)
+            self._summary = self._build_summary()
+
+    def add_bars(self, instrument, closed):
+        """افزودن کندل‌های تازه بسته‌شده [(بازه زمانی، Bar)]؛ True اگر خلاصه عوض شد"""
+        changed = False
+        with self._lock:
+            for resolution, bar in closed:
+                indicator_set = self._sets.get((instrument, resolution, self.window))
+                if indicator_set is not None:
+                    indicator_set.add(bar.high, bar.low, bar.close)
+                    changed = True
+            if changed:
+                self._summary = self._build_summary()
+        return changed
+
+    def _build_summary(self):
+        summary = {}
+        for (instrument, resolution, _), indicator_set in self._sets.items():
+            summary.setdefault(instrument, {})[resolution] = indicator_set.values()
+        return MappingProxyType({name: MappingProxyType(values) for name, values in summary.items()})
+
+    def get(self, instrument, resolution, window=None):
+        """مقادیر یک کلید (None اگر نگه‌داری نمی‌شود)"""
+        with self._lock:
+            indicator_set = self._sets.get((instrument, resolution, window or self.window))
+            return indicator_set.values() if indicator_set is not None else None
+
+    def summary(self):
+        """خلاصه تغییرناپذیر {نماد: {بازه زمانی: Indicators}} برای عکس‌فوری"""
+        return self._summary
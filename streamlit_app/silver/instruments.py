@@ -0,0 +1,142 @@
+"""
+🗂️ فهرست نمادها (فلزات، سکه‌ها و ارزها) و منابع قیمت هر یک
+
+هر نماد منابع، واحد، ارز و ضریب تبدیلش (گرم فلز خالص در هر واحد) را اعلام
+می‌کند. مدل قیمت منابع همه نمادها را یکجا می‌سازد؛ بنابراین دریافت، کش
+و ذخیره همه نمادها در یک دور انجام می‌شود و کارت‌های صفحه از همین فهرست
+ساخته می‌شوند. افزودن نماد تازه فقط یک ورودی در این فهرست است.
+
+سه نماد اصلی ('global'، 'iran' و 'fx') منطق قیمت‌گذاری و کارت مخصوص
+خودشان را دارند؛ بقیه با مسیر عمومی قیمت‌گذاری می‌شوند.
+"""
+
+from dataclasses import dataclass
+
+# نمادهای اصلی با قیمت‌گذاری و کارت مخصوص
+CORE_INSTRUMENTS = ('global', 'iran', 'fx')
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """یک منبع قیمت نماد"""
+
+    key: str
+    name: str
+    weight: float = 1.0
+    trust: float = 1.0
+
+
+@dataclass(frozen=True)
+class Instrument:
+    """تعریف یک نماد"""
+
+    key: str
+    name: str
+    icon: str
+    market: str             # 'global' (دلار)، 'iran' (تومان) یا 'fx' (ریال)
+    unit: str
+    currency: str
+    reference: float        # قیمت مرجع امروز
+    sources: tuple
+    metal: str = None       # فلز پایه برای محاسبه پریمیوم
+    fine_grams: float = None  # گرم فلز خالص در هر واحد
+    symbol: str = ''
+    volatility: float = 0.003  # دامنه نوسان شبیه‌ساز
+    card: bool = True
+
+    @property
+    def digits(self):
+        """تعداد رقم اعشار نمایش و گرد کردن"""
+        if self.currency != 'USD':
+            return 0
+        return 2 if self.reference >= 1000 else 3
+
+
+class InstrumentRegistry:
+    """فهرست مرتب نمادها"""
+
+    def __init__(self, instruments=()):
+        self._instruments = {}
+        for instrument in instruments:
+            self.register(instrument)
+
+    def register(self, instrument):
+        if instrument.key in self._instruments:
+            raise ValueError(f"نماد {instrument.key} از قبل ثبت شده است")
+        keys = {spec.key for item in self._instruments.values() for spec in item.sources}
+        duplicated = keys.intersection(spec.key for spec in instrument.sources)
+        if duplicated:
+            raise ValueError(f"کلید منبع تکراری: {', '.join(sorted(duplicated))}")
+        self._instruments[instrument.key] = instrument
+        return instrument
+
+    def __iter__(self):
+        return iter(self._instruments.values())
+
+    def __len__(self):
+        return len(self._instruments)
+
+    def __contains__(self, key):
+        return key in self._instruments
+
+    def __getitem__(self, key):
+        return self._instruments[key]
+
+    def extras(self):
+        """نمادهای غیراصلی (قیمت‌گذاری عمومی)"""
+        return [item for item in self if item.key not in CORE_INSTRUMENTS]
+
+
+DEFAULT_INSTRUMENTS = (
+    # --- نمادهای اصلی ---------------------------------------------------------
+    Instrument('global', 'نقره جهانی', '🌍', 'global', 'اونس', 'USD', 77.665, (
+        SourceSpec('investing', 'Investing.com', 1.0),
+        SourceSpec('kitco', 'Kitco', 1.001),
+        SourceSpec('bloomberg', 'Bloomberg', 0.999),
+    ), metal='silver', fine_grams=31.1035, symbol='SIH6'),
+    Instrument('iran', 'نقره ایران', '🇮🇷', 'iran', 'گرم', 'TOMAN', 470000, (
+        SourceSpec('tgju', 'TGJU', 1.0),
+        SourceSpec('talachart', 'طلاچارت', 1.02),
+        SourceSpec('nerkhyab', 'نرخ‌یاب', 0.98),
+    ), metal='silver', fine_grams=1.0),
+    Instrument('fx', 'دلار آزاد', '💵', 'fx', 'ریال', 'RIAL', 600000, (
+        SourceSpec('bonbast', 'Bonbast', 1.0),
+        SourceSpec('alanchand', 'الان‌چند', 1.002),
+        SourceSpec('navasan', 'نوسان', 0.998),
+    ), symbol='USD', card=False),
+
+    # --- فلزات جهانی (دلار/اونس) ----------------------------------------------
+    Instrument('gold', 'طلای جهانی', '🥇', 'global', 'اونس', 'USD', 2650.0, (
+        SourceSpec('investing_gold', 'Investing.com', 1.0),
+        SourceSpec('kitco_gold', 'Kitco', 1.0005),
+    ), metal='gold', fine_grams=31.1035, symbol='XAU'),
+    Instrument('platinum', 'پلاتین جهانی', '⚪', 'global', 'اونس', 'USD', 940.0, (
+        SourceSpec('investing_platinum', 'Investing.com', 1.0),
+        SourceSpec('kitco_platinum', 'Kitco', 0.999),
+    ), metal='platinum', fine_grams=31.1035, symbol='XPT', volatility=0.005),
+
+    # --- بازار ایران (تومان) ---------------------------------------------------
+    Instrument('gold18', 'طلای ۱۸ عیار', '💛', 'iran', 'گرم', 'TOMAN', 3_900_000, (
+        SourceSpec('tgju_gold18', 'TGJU', 1.0),
+        SourceSpec('talachart_gold18', 'طلاچارت', 1.001),
+    ), metal='gold', fine_grams=0.75),
+    Instrument('coin_emami', 'سکه امامی', '🪙', 'iran', 'عدد', 'TOMAN', 42_000_000, (
+        SourceSpec('tgju_coin_emami', 'TGJU', 1.0),
+        SourceSpec('alanchand_coin_emami', 'الان‌چند', 1.001),
+    ), metal='gold', fine_grams=7.3224, volatility=0.006),
+
+    # --- ارزها (ریال) ---------------------------------------------------------
+    Instrument('eur', 'یورو', '💶', 'fx', 'ریال', 'RIAL', 630_000, (
+        SourceSpec('bonbast_eur', 'Bonbast', 1.0),
+        SourceSpec('alanchand_eur', 'الان‌چند', 1.001),
+    ), symbol='EUR', volatility=0.005),
+    Instrument('aed', 'درهم امارات', '🇦🇪', 'fx', 'ریال', 'RIAL', 163_500, (
+        SourceSpec('bonbast_aed', 'Bonbast', 1.0),
+        SourceSpec('navasan_aed', 'نوسان', 0.999),
+    ), symbol='AED', volatility=0.005),
+)
+
+
+def default_registry():
+    """فهرست پیش‌فرض نمادها"""
+    return InstrumentRegistry(DEFAULT_INSTRUMENTS)
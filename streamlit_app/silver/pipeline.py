@@ -0,0 +1,53 @@
+"""
+🏭 ساخت زنجیره دریافت قیمت بدون وابستگی به Streamlit
+
+هم نخ درون اپ و هم پروسه مستقل ingest.py زنجیره را از همین‌جا می‌سازند:
+منابع و مدل قیمت، کش، انبار تیک‌ها، کندل‌ها، شاخص‌های تکنیکال و آمار
+پریمیوم بازسازی‌شده از تاریخچه، و هشدارها.
+"""
+
+import os
+import time
+
+from silver.analytics import PremiumAnalytics
+from silver.bars import BarAggregator
+from silver.indicators import IndicatorEngine
+from silver.poller import DEFAULT_INTERVAL, PricePoller
+from silver.pricing import PriceModel
+from silver.quote_cache import DEFAULT_TTL, QuoteCache
+from silver.simulator import TickFeed
+from silver.tick_store import TickStore
+
+# بازه تاریخچه‌ای که کندل‌ها و آمار از آن بازسازی می‌شوند (روز)
+HISTORY_DAYS = 30
+
+
+def build_poller(model=None, cache=None, store=None, buffer=None, alerts=None,
+                 publisher=None, interval=None, history_days=HISTORY_DAYS):
+    """ساخت PricePoller با همه اجزا (بدون شروع نخ)"""
+    if model is None:
+        model = PriceModel()
+        # SILVER_SIM_SEED: قیمت‌های شبیه‌سازی‌شده تکرارپذیر (حالت نمایشی و بار آزمایشی)
+        seed = os.environ.get('SILVER_SIM_SEED')
+        if seed:
+            model.feed = TickFeed.simulated(model, seed=int(seed),
+                                            speed=float(os.environ.get('SILVER_SIM_SPEED', 1)))
+    store = store or TickStore()
+    if cache is None:
+        cache = QuoteCache(ttl=float(os.environ.get('SILVER_QUOTE_TTL', DEFAULT_TTL)))
+    if interval is None:
+        interval = float(os.environ.get('SILVER_POLL_INTERVAL', DEFAULT_INTERVAL))
+
+    # کندل‌ها و آمار پریمیوم از تاریخچه اخیر انبار
+    history = store.range(start_ns=time.time_ns() - history_days * 86400 * 10**9)
+    bars = BarAggregator()
+    bars.rebuild('global', history.ts, history.global_price)
+    bars.rebuild('iran', history.ts, history.iran_price)
+    indicators = IndicatorEngine()
+    indicators.rebuild(bars)
+    analytics = PremiumAnalytics(model)
+    analytics.extend(history.ts, history.iran_premium)
+
+    return PricePoller(model, cache, store=store, buffer=buffer, bars=bars,
+                       analytics=analytics, alerts=alerts, publisher=publisher,
+                       interval=interval, indicators=indicators)
@@ -0,0 +1,216 @@
+"""
+⏱️ کارگر پس‌زمینه دریافت قیمت و انتشار عکس‌فوری‌های تغییرناپذیر
+
+یک نخ (thread) در پس‌زمینه طبق زمان‌بندی منابع را می‌پرسد و هر بار یک
+PriceSnapshot تازه منتشر می‌کند. نشست‌ها فقط ارجاع به آخرین عکس‌فوری را
+می‌خوانند؛ بنابراین زمان رندر صفحه به تأخیر منابع بستگی ندارد و همه
+کاربران یک نمای یکسان می‌بینند.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+
+from silver.fetcher import fetch_quotes
+from silver.profiling import PROFILER
+from silver.quotes import Quote, QuoteInterner
+
+logger = logging.getLogger(__name__)
+
+# فاصله پیش‌فرض بین دو دریافت (ثانیه)
+DEFAULT_INTERVAL = 15.0
+
+
+@dataclass(frozen=True)
+class PriceSnapshot:
+    """عکس‌فوری تغییرناپذیر از وضعیت بازار"""
+
+    global_quote: Quote
+    iran_quote: Quote
+    exchange_rate: float
+    timestamp: datetime
+    version: int
+    premium_stats: MappingProxyType = None
+    indicators: MappingProxyType = None
+    quotes: MappingProxyType = None     # نمادهای دیگر فهرست: {نماد: Quote}
+
+
+class PricePoller(threading.Thread):
+    """نخ پس‌زمینه‌ای که قیمت‌ها را می‌گیرد و عکس‌فوری منتشر می‌کند"""
+
+    def __init__(self, model, cache, store=None, buffer=None, bars=None, analytics=None,
+                 alerts=None, publisher=None, interval=DEFAULT_INTERVAL, indicators=None):
+        super().__init__(name='silver-price-poller', daemon=True)
+        self.model = model
+        self.cache = cache
+        self.store = store
+        self.buffer = buffer
+        self.bars = bars
+        self.analytics = analytics
+        self.indicators = indicators
+        self.alerts = alerts
+        self.publisher = publisher
+        self.interval = interval
+        self.exchange_rate = model.base_exchange_rate
+        self._snapshot = None
+        self._quotes = None     # پاسخ‌های منابع در آخرین عکس‌فوری منتشرشده
+        self._polls = 0         # شمارنده دورهای تمام‌شده (برای refresh)
+        self._interner = QuoteInterner()
+        self._wake = threading.Event()
+        self._published = threading.Condition()
+        self._stopped = threading.Event()
+
+    @property
+    def snapshot(self):
+        """آخرین عکس‌فوری منتشرشده (یا None پیش از اولین دریافت)"""
+        return self._snapshot
+
+    def run(self):
+        while not self._stopped.is_set():
+            self._wake.clear()
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("دریافت قیمت در پس‌زمینه ناموفق بود")
+            with self._published:
+                self._polls += 1
+                self._published.notify_all()
+            self._wake.wait(self.interval)
+        # تیک‌های در صف انبار هنگام توقف نوشته می‌شوند
+        if self.store is not None:
+            self.store.flush()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def poll_once(self):
+        """یک دور دریافت از همه منابع و انتشار عکس‌فوری جدید"""
+        with PROFILER.section('poll.fetch'):
+            # هر پاسخ همان لحظه در اجماع ثبت می‌شود
+            quotes = self.cache.get_many(
+                self.model.sources,
+                lambda sources: fetch_quotes(sources, on_quote=self.model.observe)
+            )
+        previous = self._snapshot
+        # همه پاسخ‌ها همان اشیای کش‌شده دور قبل‌اند (مثلاً refresh دستی در TTL):
+        # تیک تکراری در انبار، بافر و جریان SSE منتشر نمی‌شود
+        if previous is not None and self._quotes is not None and len(quotes) == len(self._quotes) \
+                and all(quote is last for quote, last in zip(quotes, self._quotes)):
+            return previous
+
+        with PROFILER.section('poll.pricing'):
+            # نرخ دلار از منابع ارز؛ در نبود نرخ تازه آخرین نرخ معتبر می‌ماند
+            self.exchange_rate = self.model.exchange_rate(quotes) or self.exchange_rate
+            global_price = self.model.global_price(quotes)
+            # پریمیوم نسبت به قیمت زنده جهانی همین دور
+            iran_price = self.model.iran_price(
+                quotes, self.exchange_rate,
+                global_price['price'] if global_price else None
+            )
+            # همه نمادهای دیگر در یک گذر؛ پریمیوم نسبت به قیمت زنده جهانی هر فلز
+            others = self.model.instrument_quotes(
+                quotes, self.exchange_rate,
+                {'silver': global_price['price']} if global_price else None
+            )
+        if global_price is None and iran_price is None:
+            return None
+
+        ts_ns = time.time_ns()
+        now = datetime.fromtimestamp(ts_ns / 1e9)
+
+        if self.bars is not None:
+            with PROFILER.section('poll.bars'):
+                self._update_bars(ts_ns, global_price, iran_price)
+
+        # بررسی هشدارها فقط با قیمت‌های تازه همین دور
+        if self.alerts is not None:
+            with PROFILER.section('poll.alerts'):
+                # هشدارهای افزوده‌شده یا حذف‌شده در پروسه‌های دیگر
+                self.alerts.sync()
+                if global_price:
+                    self.alerts.evaluate('global', global_price['price'])
+                if iran_price:
+                    self.alerts.evaluate('iran', iran_price['price'])
+                for instrument, quote in others.items():
+                    self.alerts.evaluate(instrument, quote['price'])
+
+        # رکوردهای فشرده مشترک این تیک؛ منبعی که این دور پاسخ نداده آخرین
+        # قیمت سالمش را نگه می‌دارد
+        intern = self._interner.intern
+        global_quote = intern('global', global_price, now) if global_price else getattr(previous, 'global_quote', None)
+        iran_quote = intern('iran', iran_price, now) if iran_price else getattr(previous, 'iran_quote', None)
+        if global_quote is None or iran_quote is None:
+            return None
+
+        # نمادی که این دور قیمت تازه ندارد آخرین قیمتش را نگه می‌دارد
+        other_quotes = dict(previous.quotes) if previous and previous.quotes else {}
+        other_quotes.update((instrument, intern(instrument, quote, now)) for instrument, quote in others.items())
+
+        premium_stats = None
+        if self.analytics is not None:
+            with PROFILER.section('poll.analytics'):
+                self.analytics.update(ts_ns, global_quote, iran_quote, self.exchange_rate)
+                premium_stats = MappingProxyType(self.analytics.stats(ts_ns))
+
+        # ثبت تیک در انبار دائمی و بافر حلقوی تاریخچه
+        tick = (ts_ns, global_quote['price'], iran_quote['price'],
+                global_quote['change_percent'], iran_quote['premium_percent'])
+        if self.store is not None:
+            with PROFILER.section('poll.store'):
+                # قیمت نمادهای دیگر پیش از تیک در صف می‌رود تا در همان دسته نوشته شود
+                if others:
+                    self.store.append_quotes(ts_ns, {name: quote['price'] for name, quote in others.items()})
+                self.store.append(*tick)
+        if self.buffer is not None:
+            self.buffer.append(*tick)
+
+        snapshot = PriceSnapshot(
+            global_quote=global_quote,
+            iran_quote=iran_quote,
+            exchange_rate=self.exchange_rate,
+            timestamp=now,
+            version=previous.version + 1 if previous else 1,
+            premium_stats=premium_stats,
+            indicators=self.indicators.summary() if self.indicators is not None else None,
+            quotes=MappingProxyType(other_quotes),
+        )
+        with self._published:
+            self._snapshot = snapshot
+            self._quotes = quotes
+            self._published.notify_all()
+
+        # انتشار برای پروسه‌های نمایش (حالت دریافت جدا)
+        if self.publisher is not None:
+            with PROFILER.section('poll.publish'):
+                self.publisher.publish(snapshot)
+        return snapshot
+
+    def _update_bars(self, ts_ns, global_price, iran_price):
+        """جمع کردن تیک‌ها در کندل‌ها و شاخص‌ها؛ بازه امروز از کندل روزانه خوانده می‌شود"""
+        for instrument, price in (('global', global_price), ('iran', iran_price)):
+            if not price:
+                continue
+            closed = self.bars.update(instrument, ts_ns, price['price'])
+            # شاخص‌ها فقط با بسته شدن کندل به‌روز می‌شوند
+            if closed and self.indicators is not None:
+                self.indicators.add_bars(instrument, closed)
+        if global_price:
+            day = self.bars.current('global', '1d')
+            global_price.update(open_today=day.open, high_today=day.high, low_today=day.low)
+
+    def refresh(self, timeout=10.0):
+        """درخواست دریافت فوری و انتظار برای پایان دور بعدی؛ True اگر عکس‌فوری‌ای هست
+
+        اگر قیمت‌ها هنوز در TTL کش باشند عکس‌فوری تازه‌ای منتشر نمی‌شود و
+        همان عکس‌فوری قبلی می‌ماند.
+        """
+        with self._published:
+            current = self._polls
+        self._wake.set()
+        with self._published:
+            self._published.wait_for(lambda: self._polls > current, timeout)
+            return self._snapshot is not None
@@ -0,0 +1,271 @@
+"""
+💵 مدل قیمت‌گذاری نقره - داده‌های مرجع امروز و محاسبات قیمت
+"""
+
+import random
+import time
+from datetime import datetime
+
+from silver.consensus import ConsensusAggregator
+from silver.fetcher import QuoteSource
+from silver.instruments import CORE_INSTRUMENTS, default_registry
+
+# هر اونس تروی به گرم
+GRAMS_PER_OUNCE = 31.1035
+
+
+class PriceModel:
+    """داده‌های مرجع امروز و تبدیل نتایج منابع به قیمت نهایی"""
+
+    def __init__(self, feed=None, registry=None):
+        # خوراک قیمت تکرارپذیر (شبیه‌ساز seed‌دار یا فایل ضبط‌شده) به‌جای random
+        self.feed = feed
+
+        # قیمت‌های واقعی امروز (دسامبر 2024)
+        self.today_prices = {
+            'global': {
+                'current': 77.665,  # قیمت دقیق از Investing.com
+                'change': 7.205,    # تغییر امروز
+                'change_percent': 10.23,  # درصد تغییر
+                'symbol': 'SIH6',   # نماد معاملاتی
+                'currency': 'USD',
+                'unit': 'ounce',
+                'range_today': {
+                    'high': 78.20,
+                    'low': 76.50,
+                    'open': 76.80
+                }
+            },
+            'iran': {
+                # قیمت امروز ایران (بر اساس نرخ دلار ~600,000 ریال)
+                'current_per_gram': 470000,  # تومان/گرم (محاسبه شده)
+                'range_today': {
+                    'min': 460000,
+                    'max': 480000
+                }
+            },
+            'fx': {
+                # نرخ دلار آزاد امروز (دسامبر 2024)
+                'current': 600000,  # ریال
+                'range_today': {
+                    'min': 595000,
+                    'max': 607000
+                }
+            }
+        }
+
+        # نمادها و منابع قیمت هر یک (سه نماد اصلی و نمادهای دیگر)
+        self.registry = registry or default_registry()
+
+        # نرخ دلار مرجع امروز (تا رسیدن اولین نرخ از منابع ارز)
+        self.base_exchange_rate = self.today_prices['fx']['current']  # ریال
+
+        # منابع قیمت (همه با هم پرسیده می‌شوند)
+        self._moves = {}  # نماد -> (بازه، حرکت مشترک شبیه‌ساز)
+        self.sources = self.build_sources()
+
+        # قیمت اجماعی همه منابع هر بازار
+        self.consensus = ConsensusAggregator()
+
+    def build_sources(self):
+        """ساخت فهرست منابع همه نمادهای فهرست (یکجا پرسیده می‌شوند)"""
+        sources = []
+        for instrument in self.registry:
+            for spec in instrument.sources:
+                sources.append(QuoteSource(
+                    key=spec.key,
+                    name=spec.name,
+                    instrument=instrument.key,
+                    weight=spec.weight,
+                    simulate=self.make_simulator(instrument.key, spec.weight),
+                    trust=spec.trust
+                ))
+        return sources
+
+    def make_simulator(self, instrument, weight):
+        """شبیه‌ساز قیمت یک منبع (تا زمان اتصال منبع واقعی)"""
+        def from_feed():
+            # با خوراک، هر منبع همان قیمت مسیر را با ضریب خودش می‌دهد
+            price = self.feed.price(instrument) if self.feed is not None else None
+            return None if price is None else price * weight
+
+        def simulate_global():
+            fed = from_feed()
+            if fed is not None:
+                return fed
+            base_price = self.today_prices['global']['current']
+            range_today = self.today_prices['global']['range_today']
+
+            # تغییرات لحظه‌ای کوچک (±0.3%) محدود به بازه روز
+            current_price = base_price * (1 + random.uniform(-0.003, 0.003))
+            current_price = max(range_today['low'], min(range_today['high'], current_price))
+            return current_price * weight + random.uniform(-0.1, 0.1)
+
+        def simulate_iran():
+            fed = from_feed()
+            if fed is not None:
+                return fed
+            base_price = self.today_prices['iran']['current_per_gram']
+            range_today = self.today_prices['iran']['range_today']
+
+            # تغییرات روزانه ایران (بین -0.5% تا +1.5%) محدود به بازه روز
+            current_price = base_price * (1 + random.uniform(-0.005, 0.015))
+            current_price = max(range_today['min'], min(range_today['max'], current_price))
+            return current_price * weight
+
+        def simulate_fx():
+            fed = from_feed()
+            if fed is not None:
+                return round(fed, -1)
+            base_rate = self.today_prices['fx']['current']
+            range_today = self.today_prices['fx']['range_today']
+
+            # نوسان لحظه‌ای نرخ دلار (±0.5%) محدود به بازه روز
+            current_rate = base_rate * (1 + random.uniform(-0.005, 0.005))
+            current_rate = max(range_today['min'], min(range_today['max'], current_rate))
+            return round(current_rate * weight, -1)
+
+        def simulate_generic():
+            fed = from_feed()
+            if fed is not None:
+                return fed
+            item = self.registry[instrument]
+            # حرکت بازار در هر بازه ۵ ثانیه‌ای بین منابع نماد مشترک است
+            epoch = int(time.time() // 5)
+            cached = self._moves.get(instrument)
+            if cached is None or cached[0] != epoch:
+                cached = self._moves[instrument] = (epoch, random.uniform(-item.volatility, item.volatility))
+            return item.reference * (1 + cached[1]) * weight * (1 + random.uniform(-0.0002, 0.0002))
+
+        simulators = {'global': simulate_global, 'iran': simulate_iran, 'fx': simulate_fx}
+        return simulators.get(instrument, simulate_generic)
+
+    def observe(self, quote):
+        """ثبت فوری قیمت یک منبع در اجماع (با رسیدن هر پاسخ)"""
+        if quote.ok:
+            self.consensus.record(quote.instrument, quote.source, quote.price,
+                                  quote.trust, quote.received_at)
+
+    def consensus_quote(self, quotes, instrument):
+        """قیمت اجماعی یک بازار از نتایج منابع"""
+        for quote in quotes:
+            if quote.instrument == instrument:
+                self.observe(quote)
+        return self.consensus.consensus(instrument)
+
+    @staticmethod
+    def describe_sources(consensus):
+        """عنوان منبع برای نمایش (نام منبع یا تعداد منابع اجماع)"""
+        if len(consensus.used) == 1:
+            return consensus.used[0]
+        return f"اجماع {len(consensus.used)} منبع"
+
+    def global_price(self, quotes):
+        """قیمت جهانی امروز (اجماع منابع)"""
+        consensus = self.consensus_quote(quotes, 'global')
+        if consensus is None:
+            return None
+
+        # تغییر نسبت به بسته شدن دیروز
+        previous_close = self.today_prices['global']['current'] - self.today_prices['global']['change']
+        change = consensus.price - previous_close
+
+        return {
+            'price': round(consensus.price, 3),  # 3 رقم اعشار
+            'change': round(change, 3),
+            'change_percent': round(change / previous_close * 100, 2),
+            'source': self.describe_sources(consensus),
+            'deviations': consensus.deviations,
+            'rejected': consensus.rejected,
+            'updated_at': consensus.updated_at,
+            'symbol': self.today_prices['global']['symbol'],
+            'timestamp': datetime.now(),
+            'weight': 'ounce',
+            'currency': 'USD',
+            'high_today': self.today_prices['global']['range_today']['high'],
+            'low_today': self.today_prices['global']['range_today']['low'],
+            'open_today': self.today_prices['global']['range_today']['open']
+        }
+
+    def exchange_rate(self, quotes):
+        """نرخ دلار اجماعی منابع ارز (یا None اگر نرخ تازه‌ای نیست)"""
+        consensus = self.consensus_quote(quotes, 'fx')
+        return round(consensus.price, -1) if consensus else None
+
+    def iran_metrics(self, price, exchange_rate, global_price=None):
+        """معادل دلاری و پریمیوم یک قیمت ایران (تومان/گرم) با نرخ داده‌شده
+
+        پریمیوم نسبت به قیمت زنده جهانی (دلار/اونس) حساب می‌شود؛ در نبود آن
+        قیمت مرجع امروز به کار می‌رود.
+        """
+        # محاسبه معادل دلاری
+        usd_price = (price * 10) / exchange_rate
+
+        # محاسبه پریمیوم نسبت به جهانی
+        if global_price is None:
+            global_price = self.today_prices['global']['current']
+        global_per_gram_usd = global_price / GRAMS_PER_OUNCE
+        premium = ((usd_price - global_per_gram_usd) / global_per_gram_usd) * 100
+
+        return round(usd_price, 4), round(premium, 2)
+
+    def iran_price(self, quotes, exchange_rate, global_price=None):
+        """قیمت ایران امروز (اجماع منابع)"""
+        consensus = self.consensus_quote(quotes, 'iran')
+        if consensus is None:
+            return None
+
+        usd_equivalent, premium = self.iran_metrics(consensus.price, exchange_rate, global_price)
+
+        return {
+            'price': round(consensus.price, 0),
+            'usd_equivalent': usd_equivalent,
+            'premium_percent': premium,
+            'source': self.describe_sources(consensus),
+            'deviations': consensus.deviations,
+            'rejected': consensus.rejected,
+            'updated_at': consensus.updated_at,
+            'timestamp': datetime.now(),
+            'weight': 'گرم',
+            'currency': 'TOMAN'
+        }
+
+    def instrument_quotes(self, quotes, exchange_rate, spot=None):
+        """قیمت اجماعی نمادهای غیراصلی در یک گذر روی نتایج منابع
+
+        پریمیوم نمادهای تومانی فلزی نسبت به ارزش فلز خالصشان با قیمت زنده
+        جهانی همان فلز (spot: فلز -> دلار/اونس) حساب می‌شود.
+        """
+        for quote in quotes:
+            if quote.instrument not in CORE_INSTRUMENTS:
+                self.observe(quote)
+
+        spot = dict(spot or {})
+        results = {}
+        # نمادها به ترتیب فهرست؛ قیمت جهانی هر فلز پیش از نمادهای تومانی آن
+        for instrument in self.registry.extras():
+            consensus = self.consensus.consensus(instrument.key)
+            if consensus is None:
+                continue
+            price = round(consensus.price, instrument.digits)
+            change = price - instrument.reference
+            premium = None
+            if instrument.market == 'global' and instrument.metal:
+                spot[instrument.metal] = price
+            elif instrument.currency == 'TOMAN' and instrument.fine_grams and spot.get(instrument.metal):
+                fair = spot[instrument.metal] / GRAMS_PER_OUNCE * instrument.fine_grams * exchange_rate / 10
+                premium = round((price - fair) / fair * 100, 2)
+            results[instrument.key] = {
+                'price': price,
+                'change': round(change, instrument.digits),
+                'change_percent': round(change / instrument.reference * 100, 2),
+                'premium_percent': premium,
+                'source': self.describe_sources(consensus),
+                'deviations': consensus.deviations,
+                'rejected': consensus.rejected,
+                'updated_at': consensus.updated_at,
+                'timestamp': datetime.now(),
+                'weight': instrument.unit,
+                'currency': instrument.currency
+            }
+        return results
@@ -0,0 +1,159 @@
+"""
+⏲️ زمان‌سنجی بخش‌های رندر و مسیرهای داغ
+
+زمان هر بخش (display_* و مراحل دریافت/تجمیع) در هیستوگرام‌های لگاریتمی
+هر پروسه جمع می‌شود و صدک‌های p50/p95/p99 از آن خوانده می‌شوند. خروجی به
+دو قالب JSON و متن Prometheus در دسترس است.
+
+زمان‌سنجی به‌صورت پیش‌فرض خاموش است (SILVER_PROFILE=1 آن را روشن می‌کند)؛
+در حالت خاموش section() فقط یک context manager خالی و ازپیش‌ساخته
+برمی‌گرداند و هزینه‌اش ناچیز است.
+"""
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# محدوده هیستوگرام: از ۱ میکروثانیه با رشد 2^(1/4) (خطای صدک کمتر از ۱۰٪)
+MIN_SECONDS = 1e-6
+GROWTH = 2 ** 0.25
+BUCKETS = 160
+
+_LOG_GROWTH = math.log(GROWTH)
+_NULL = nullcontext()
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """هیستوگرام لگاریتمی تأخیر با ثبت O(1)"""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        if seconds <= MIN_SECONDS:
+            index = 0
+        else:
+            index = min(BUCKETS - 1, int(math.log(seconds / MIN_SECONDS) / _LOG_GROWTH) + 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """صدک q (مرز بالای سطلی که صدک در آن می‌افتد)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.max, MIN_SECONDS * GROWTH ** index)
+        return self.max
+
+
+class _Section:
+    """context manager زمان‌سنجی یک بخش"""
+
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class Profiler:
+    """جمع‌آوری زمان بخش‌ها در سطح پروسه"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def section(self, name):
+        """زمان‌سنجی یک بلوک: with PROFILER.section('display_header'): ..."""
+        if not self.enabled:
+            return _NULL
+        return _Section(self, name)
+
+    def timed(self, name=None):
+        """دکوراتور زمان‌سنجی یک تابع (هر بار که اجرا شود، حتی جدا در fragment)"""
+        def decorator(func):
+            label = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Section(self, label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def stats(self):
+        """خلاصه هر بخش: تعداد، میانگین، p50/p95/p99 و بیشینه (ثانیه)"""
+        with self._lock:
+            return {
+                name: {
+                    'count': histogram.count,
+                    'mean': histogram.total / histogram.count,
+                    'p50': histogram.quantile(0.5),
+                    'p95': histogram.quantile(0.95),
+                    'p99': histogram.quantile(0.99),
+                    'max': histogram.max,
+                    'sum': histogram.total,
+                }
+                for name, histogram in sorted(self._histograms.items())
+            }
+
+    def to_json(self):
+        return json.dumps({'generated_at': time.time(), 'sections': self.stats()}, indent=2)
+
+    def to_prometheus(self, metric='silver_section_seconds'):
+        """خروجی متنی سازگار با Prometheus (نوع summary)"""
+        lines = [
+            f'# HELP {metric} Latency of app sections and pipeline steps.',
+            f'# TYPE {metric} summary',
+        ]
+        for name, stats in self.stats().items():
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            for q in QUANTILES:
+                lines.append(f'{metric}{{section="{label}",quantile="{q}"}} {stats[f"p{int(q * 100)}"]:.9f}')
+            lines.append(f'{metric}_sum{{section="{label}"}} {stats["sum"]:.9f}')
+            lines.append(f'{metric}_count{{section="{label}"}} {stats["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+# نمونه سراسری پروسه
+PROFILER = Profiler(enabled=os.environ.get('SILVER_PROFILE', '').lower() in ('1', 'true', 'yes'))
@@ -0,0 +1,118 @@
+"""
+📦 کش سراسری قیمت‌ها با بروزرسانی تک‌پرواز (single-flight)
+
+یک نمونه از این کش بین همه نشست‌های مرورگر در یک پروسه مشترک است.
+کلید هر مدخل (نماد، منبع) است و هر مدخل تا TTL ثانیه معتبر می‌ماند.
+اگر چند نشست هم‌زمان یک قیمت منقضی را بخواهند فقط یکی از آن‌ها به منبع
+بالادستی می‌رود و بقیه منتظر همان نتیجه می‌مانند.
+"""
+
+import threading
+import time
+
+from silver.fetcher import SourceQuote
+
+# مدت اعتبار پیش‌فرض هر قیمت (ثانیه)
+DEFAULT_TTL = 10.0
+
+
+class _Flight:
+    """یک دریافت دسته‌ای در حال انجام که دیگران می‌توانند منتظرش بمانند"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.results = {}
+
+
+class QuoteCache:
+    """کش قیمت با کلید (نماد، منبع) و شمارنده‌های hit/miss/coalesced"""
+
+    def __init__(self, ttl=DEFAULT_TTL, wait_timeout=30.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._flights = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key_of(source):
+        return (source.instrument, source.key)
+
+    def get_many(self, sources, loader):
+        """قیمت همه منابع؛ فقط منابع منقضی و بی‌صاحب با loader دریافت می‌شوند"""
+        results = {}
+        claimed, waiting = [], {}
+        # یک پرواز برای همه منابع ادعاشده این فراخوانی (نه یکی برای هر منبع)
+        flight = _Flight()
+
+        with self._lock:
+            now = self.clock()
+            for source in sources:
+                key = self.key_of(source)
+                entry = self._entries.get(key)
+                if entry is not None and now - entry[0] < self.ttl:
+                    self.hits += 1
+                    results[key] = entry[1]
+                elif key in self._flights:
+                    self.coalesced += 1
+                    waiting[key] = self._flights[key]
+                else:
+                    self.misses += 1
+                    self._flights[key] = flight
+                    claimed.append(source)
+
+        if claimed:
+            results.update(self._load(claimed, loader, flight))
+
+        for key, other in waiting.items():
+            other.done.wait(self.wait_timeout)
+            results[key] = other.results.get(key)
+
+        return [results.get(self.key_of(s)) or self._failed(s, 'unavailable') for s in sources]
+
+    def _load(self, sources, loader, flight):
+        """دریافت منابع ادعاشده و بیدار کردن منتظرها"""
+        loaded = {}
+        try:
+            for quote, source in zip(loader(sources), sources):
+                loaded[self.key_of(source)] = quote
+        finally:
+            with self._lock:
+                now = self.clock()
+                for source in sources:
+                    key = self.key_of(source)
+                    quote = loaded.get(key) or self._failed(source, 'loader failed')
+                    # فقط پاسخ‌های سالم کش می‌شوند تا منبع خراب دوباره امتحان شود
+                    if quote.ok:
+                        self._entries[key] = (now, quote)
+                    del self._flights[key]
+                    flight.results[key] = quote
+                flight.done.set()
+        return loaded
+
+    @staticmethod
+    def _failed(source, error):
+        return SourceQuote(source=source.name, key=source.key,
+                           instrument=source.instrument, error=error)
+
+    def invalidate(self):
+        """پاک کردن همه مدخل‌ها (شمارنده‌ها حفظ می‌شوند)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """شمارنده‌های کش برای تنظیم TTL"""
+        with self._lock:
+            requests = self.hits + self.misses + self.coalesced
+            return {
+                'ttl': self.ttl,
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'hit_ratio': (self.hits + self.coalesced) / requests if requests else 0.0,
+            }
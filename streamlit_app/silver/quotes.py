@@ -0,0 +1,97 @@
+"""
+🧾 رکورد فشرده و تغییرناپذیر قیمت نهایی هر نماد
+
+هر قیمت منتشرشده یک Quote است: تاپل نام‌دار بدون __dict__ (یک شیء با
+اندازه ثابت به‌جای یک دیکشنری ۱۰-۱۴ کلیدی). رکوردها یک بار در هر تیک در
+نخ دریافت ساخته و در عکس‌فوری با ارجاع بین همه نشست‌ها به اشتراک گذاشته
+می‌شوند:
+
+- رشته‌های تکراری (منبع، نماد، واحد، ارز، نام منابع) intern می‌شوند
+- همه قیمت‌های یک تیک یک شیء زمان مشترک دارند
+- قیمتی که در این تیک عوض نشده همان شیء تیک قبل است
+
+برای سازگاری با کارت‌ها و خروجی JSON مثل نگاشت هم خوانده می‌شود:
+quote['price'] و quote.get('rejected', ()).
+"""
+
+import sys
+from collections import namedtuple
+from datetime import datetime
+
+# همه فیلدهای قیمت نمادها؛ فیلدی که برای یک نماد معنا ندارد None است
+QUOTE_FIELDS = (
+    'price', 'change', 'change_percent', 'premium_percent', 'usd_equivalent',
+    'source', 'deviations', 'rejected', 'updated_at', 'timestamp',
+    'symbol', 'weight', 'currency', 'high_today', 'low_today', 'open_today',
+)
+
+# فیلدهای متنی که intern می‌شوند
+_STRING_FIELDS = ('source', 'symbol', 'weight', 'currency')
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Quote(namedtuple('Quote', QUOTE_FIELDS, defaults=(None,) * len(QUOTE_FIELDS))):
+    """قیمت نهایی یک نماد در یک تیک"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        """مقدار یک فیلد (default اگر فیلد وجود ندارد یا None است)"""
+        value = getattr(self, key) if key in self._fields else None
+        return default if value is None else value
+
+    @classmethod
+    def from_mapping(cls, fields, timestamp=None):
+        """ساخت رکورد از دیکشنری قیمت (مدل قیمت یا JSON) با رشته‌های intern‌شده
+
+        انحراف منابع به تاپل (نام، درصد) و منابع پرت به تاپل تبدیل می‌شوند.
+        """
+        values = {name: fields[name] for name in QUOTE_FIELDS if name in fields}
+        for name in _STRING_FIELDS:
+            if name in values:
+                values[name] = _intern(values[name])
+        deviations = values.get('deviations')
+        if deviations is not None:
+            pairs = deviations.items() if hasattr(deviations, 'items') else deviations
+            values['deviations'] = tuple((_intern(name), deviation) for name, deviation in pairs)
+        if values.get('rejected') is not None:
+            values['rejected'] = tuple(_intern(name) for name in values['rejected'])
+        if timestamp is not None:
+            values['timestamp'] = timestamp
+        elif isinstance(values.get('timestamp'), str):
+            values['timestamp'] = datetime.fromisoformat(values['timestamp'])
+        return cls(**values)
+
+    def as_dict(self):
+        """دیکشنری قابل تبدیل به JSON (انحراف منابع به‌صورت {نام: درصد})"""
+        data = self._asdict()
+        if self.deviations is not None:
+            data['deviations'] = dict(self.deviations)
+        return data
+
+
+class QuoteInterner:
+    """ساخت Quote‌های هر تیک؛ قیمت بدون تغییر همان شیء تیک قبل می‌ماند"""
+
+    def __init__(self):
+        self._last = {}  # نماد -> آخرین Quote
+
+    def intern(self, instrument, fields, timestamp):
+        """رکورد مشترک قیمت یک نماد با زمان تیک"""
+        quote = Quote.from_mapping(fields, timestamp)
+        previous = self._last.get(instrument)
+        # مقایسه بدون زمان: اگر فقط زمان تیک عوض شده همان رکورد قبلی برمی‌گردد
+        if previous is not None and quote._replace(timestamp=previous.timestamp) == previous:
+            return previous
+        self._last[instrument] = quote
+        return quote
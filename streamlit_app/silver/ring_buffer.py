@@ -0,0 +1,91 @@
+"""
+🔁 بافر حلقوی با اندازه ثابت برای تاریخچه تیک‌ها
+
+داده‌ها در آرایه‌های از پیش تخصیص‌یافته NumPy نگه داشته می‌شوند: زمان
+(نانوثانیه epoch) و چهار ستون قیمت جهانی، قیمت ایران، درصد تغییر و
+پریمیوم. هر مقدار دو بار نوشته می‌شود (در خانه i و i + capacity)؛ به این
+ترتیب آخرین n تیک همیشه یک برش پیوسته است و خواندن آن بدون کپی انجام
+می‌شود. حلقه یک خانه بیش از ظرفیت دارد تا خانه‌ای که نوشتن بعدی در آن
+انجام می‌شود هیچ‌وقت داخل نمای آخرین n ≤ ظرفیت تیک نباشد. حافظه هر نقطه با float32 حدود ۴۸ بایت است (۱۰۰ هزار نقطه ≈ ۴.۶ مگابایت).
+"""
+
+import numpy as np
+
+from silver.tick_store import COLUMNS, TickArrays
+
+# ظرفیت پیش‌فرض (تعداد تیک)
+DEFAULT_CAPACITY = 100_000
+
+
+class TickRingBuffer:
+    """بافر حلقوی تیک‌ها با افزودن O(1) و خواندن بدون کپی"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, dtype=np.float32):
+        if capacity <= 0:
+            raise ValueError("ظرفیت بافر باید مثبت باشد")
+        self.capacity = capacity
+        # یک خانه رزرو برای نوشتن بعدی (بیرون از هر نمای منتشرشده)
+        self._slots = capacity + 1
+        self._ts = np.zeros(2 * self._slots, dtype=np.int64)
+        # هر ستون یک سطر پیوسته است تا برش‌ها پیوسته بمانند
+        self._values = np.zeros((len(COLUMNS), 2 * self._slots), dtype=dtype)
+        # (خانه نوشتن بعدی، تعداد تیک‌ها، نسخه) با یک انتساب به‌روز می‌شود؛
+        # نسخه با هر افزودن زیاد می‌شود تا نتایج مشتق از نما قابل کش باشند
+        self._state = (0, 0, 0)
+
+    def __len__(self):
+        return self._state[1]
+
+    @property
+    def version(self):
+        """شمارنده افزودن‌ها؛ نمای آخرین n تیک تا تغییر آن ثابت است"""
+        return self._state[2]
+
+    @property
+    def nbytes(self):
+        return self._ts.nbytes + self._values.nbytes
+
+    def append(self, ts_ns, global_price, iran_price, global_change, iran_premium):
+        """افزودن یک تیک (O(1))"""
+        head, size, version = self._state
+        mirror = head + self._slots
+        self._ts[head] = self._ts[mirror] = ts_ns
+        values = self._values
+        values[0, head] = values[0, mirror] = global_price
+        values[1, head] = values[1, mirror] = iran_price
+        values[2, head] = values[2, mirror] = global_change
+        values[3, head] = values[3, mirror] = iran_premium
+        self._state = ((head + 1) % self._slots, min(size + 1, self.capacity), version + 1)
+
+    def extend(self, arrays):
+        """افزودن دسته‌ای تیک‌ها (مثلاً بارگذاری اولیه از انبار)"""
+        count = len(arrays.ts)
+        if count == 0:
+            return
+        head, size, version = self._state
+        keep = min(count, self.capacity)
+        index = (head + np.arange(keep)) % self._slots
+        for target in (index, index + self._slots):
+            self._ts[target] = arrays.ts[-keep:]
+            for row, column in enumerate(arrays[1:]):
+                self._values[row, target] = column[-keep:]
+        self._state = ((head + keep) % self._slots, min(size + keep, self.capacity), version + 1)
+
+    def last(self, n):
+        """آخرین n تیک به ترتیب زمانی به‌صورت نماهای فقط‌خواندنی (بدون کپی)
+
+        نماها به حافظه بافر اشاره می‌کنند: افزودن بعدی هیچ عنصری از نما را
+        عوض نمی‌کند، اما اگر داده پس از دور کامل بافر لازم است باید از آن
+        کپی گرفت.
+        """
+        return self.versioned(n)[1]
+
+    def versioned(self, n):
+        """(نسخه، آخرین n تیک) از یک وضعیت بافر؛ برای کش نتایج مشتق از نما"""
+        head, size, version = self._state
+        n = max(0, min(int(n), size))
+        stop = head + self._slots
+        views = [self._ts[stop - n:stop]] + [row[stop - n:stop] for row in self._values]
+        for view in views:
+            view.flags.writeable = False
+        return version, TickArrays(*views)
@@ -0,0 +1,62 @@
+"""
+👥 ردیابی نشست‌های مرورگر و تشخیص نشست‌های بیکار
+
+بروزرسانی خودکار بخش‌های زنده یک زبانه رهاشده را هم تا ابد زنده نگه
+می‌دارد. این فهرست سطح پروسه زمان آخرین تعامل واقعی کاربر (نه اجرای
+خودکار) را برای هر نشست نگه می‌دارد؛ نشستی که بیش از idle_after ثانیه
+تعاملی نداشته بیکار است و اپ بروزرسانی خودکارش را متوقف می‌کند. مدخل
+نشست‌های بیکار و بسته‌شده هم با sweep پاک می‌شود.
+
+اپ هنگام توقف نشست بیکار حالت خود نشست (session state) را هم با
+release_state آزاد می‌کند و فقط تنظیمات کاربر را نگه می‌دارد؛ پس زبانه
+رهاشده جز چند تنظیم کوچک چیزی در حافظه پروسه نگه نمی‌دارد.
+"""
+
+import threading
+import time
+
+# مدت بی‌تعاملی پیش از توقف بروزرسانی خودکار (ثانیه)
+DEFAULT_IDLE_AFTER = 30 * 60
+
+
+class SessionRegistry:
+    """زمان آخرین تعامل هر نشست با پاک‌سازی نشست‌های بیکار"""
+
+    def __init__(self, idle_after=DEFAULT_IDLE_AFTER, clock=time.monotonic):
+        self.idle_after = idle_after
+        self.clock = clock
+        self._seen = {}  # شناسه نشست -> زمان آخرین تعامل
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def touch(self, session_id):
+        """ثبت تعامل کاربر در یک نشست"""
+        with self._lock:
+            self._seen[session_id] = self.clock()
+
+    def is_idle(self, session_id):
+        """نشست بیش از idle_after ثانیه تعاملی نداشته (یا پاک شده) است"""
+        with self._lock:
+            seen = self._seen.get(session_id)
+        return seen is None or self.clock() - seen > self.idle_after
+
+    def sweep(self):
+        """حذف مدخل نشست‌های بیکار یا بسته‌شده؛ تعداد حذف‌شده‌ها"""
+        with self._lock:
+            cutoff = self.clock() - self.idle_after
+            stale = [session_id for session_id, seen in self._seen.items() if seen < cutoff]
+            for session_id in stale:
+                del self._seen[session_id]
+            self.evicted += len(stale)
+        return len(stale)
+
+    def __len__(self):
+        return len(self._seen)
+
+
+def release_state(state, keep):
+    """حذف همه مقادیر حالت یک نشست به‌جز کلیدهای keep؛ تعداد حذف‌شده‌ها"""
+    stale = [key for key in list(state.keys()) if key not in keep]
+    for key in stale:
+        del state[key]
+    return len(stale)
@@ -0,0 +1,189 @@
+"""
+🔗 انبار مشترک عکس‌فوری‌ها بین پروسه دریافت و پروسه‌های نمایش
+
+پروسه دریافت (ingest.py) هر عکس‌فوری را در جدول snapshot همان فایل SQLite
+انبار تیک‌ها می‌نویسد. اپ Streamlit در حالت SILVER_INGEST=external فقط
+خواننده است: آخرین عکس‌فوری و تیک‌های تازه را از همین فایل می‌خواند و
+هیچ درخواستی به منابع نمی‌فرستد. بنابراین چند نسخه رابط کاربری می‌توانند
+مستقل از پروسه دریافت اجرا و مقیاس‌دهی شوند.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from types import MappingProxyType
+
+from silver.analytics import RollingStats
+from silver.indicators import Indicators
+from silver.poller import PriceSnapshot
+from silver.quotes import Quote
+from silver.tick_store import DEFAULT_PATH
+
+# حالت دریافت: embedded (نخ درون اپ) یا external (پروسه ingest.py جدا)
+INGEST_MODE = os.environ.get('SILVER_INGEST', 'embedded')
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"نوع {type(value).__name__} قابل ذخیره نیست")
+
+
+def _decode_quote(quote):
+    return Quote.from_mapping(quote) if quote is not None else None
+
+
+def _record(values):
+    """تاپل نام‌دار (آمار پریمیوم یا اندیکاتورها) به شیء JSON با نام فیلدها"""
+    return values._asdict() if values is not None else None
+
+
+def snapshot_to_json(snapshot):
+    """تبدیل عکس‌فوری به JSON"""
+    return json.dumps({
+        'global_quote': snapshot.global_quote.as_dict(),
+        'iran_quote': snapshot.iran_quote.as_dict(),
+        'exchange_rate': snapshot.exchange_rate,
+        'timestamp': snapshot.timestamp,
+        'version': snapshot.version,
+        'premium_stats': {
+            name: _record(stats) for name, stats in snapshot.premium_stats.items()
+        } if snapshot.premium_stats else None,
+        'indicators': {
+            instrument: {resolution: _record(values) for resolution, values in by_resolution.items()}
+            for instrument, by_resolution in snapshot.indicators.items()
+        } if snapshot.indicators else None,
+        'quotes': {
+            instrument: quote.as_dict() for instrument, quote in snapshot.quotes.items()
+        } if snapshot.quotes else None,
+    }, default=_encode, ensure_ascii=False)
+
+
+def snapshot_from_json(text):
+    """بازسازی عکس‌فوری تغییرناپذیر از JSON"""
+    data = json.loads(text)
+    stats = data.get('premium_stats')
+    if stats is not None:
+        stats = MappingProxyType({
+            name: RollingStats(**values) if values else None for name, values in stats.items()
+        })
+    indicators = data.get('indicators')
+    if indicators is not None:
+        indicators = MappingProxyType({
+            instrument: MappingProxyType({
+                resolution: Indicators(**values) if values else None
+                for resolution, values in by_resolution.items()
+            })
+            for instrument, by_resolution in indicators.items()
+        })
+    return PriceSnapshot(
+        global_quote=_decode_quote(data['global_quote']),
+        iran_quote=_decode_quote(data['iran_quote']),
+        exchange_rate=data['exchange_rate'],
+        timestamp=datetime.fromisoformat(data['timestamp']),
+        version=data['version'],
+        premium_stats=stats,
+        indicators=indicators,
+        quotes=MappingProxyType({
+            instrument: _decode_quote(quote) for instrument, quote in data['quotes'].items()
+        }) if data.get('quotes') else None,
+    )
+
+
+class SnapshotStore:
+    """آخرین عکس‌فوری منتشرشده در SQLite (کنار جدول تیک‌ها)"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('SILVER_TICK_DB', DEFAULT_PATH)
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshot (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL,
+                written_at REAL NOT NULL,
+                payload TEXT NOT NULL
+            );
+        """)
+        self._lock = threading.Lock()
+
+    def publish(self, snapshot):
+        """نوشتن عکس‌فوری جدید به‌جای قبلی"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO snapshot (id, version, written_at, payload) VALUES (1, ?, ?, ?)',
+                (snapshot.version, time.time(), snapshot_to_json(snapshot))
+            )
+
+    def head(self):
+        """(نسخه، زمان نوشتن) آخرین عکس‌فوری بدون خواندن محتوا"""
+        with self._lock:
+            return self._conn.execute('SELECT version, written_at FROM snapshot WHERE id = 1').fetchone()
+
+    def load(self):
+        """آخرین عکس‌فوری (یا None پیش از اولین انتشار)"""
+        with self._lock:
+            row = self._conn.execute('SELECT payload FROM snapshot WHERE id = 1').fetchone()
+        return snapshot_from_json(row[0]) if row else None
+
+
+class SnapshotReader:
+    """خواننده سبک انبار مشترک با همان رابط PricePoller برای اپ"""
+
+    def __init__(self, model, snapshots, store, buffer=None, min_interval=0.5):
+        self.model = model
+        self.snapshots = snapshots
+        self.store = store
+        self.buffer = buffer
+        self.cache = None
+        self.min_interval = min_interval
+        self._snapshot = None
+        self._head = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._last_ts = int(buffer.last(1).ts[-1]) if buffer is not None and len(buffer) else None
+
+    @property
+    def snapshot(self):
+        """آخرین عکس‌فوری پروسه دریافت (حداکثر هر min_interval یک بار بررسی)"""
+        if time.monotonic() - self._checked >= self.min_interval:
+            self._sync()
+        return self._snapshot
+
+    @property
+    def exchange_rate(self):
+        snapshot = self._snapshot
+        return snapshot.exchange_rate if snapshot else self.model.base_exchange_rate
+
+    def _sync(self):
+        with self._lock:
+            self._checked = time.monotonic()
+            head = self.snapshots.head()
+            if head is None or head == self._head:
+                return
+            self._head = head
+            self._snapshot = self.snapshots.load()
+
+            # افزودن تیک‌های تازه به بافر حافظه؛ بار اول فقط به اندازه ظرفیت بافر
+            if self.buffer is not None:
+                if self._last_ts is None:
+                    ticks = self.store.last(self.buffer.capacity)
+                else:
+                    ticks = self.store.range(start_ns=self._last_ts + 1)
+                if len(ticks.ts):
+                    self.buffer.extend(ticks)
+                    self._last_ts = int(ticks.ts[-1])
+
+    def refresh(self, timeout=None):
+        """خواندن فوری آخرین عکس‌فوری پروسه دریافت، بدون انتظار برای دور بعدی
+
+        دریافت در پروسه دیگری زمان‌بندی می‌شود؛ نخ اسکریپت Streamlit منتظر
+        آن نمی‌ماند. True اگر عکس‌فوری‌ای برای نمایش هست.
+        """
+        self._sync()
+        return self._snapshot is not None
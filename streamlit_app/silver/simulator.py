@@ -0,0 +1,154 @@
+"""
+🎲 شبیه‌ساز برداری بازار و پخش دوباره تیک‌ها
+
+- MarketSimulator: مسیر قیمت جهانی و نرخ دلار با حرکت براونی هندسی (GBM)
+  و پریمیوم ایران با فرایند بازگشت به میانگین (AR(1))، همه با NumPy و یک
+  seed قابل تنظیم؛ میلیون‌ها تیک در چند ثانیه ساخته می‌شود
+- TickFeed: خوراک قیمت منابع از یک مسیر آماده (شبیه‌سازی یا فایل ضبط‌شده)
+  که با سرعت N برابر زمان واقعی جلو می‌رود؛ منابع مدل قیمت به‌جای
+  random.uniform از همین خوراک می‌خوانند و نتیجه تکرارپذیر است
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from silver.backfill import DEFAULT_CHUNKSIZE, chunk_to_rows, read_chunks
+from silver.indicators import linear_recurrence
+from silver.pricing import GRAMS_PER_OUNCE
+from silver.tick_store import COLUMNS, TickArrays
+
+# ثانیه‌های یک سال (برای نوسان سالانه)
+YEAR_S = 365 * 86400
+
+# مسیر شبیه‌سازی‌شده: تیک‌ها (با ستون‌های انبار) و نرخ دلار هر تیک
+MarketPath = namedtuple('MarketPath', ('ticks', 'exchange_rate'))
+
+
+class MarketSimulator:
+    """مسیرهای قیمت تکرارپذیر (seed) برای بار آزمایشی و حالت نمایشی"""
+
+    def __init__(self, model, seed=None, global_vol=0.30, fx_vol=0.20, drift=0.0,
+                 premium_vol=0.5, premium_half_life=6 * 3600):
+        self.model = model
+        self.seed = seed
+        self.global_vol = global_vol
+        self.fx_vol = fx_vol
+        self.drift = drift
+        self.premium_vol = premium_vol              # انحراف معیار روزانه پریمیوم (درصد)
+        self.premium_half_life = premium_half_life  # ثانیه
+        self.rng = np.random.default_rng(seed)
+
+        today = model.today_prices
+        self.global_start = today['global']['current']
+        self.previous_close = today['global']['current'] - today['global']['change']
+        self.fx_start = model.base_exchange_rate
+        # پریمیوم مرجع از قیمت‌های امروز مدل
+        _, self.premium_mean = model.iran_metrics(today['iran']['current_per_gram'], self.fx_start)
+
+    def _gbm(self, start, vol, normals, dt_years):
+        steps = (self.drift - 0.5 * vol ** 2) * dt_years + vol * np.sqrt(dt_years) * normals
+        return start * np.exp(np.cumsum(steps))
+
+    def generate(self, n, dt_s=1.0, start_ns=None):
+        """n تیک با فاصله dt_s ثانیه از start_ns (پیش‌فرض: اکنون منهای طول مسیر)"""
+        n = int(n)
+        if start_ns is None:
+            start_ns = time.time_ns() - int(n * dt_s * 1e9)
+        ts = start_ns + (np.arange(n, dtype=np.int64) * int(dt_s * 1e9))
+
+        normals = self.rng.standard_normal((3, n))
+        dt_years = dt_s / YEAR_S
+        global_price = self._gbm(self.global_start, self.global_vol, normals[0], dt_years)
+        exchange_rate = self._gbm(self.fx_start, self.fx_vol, normals[1], dt_years)
+
+        # پریمیوم: بازگشت به میانگین با نیمه‌عمر premium_half_life
+        decay = 0.5 ** (dt_s / self.premium_half_life)
+        scale = self.premium_vol * np.sqrt(dt_s / 86400)
+        premium = self.premium_mean + linear_recurrence(normals[2] * scale, decay, 0.0)
+
+        # قیمت ایران (تومان/گرم) از جهانی، نرخ دلار و پریمیوم
+        iran_price = global_price / GRAMS_PER_OUNCE * exchange_rate / 10 * (1 + premium / 100)
+        global_change = (global_price - self.previous_close) / self.previous_close * 100
+        return MarketPath(TickArrays(ts, global_price, iran_price, global_change, premium), exchange_rate)
+
+
+class TickFeed:
+    """خوراک قیمت از یک مسیر آماده با سرعت N برابر زمان واقعی"""
+
+    def __init__(self, ticks, exchange_rate=None, speed=1.0, loop=False, clock=time.monotonic):
+        if len(ticks.ts) == 0:
+            raise ValueError("مسیر خوراک خالی است")
+        self.ticks = ticks
+        self.exchange_rate = exchange_rate
+        self.speed = speed
+        self.loop = loop
+        self.clock = clock
+        self.started = clock()
+        self._offset = ticks.ts - ticks.ts[0]
+
+    @classmethod
+    def simulated(cls, model, seed=None, n=86400, dt_s=1.0, speed=1.0):
+        """خوراک شبیه‌سازی‌شده (پیوسته تکرار می‌شود)"""
+        path = MarketSimulator(model, seed).generate(n, dt_s)
+        return cls(path.ticks, path.exchange_rate, speed=speed, loop=True)
+
+    def index(self):
+        """شماره تیک جاری بر اساس زمان سپری‌شده"""
+        elapsed_ns = int((self.clock() - self.started) * self.speed * 1e9)
+        span = int(self._offset[-1]) + 1
+        if self.loop:
+            elapsed_ns %= span
+        position = int(np.searchsorted(self._offset, elapsed_ns, side='right')) - 1
+        return min(max(position, 0), len(self._offset) - 1)
+
+    @property
+    def exhausted(self):
+        """پخش (بدون تکرار) به انتهای مسیر رسیده است"""
+        return not self.loop and (self.clock() - self.started) * self.speed * 1e9 > self._offset[-1]
+
+    def price(self, instrument):
+        """قیمت جاری یک بازار ('global'، 'iran' یا 'fx')؛ None برای نمادهای بدون ستون در مسیر"""
+        if instrument == 'fx':
+            column = self.exchange_rate
+        else:
+            column = getattr(self.ticks, f'{instrument}_price', None)
+        if column is None:
+            return None
+        value = float(column[self.index()])
+        return None if np.isnan(value) else value
+
+
+def path_rows(ticks, chunksize=DEFAULT_CHUNKSIZE):
+    """ردیف‌های قابل نوشتن در انبار، تکه‌به‌تکه"""
+    for begin in range(0, len(ticks.ts), chunksize):
+        window = slice(begin, begin + chunksize)
+        yield list(zip(ticks.ts[window].tolist(), *(getattr(ticks, name)[window].tolist() for name in COLUMNS)))
+
+
+def save_ticks(ticks, path):
+    """ذخیره تیک‌ها در فایل CSV یا Parquet (قالب خروجی ردیاب، قابل backfill و replay)"""
+    import pandas as pd
+
+    frame = pd.DataFrame({'ts_ns': ticks.ts, **{name: getattr(ticks, name) for name in COLUMNS}})
+    if str(path).lower().endswith(('.parquet', '.pq')):
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+
+def load_ticks(path, instrument=None, offset_s=0, chunksize=DEFAULT_CHUNKSIZE):
+    """خواندن یک فایل تیک ضبط‌شده (همان قالب‌های backfill) به‌صورت آرایه‌های مرتب"""
+    stamps, values = [], []
+    for chunk in read_chunks(path, chunksize):
+        rows, _ = chunk_to_rows(chunk, instrument, offset_s)
+        if rows:
+            stamps.append(np.array([row[0] for row in rows], dtype=np.int64))
+            values.append(np.array([row[1:] for row in rows], dtype=np.float64))
+    if not stamps:
+        raise ValueError(f"فایل {path} تیک معتبری ندارد")
+
+    ts, values = np.concatenate(stamps), np.concatenate(values)
+    order = np.argsort(ts, kind='stable')
+    return TickArrays(ts[order], *(np.ascontiguousarray(values[order, index]) for index in range(len(COLUMNS))))
@@ -0,0 +1,256 @@
+"""
+🗄️ انبار دائمی تیک‌های قیمت روی دیسک (SQLite در حالت WAL)
+
+هر تیک یک ردیف با زمان (نانوثانیه epoch) به‌عنوان کلید اصلی است؛ پس جدول
+روی زمان مرتب و نمایه‌گذاری شده است. نوشتن‌ها دسته‌ای انجام می‌شوند (با پر
+شدن دسته یا گذشتن max_delay ثانیه از قدیمی‌ترین تیک در صف) و پرس‌وجوی بازه‌ای آرایه‌های پیوسته NumPy برمی‌گرداند، بدون این‌که کل
+تاریخچه در حافظه بارگذاری شود.
+
+قیمت نمادهای دیگر فهرست (طلا، سکه، ارزها و ...) در جدول instrument_ticks
+با کلید (نماد، زمان) و در همان تراکنش تیک‌ها نوشته می‌شوند.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# مسیر پیش‌فرض فایل انبار
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'ticks.sqlite3'
+)
+
+# ستون‌های عددی هر تیک (به‌جز زمان)
+COLUMNS = ('global_price', 'iran_price', 'global_change', 'iran_premium')
+
+# آرایه‌های ستونی یک بازه از تیک‌ها
+TickArrays = namedtuple('TickArrays', ('ts',) + COLUMNS)
+
+
+def empty_arrays(size=0):
+    """آرایه‌های خالی (یا از پیش تخصیص‌یافته) برای یک بازه"""
+    return TickArrays(np.empty(size, dtype=np.int64),
+                      *(np.empty(size, dtype=np.float64) for _ in COLUMNS))
+
+
+def _to_arrays(rows):
+    """تبدیل ردیف‌های SQLite به آرایه‌های ستونی"""
+    ts = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(COLUMNS))
+    return TickArrays(ts, *(np.ascontiguousarray(values[:, index]) for index in range(len(COLUMNS))))
+
+
+class TickStore:
+    """انبار افزایشی تیک‌ها با نوشتن دسته‌ای و خواندن بازه‌ای"""
+
+    def __init__(self, path=None, batch_size=512, max_delay=5.0, clock=time.monotonic):
+        self.path = path or os.environ.get('SILVER_TICK_DB', DEFAULT_PATH)
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.clock = clock
+        self._pending = []
+        self._pending_quotes = []
+        self._pending_since = None  # زمان قدیمی‌ترین تیک در صف
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._writer = self._connect()
+        self._writer.executescript(f"""
+            CREATE TABLE IF NOT EXISTS ticks (
+                ts_ns INTEGER PRIMARY KEY,
+                {', '.join(f'{name} REAL' for name in COLUMNS)}
+            );
+            CREATE TABLE IF NOT EXISTS instrument_ticks (
+                instrument TEXT NOT NULL,
+                ts_ns INTEGER NOT NULL,
+                price REAL,
+                PRIMARY KEY (instrument, ts_ns)
+            ) WITHOUT ROWID;
+        """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _reader(self):
+        """اتصال خواندنی مخصوص هر نخ (خواننده‌ها نویسنده را قفل نمی‌کنند)"""
+        if self.path == ':memory:':
+            return self._writer
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # --- نوشتن -----------------------------------------------------------
+
+    def append(self, ts_ns, global_price, iran_price, global_change, iran_premium):
+        """افزودن یک تیک به صف نوشتن؛ با پر شدن دسته یا گذشتن max_delay نوشته می‌شود"""
+        with self._write_lock:
+            now = self.clock()
+            if self._pending_since is None:
+                self._pending_since = now
+            self._pending.append((int(ts_ns), global_price, iran_price, global_change, iran_premium))
+            if len(self._pending) >= self.batch_size or now - self._pending_since >= self.max_delay:
+                self._flush_locked()
+
+    def append_quotes(self, ts_ns, prices):
+        """افزودن قیمت یک دور همه نمادهای دیگر ({نماد: قیمت})؛ با تیک بعدی یکجا نوشته می‌شود"""
+        with self._write_lock:
+            self._pending_quotes.extend((instrument, int(ts_ns), price) for instrument, price in prices.items())
+
+    def append_many(self, rows):
+        """نوشتن یکجای ردیف‌ها در یک تراکنش؛ تعداد ردیف‌های جدید را برمی‌گرداند"""
+        with self._write_lock:
+            self._flush_locked()
+            return self._insert(rows)
+
+    def merge_many(self, rows):
+        """نوشتن ردیف‌های تاریخچه با تکمیل ستون‌های خالی ردیف‌های موجود
+
+        مقدار موجود هر ستون حفظ می‌شود و فقط ستون‌های NULL (مثلاً قیمت ایران
+        در ردیفی که فقط قیمت جهانی داشته) پر می‌شوند. تعداد ردیف‌های جدید
+        یا تکمیل‌شده برگردانده می‌شود.
+        """
+        placeholders = ', '.join('?' * (len(COLUMNS) + 1))
+        updates = ', '.join(f'{name} = COALESCE(ticks.{name}, excluded.{name})' for name in COLUMNS)
+        missing = ' OR '.join(
+            f'(ticks.{name} IS NULL AND excluded.{name} IS NOT NULL)' for name in COLUMNS
+        )
+        with self._write_lock:
+            self._flush_locked()
+            conn = self._writer
+            before = conn.total_changes
+            conn.execute('BEGIN')
+            try:
+                conn.executemany(
+                    f'INSERT INTO ticks VALUES ({placeholders}) '
+                    f'ON CONFLICT(ts_ns) DO UPDATE SET {updates} WHERE {missing}',
+                    rows
+                )
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+            return conn.total_changes - before
+
+    def flush(self):
+        """نوشتن همه تیک‌های در صف"""
+        with self._write_lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._pending_since = None
+        if self._pending or self._pending_quotes:
+            rows, self._pending = self._pending, []
+            quotes, self._pending_quotes = self._pending_quotes, []
+            self._insert(rows, quotes)
+
+    def _insert(self, rows, quotes=()):
+        placeholders = ', '.join('?' * (len(COLUMNS) + 1))
+        conn = self._writer
+        before = conn.total_changes
+        conn.execute('BEGIN')
+        try:
+            # تیک تکراری (هم‌زمان) نادیده گرفته می‌شود
+            conn.executemany(f'INSERT OR IGNORE INTO ticks VALUES ({placeholders})', rows)
+            # قیمت همه نمادهای دیگر در همان تراکنش
+            if quotes:
+                conn.executemany('INSERT OR IGNORE INTO instrument_ticks VALUES (?, ?, ?)', quotes)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return conn.total_changes - before
+
+    # --- خواندن ----------------------------------------------------------
+
+    @staticmethod
+    def _where(start_ns, end_ns):
+        clauses, params = [], []
+        if start_ns is not None:
+            clauses.append('ts_ns >= ?')
+            params.append(int(start_ns))
+        if end_ns is not None:
+            clauses.append('ts_ns < ?')
+            params.append(int(end_ns))
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def count(self, start_ns=None, end_ns=None):
+        """تعداد تیک‌های یک بازه"""
+        self.flush()
+        where, params = self._where(start_ns, end_ns)
+        return self._reader().execute(f'SELECT COUNT(*) FROM ticks{where}', params).fetchone()[0]
+
+    def range(self, start_ns=None, end_ns=None, chunk_size=65536):
+        """تیک‌های بازه [start, end) به‌صورت آرایه‌های ستونی پیوسته"""
+        self.flush()
+        where, params = self._where(start_ns, end_ns)
+        conn = self._reader()
+
+        # شمارش و خواندن در یک تراکنش تا هر دو یک نما از داده ببینند
+        conn.execute('BEGIN')
+        try:
+            size = conn.execute(f'SELECT COUNT(*) FROM ticks{where}', params).fetchone()[0]
+            arrays = empty_arrays(size)
+            cursor = conn.execute(f'SELECT * FROM ticks{where} ORDER BY ts_ns', params)
+            filled = 0
+            while filled < size:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                stop = filled + len(rows)
+                for column, values in zip(arrays, _to_arrays(rows)):
+                    column[filled:stop] = values
+                filled = stop
+        finally:
+            conn.execute('COMMIT')
+        return TickArrays(*(column[:filled] for column in arrays))
+
+    def iter_chunks(self, start_ns=None, end_ns=None, chunk_size=65536):
+        """پیمایش بازه‌های بزرگ به‌صورت تکه‌به‌تکه با حافظه محدود"""
+        cursor_ns = start_ns
+        while True:
+            where, params = self._where(cursor_ns, end_ns)
+            boundary = self._reader().execute(
+                f'SELECT ts_ns FROM ticks{where} ORDER BY ts_ns LIMIT 1 OFFSET ?',
+                params + [chunk_size]
+            ).fetchone()
+            stop_ns = boundary[0] if boundary else end_ns
+            chunk = self.range(cursor_ns, stop_ns)
+            if len(chunk.ts):
+                yield chunk
+            if boundary is None:
+                return
+            cursor_ns = stop_ns
+
+    def instrument_range(self, instrument, start_ns=None, end_ns=None):
+        """(زمان‌ها، قیمت‌ها) یک نماد دیگر در بازه [start, end)"""
+        self.flush()
+        where, params = self._where(start_ns, end_ns)
+        where = f"{where} AND instrument = ?" if where else ' WHERE instrument = ?'
+        rows = self._reader().execute(
+            f'SELECT ts_ns, price FROM instrument_ticks{where} ORDER BY ts_ns', params + [instrument]
+        ).fetchall()
+        ts = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        prices = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+        return ts, prices
+
+    def last(self, n):
+        """آخرین n تیک به ترتیب زمانی"""
+        self.flush()
+        rows = self._reader().execute(
+            'SELECT * FROM ticks ORDER BY ts_ns DESC LIMIT ?', (int(n),)
+        ).fetchall()
+        return _to_arrays(rows[::-1])
+
+    def close(self):
+        self.flush()
+        self._writer.close()
@@ -0,0 +1,91 @@
+"""
+🧮 جدول تبدیل واحد و ارزش‌گذاری برداری دارایی‌ها
+
+ارزش هر ردیف (مقدار، واحد، عیار) به دلار و تومان با NumPy و یکجا حساب
+می‌شود. فایل‌های بزرگ CSV تکه‌به‌تکه خوانده و نتیجه همان‌طور تکه‌به‌تکه
+نوشته می‌شود تا حافظه محدود بماند.
+"""
+
+import numpy as np
+import pandas as pd
+
+from silver.pricing import GRAMS_PER_OUNCE
+
+# وزن هر واحد به گرم (نام فارسی و معادل‌های لاتین)
+UNIT_GRAMS = {
+    'گرم': 1.0,
+    'اونس': GRAMS_PER_OUNCE,
+    'کیلوگرم': 1000.0,
+    'مثقال': 4.6,
+    'g': 1.0,
+    'gram': 1.0,
+    'oz': GRAMS_PER_OUNCE,
+    'ounce': GRAMS_PER_OUNCE,
+    'kg': 1000.0,
+    'kilogram': 1000.0,
+    'mesghal': 4.6,
+    'mithqal': 4.6,
+}
+
+# عیار مرجع قیمت‌ها (نقره ۹۹۹)
+REFERENCE_PURITY = 0.999
+
+# ستون‌های افزوده‌شده به خروجی
+OUTPUT_COLUMNS = ('grams', 'value_usd', 'value_toman')
+
+
+def to_grams(amount, unit):
+    """تبدیل یک مقدار به گرم"""
+    return amount * UNIT_GRAMS[unit]
+
+
+def normalize_purity(purity):
+    """عیار به کسر (۹۹۹ یا 0.999 هر دو 0.999 می‌شوند)"""
+    purity = np.asarray(purity, dtype=np.float64)
+    return np.where(purity > 1, purity / 1000, purity)
+
+
+def unit_factors(units):
+    """ضریب گرمی هر ردیف؛ واحد ناشناخته NaN می‌شود"""
+    labels, inverse = np.unique(np.asarray(units, dtype=str), return_inverse=True)
+    table = np.array([UNIT_GRAMS.get(label.strip().lower(), np.nan) for label in labels],
+                     dtype=np.float64)
+    return table[inverse.reshape(-1)]
+
+
+def value_holdings(amounts, units, purities, usd_per_ounce, toman_per_gram):
+    """ارزش برداری ردیف‌ها: (گرم، دلار، تومان) برای هر ردیف"""
+    grams = np.asarray(amounts, dtype=np.float64) * unit_factors(units)
+    fine = grams * (normalize_purity(purities) / REFERENCE_PURITY)
+    return grams, fine / GRAMS_PER_OUNCE * usd_per_ounce, fine * toman_per_gram
+
+
+def value_csv(source, target, usd_per_ounce, toman_per_gram, chunksize=100_000):
+    """ارزش‌گذاری CSV با ستون‌های amount, unit, purity
+
+    خروجی هر تکه همان لحظه (UTF-8) در target نوشته می‌شود؛ target می‌تواند
+    فایل متنی یا دودویی باشد و کل جدول هیچ‌وقت یکجا در حافظه ساخته نمی‌شود.
+    """
+    totals = {'rows': 0, 'invalid': 0, 'grams': 0.0, 'value_usd': 0.0, 'value_toman': 0.0}
+    header = True
+    for chunk in pd.read_csv(source, chunksize=chunksize, skipinitialspace=True):
+        chunk.columns = [str(column).strip().lower() for column in chunk.columns]
+        if 'amount' not in chunk or 'unit' not in chunk:
+            raise ValueError("فایل باید ستون‌های amount و unit داشته باشد")
+        # عیار خالی یا نامعتبر همان عیار مرجع فرض می‌شود
+        purity = REFERENCE_PURITY
+        if 'purity' in chunk:
+            purity = pd.to_numeric(chunk['purity'], errors='coerce').fillna(REFERENCE_PURITY).to_numpy()
+
+        amounts = pd.to_numeric(chunk['amount'], errors='coerce').to_numpy(dtype=np.float64)
+        values = value_holdings(amounts, chunk['unit'].astype(str).to_numpy(), purity,
+                                usd_per_ounce, toman_per_gram)
+        for column, value in zip(OUTPUT_COLUMNS, values):
+            chunk[column] = value
+            totals[column] += float(np.nansum(value))
+
+        totals['rows'] += len(chunk)
+        totals['invalid'] += int(np.isnan(values[0]).sum())
+        chunk.to_csv(target, header=header, index=False, encoding='utf-8')
+        header = False
+    return totals
@@ -0,0 +1,12 @@
+"""
+🧪 تنظیمات مشترک آزمون‌ها: هسته اپ (silver/) از پوشه streamlit_app وارد می‌شود
+"""
+
+import os
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit_app')
+sys.path.insert(0, APP_DIR)
+
+# ابزارهای benchmarks/ (مثل سرور منابع ساختگی) از ریشه مخزن
+sys.path.insert(0, os.path.dirname(APP_DIR))
@@ -0,0 +1,62 @@
+"""
+🧪 نمایه مرتب هشدارهای قیمت
+"""
+
+import os
+
+from silver.alerts import AlertBook
+
+
+def test_up_and_down_crossings_fire_once(tmp_path):
+    """عبور رو به بالا و پایین هر هشدار را دقیقاً یک بار اجرا می‌کند"""
+    book = AlertBook(os.path.join(tmp_path, 'alerts.sqlite3'))
+    up = book.add('silver', 31.0, 'above')
+    down = book.add('silver', 29.0, 'below')
+    book.add('silver', 35.0, 'above')
+
+    assert book.evaluate('silver', 30.0) == []
+    fired = book.evaluate('silver', 31.5)
+    assert [item.alert for item in fired] == [up]
+    assert fired[0].price == 31.5
+    # برگشت و عبور دوباره از همان آستانه هشدار را دوباره اجرا نمی‌کند
+    assert book.evaluate('silver', 30.5) == []
+    assert book.evaluate('silver', 31.5) == []
+
+    fired = book.evaluate('silver', 28.0)
+    assert [item.alert for item in fired] == [down]
+    assert book.evaluate('silver', 30.0) == []
+    assert book.evaluate('silver', 28.0) == []
+
+    assert [alert.threshold for alert in book.active('silver')] == [35.0]
+    assert [item.alert.id for item in book.fired_since(0)] == [up.id, down.id]
+
+
+def test_remove_by_id_keeps_equal_thresholds(tmp_path):
+    """حذف با شناسه فقط همان هشدار را از بین آستانه‌های برابر برمی‌دارد"""
+    book = AlertBook(os.path.join(tmp_path, 'alerts.sqlite3'))
+    first = book.add('gold', 2000.0, label='اول')
+    second = book.add('gold', 2000.0, label='دوم')
+
+    assert book.remove(first.id)
+    assert not book.remove(first.id)
+    assert book.active('gold') == [second]
+    assert [item.alert for item in book.evaluate('gold', 1990.0) + book.evaluate('gold', 2010.0)] == [second]
+
+
+def test_alerts_persist_and_reload(tmp_path):
+    """هشدارهای فعال پس از بازکردن دوباره بارگذاری و اجراشده‌ها کنار گذاشته می‌شوند"""
+    path = os.path.join(tmp_path, 'alerts.sqlite3')
+    book = AlertBook(path)
+    kept = book.add('silver', 40.0, 'above', label='سقف')
+    fired = book.add('silver', 32.0, 'above')
+    removed = book.add('silver', 25.0, 'below')
+    book.evaluate('silver', 30.0)
+    book.evaluate('silver', 33.0)
+    book.remove(removed.id)
+    book.close()
+
+    reloaded = AlertBook(path)
+    assert reloaded.active() == [kept]
+    assert fired.id not in {alert.id for alert in reloaded.active()}
+    reloaded.evaluate('silver', 39.0)
+    assert [item.alert for item in reloaded.evaluate('silver', 41.0)] == [kept]
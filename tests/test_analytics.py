@@ -0,0 +1,22 @@
+"""
+🧪 آمار غلتان پریمیوم
+"""
+
+from silver.analytics import RollingWindow
+
+SECOND = 10**9
+
+
+def test_stats_expire_by_read_time_when_feed_stalls():
+    """بدون تیک تازه، مقادیر خارج از پنجره نسبت به زمان خواندن کنار می‌روند"""
+    window = RollingWindow(60)
+    for second, value in ((0, 1.0), (30, 3.0), (50, 5.0)):
+        window.append(second * SECOND, value)
+    assert window.stats(50 * SECOND).count == 3
+
+    stats = window.stats(85 * SECOND)
+    assert stats.count == 2
+    assert stats.mean == 4.0
+    assert (stats.min, stats.max) == (3.0, 5.0)
+
+    assert window.stats(200 * SECOND) is None
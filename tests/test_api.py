@@ -0,0 +1,55 @@
+"""
+🧪 API عکس‌فوری، تاریخچه و جریان SSE روی یک اپ aiohttp آزمایشی
+"""
+
+import asyncio
+import json
+import os
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from silver.api import create_app
+from silver.pipeline import build_poller
+from silver.quote_cache import QuoteCache
+from silver.tick_store import TickStore
+
+
+async def _next_event(response):
+    """(نسخه، داده) رویداد بعدی جریان SSE، بدون پیام‌های نگه‌دارنده"""
+    while True:
+        block = (await asyncio.wait_for(response.content.readuntil(b'\n\n'), 5)).decode('utf-8')
+        if not block.startswith(':'):
+            fields = dict(line.split(': ', 1) for line in block.strip().split('\n'))
+            return int(fields['id']), json.loads(fields['data'])
+
+
+def test_snapshot_request_does_not_swallow_stream_tick(tmp_path, monkeypatch):
+    """درخواست /api/snapshot بین دریافت و دور ناظر تیک را از مشترک SSE نمی‌گیرد"""
+    monkeypatch.setenv('SILVER_SIM_SEED', '7')
+    store = TickStore(os.path.join(tmp_path, 'ticks.sqlite3'))
+    poller = build_poller(cache=QuoteCache(ttl=0), store=store)
+    poller.poll_once()
+
+    async def scenario():
+        async with TestClient(TestServer(create_app(poller, store, interval=0.05))) as client:
+            stream = await client.get('/api/stream')
+            first_version, _ = await _next_event(stream)
+
+            snapshot = poller.poll_once()
+            response = await client.get('/api/snapshot')
+            payload = await response.json()
+            assert payload['version'] == snapshot.version != first_version
+            assert set(payload['premium_stats']['5m']) >= {'count', 'mean', 'std', 'zscore'}
+
+            version, data = await _next_event(stream)
+            assert version == snapshot.version
+            assert data['global_quote']['price'] == snapshot.global_quote.price
+            stream.close()
+
+            response = await client.get('/api/history', params={'start': 0})
+            history = await response.json()
+            assert len(history['ts']) == 2
+            assert history['global_price'][-1] == snapshot.global_quote.price
+            assert (await client.get('/api/history', params={'points': 0})).status == 400
+
+    asyncio.run(scenario())
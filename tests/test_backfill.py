@@ -0,0 +1,56 @@
+"""
+🧪 ورود تکه‌به‌تکه تاریخچه به انبار تیک‌ها
+"""
+
+import os
+
+import numpy as np
+
+from silver.backfill import import_file
+from silver.tick_store import TickStore
+
+SECOND = 10**9
+EPOCH = 1_700_000_000 * SECOND
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(text)
+    return path
+
+
+def test_reimport_writes_nothing(tmp_path):
+    """ورود دوباره همان فایل هیچ ردیفی نمی‌نویسد"""
+    store = TickStore(os.path.join(tmp_path, 'ticks.sqlite3'))
+    path = _write(os.path.join(tmp_path, 'global.csv'), 'Date,Price\n' + ''.join(
+        f'2024-01-{day:02d},"{30 + day / 10:,.2f}"\n' for day in range(1, 11)
+    ))
+
+    first = import_file(path, store, instrument='global', chunksize=4, offset_s=0)
+    second = import_file(path, store, instrument='global', chunksize=4, offset_s=0)
+
+    assert (first['rows'], first['written'], first['invalid']) == (10, 10, 0)
+    assert second['written'] == 0
+    assert store.count() == 10
+
+
+def test_overlapping_ranges_merge_without_duplicates(tmp_path):
+    """بازه‌های هم‌پوشان یک ردیف برای هر زمان می‌سازند و فقط ستون‌های خالی تکمیل می‌شوند"""
+    store = TickStore(os.path.join(tmp_path, 'ticks.sqlite3'))
+    first = _write(os.path.join(tmp_path, 'first.csv'), 'ts_ns,global_price\n' + ''.join(
+        f'{EPOCH + second * SECOND},{30 + second}\n' for second in range(0, 6)
+    ))
+    second = _write(os.path.join(tmp_path, 'second.csv'), 'ts_ns,global_price,iran_price\n' + ''.join(
+        f'{EPOCH + second * SECOND},{99},{40 + second}\n' for second in range(3, 9)
+    ))
+
+    import_file(first, store, chunksize=4)
+    stats = import_file(second, store, chunksize=4)
+
+    ticks = store.range()
+    assert stats['written'] == 6
+    assert ticks.ts.tolist() == [EPOCH + second * SECOND for second in range(9)]
+    # قیمت جهانی موجود حفظ و قیمت ایران در بازه مشترک تکمیل می‌شود
+    assert ticks.global_price.tolist() == [30, 31, 32, 33, 34, 35, 99, 99, 99]
+    assert np.isnan(ticks.iran_price[:3]).all()
+    assert ticks.iran_price[3:].tolist() == [43, 44, 45, 46, 47, 48]
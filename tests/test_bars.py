@@ -0,0 +1,44 @@
+"""
+🧪 کندل‌های افزایشی در برابر ساخت برداری
+"""
+
+import numpy as np
+
+from silver.bars import RESOLUTIONS, BarAggregator, BarSeries, build_bars
+
+SECOND = 10**9
+
+
+def _ticks(n=5000, seed=3):
+    rng = np.random.default_rng(seed)
+    ts = 1_700_000_000 * SECOND + np.cumsum(rng.integers(1, 20, n)) * SECOND
+    prices = 30 + np.cumsum(rng.normal(0, 0.05, n))
+    return ts, prices
+
+
+def test_incremental_bars_match_build_bars():
+    """جمع تیک‌به‌تیک همان کندل‌های build_bars را در همه بازه‌ها می‌سازد"""
+    ts, prices = _ticks()
+    for resolution, seconds in RESOLUTIONS.items():
+        series = BarSeries(seconds, max_bars=10_000, offset_s=12_600)
+        for tick, price in zip(ts.tolist(), prices.tolist()):
+            series.update(tick, price)
+
+        expected = build_bars(ts, prices, seconds, offset_s=12_600)
+        for column, wanted in zip(series.arrays(), expected):
+            np.testing.assert_array_equal(column, wanted, err_msg=resolution)
+
+
+def test_update_after_rebuild_continues_current_bar():
+    """پس از بازسازی از تاریخچه، تیک‌های تازه کندل جاری را ادامه می‌دهند"""
+    ts, prices = _ticks()
+    aggregator = BarAggregator(resolutions=('5m',), offset_s=0)
+    aggregator.rebuild('global', ts[:3000], prices[:3000])
+    closed = []
+    for tick, price in zip(ts[3000:].tolist(), prices[3000:].tolist()):
+        closed.extend(aggregator.update('global', tick, price))
+
+    expected = build_bars(ts, prices, RESOLUTIONS['5m'])
+    for column, wanted in zip(aggregator.bars('global', '5m'), expected):
+        np.testing.assert_array_equal(column, wanted)
+    assert [bar.start_ns for _, bar in closed] == expected.start_ns[-len(closed) - 1:-1].tolist()
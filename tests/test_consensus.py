@@ -0,0 +1,33 @@
+"""
+🧪 اجماع میانه وزن‌دار با حذف پرت (MAD)
+"""
+
+import pytest
+
+from silver.consensus import ConsensusAggregator
+
+
+def _aggregator(quotes, now=1000.0):
+    aggregator = ConsensusAggregator(clock=lambda: now)
+    for source, price in quotes.items():
+        aggregator.record('silver', source, price, received_at=now)
+    return aggregator
+
+
+def test_outlier_among_four_sources_is_rejected():
+    """از چهار منبع، منبع پرت کنار می‌رود و اجماع میانه سه منبع دیگر است"""
+    result = _aggregator({'a': 30.00, 'b': 30.02, 'c': 30.04, 'bad': 36.0}).consensus('silver')
+
+    assert result.rejected == ('bad',)
+    assert set(result.used) == {'a', 'b', 'c'}
+    assert result.price == 30.02
+    assert result.deviations['bad'] == pytest.approx((36.0 - 30.02) / 30.02 * 100)
+
+
+def test_two_sources_fall_back_to_their_mean():
+    """با دو منبع پرتی قابل تشخیص نیست: هر دو نگه داشته می‌شوند و اجماع میانگین آن‌هاست"""
+    result = _aggregator({'a': 30.0, 'b': 33.0}).consensus('silver')
+
+    assert result.rejected == ()
+    assert set(result.used) == {'a', 'b'}
+    assert result.price == pytest.approx(31.5)
@@ -0,0 +1,68 @@
+"""
+🧪 محاسبه تنبل گراف مقادیر مشتق‌شده
+"""
+
+from silver.derived import DerivedGraph, GraphPool
+
+
+def _graph(calls):
+    graph = DerivedGraph()
+
+    @graph.rule('total', 'price', 'rate')
+    def total(price, rate):
+        calls.append('total')
+        return price * rate
+
+    @graph.rule('per_kilo', 'price')
+    def per_kilo(price):
+        calls.append('per_kilo')
+        return price * 1000
+
+    @graph.rule('label', 'total')
+    def label(value):
+        calls.append('label')
+        return f'{value:.0f}'
+
+    return graph
+
+
+def test_only_dirty_dependents_recompute_on_read():
+    """تغییر ورودی فقط وابسته‌های گذرایش را دوباره حساب می‌کند و آن هم هنگام خواندن"""
+    calls = []
+    graph = _graph(calls)
+    graph.set('price', 2.0)
+    graph.set('rate', 10.0)
+    assert calls == []
+
+    assert (graph['label'], graph['per_kilo']) == ('20', 2000.0)
+    assert calls == ['total', 'label', 'per_kilo']
+
+    # ورودی تکراری چیزی را کثیف نمی‌کند
+    assert not graph.set('rate', 10.0)
+    assert (graph['label'], graph['per_kilo']) == ('20', 2000.0)
+    assert graph.recomputed == 3
+
+    calls.clear()
+    assert graph.set('rate', 12.0)
+    assert (graph['label'], graph['per_kilo']) == ('24', 2000.0)
+    assert calls == ['total', 'label']
+
+
+def test_pool_shares_graphs_and_evicts_least_recent():
+    """نشست‌های یک کلید یک گراف مشترک دارند و گراف کم‌استفاده‌ترین کلید کنار می‌رود"""
+    calls = []
+    pool = GraphPool(lambda: _graph(calls), size=2)
+    inputs = {'price': 2.0, 'rate': 10.0}
+
+    assert pool.evaluate('sources', inputs, ('total',)) == {'total': 20.0}
+    assert pool.evaluate('sources', inputs, ('total',)) == {'total': 20.0}
+    assert calls == ['total']
+
+    pool.evaluate(('manual', 11.0), dict(inputs, rate=11.0), ('total',))
+    pool.evaluate('sources', inputs, ('total',))
+    pool.evaluate(('manual', 12.0), dict(inputs, rate=12.0), ('total',))
+    assert len(pool) == 2
+    assert calls == ['total'] * 3
+    # گراف نرخ دستی 11 حذف شده و دوباره ساخته می‌شود
+    pool.evaluate(('manual', 11.0), dict(inputs, rate=11.0), ('total',))
+    assert calls == ['total'] * 4
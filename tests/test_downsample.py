@@ -0,0 +1,45 @@
+"""
+🧪 کاهش نمونه نمودار و کش مشترک اندیس‌ها
+"""
+
+import numpy as np
+
+from silver.downsample import DownsampleMemo, downsample
+from silver.ring_buffer import TickRingBuffer
+
+
+def _buffer(n):
+    buffer = TickRingBuffer(n)
+    prices = 30 + np.sin(np.arange(n) / 50)
+    for index, price in enumerate(prices):
+        buffer.append(index, price, price * 15000, 0.0, 5.0)
+    return buffer
+
+
+def test_memo_reuses_picks_until_buffer_changes():
+    """نقاط هر (نسخه، بازه) یک بار انتخاب و تا تیک بعدی بین فراخوانی‌ها مشترک‌اند"""
+    buffer = _buffer(5000)
+    memo = DownsampleMemo()
+
+    version, recent = buffer.versioned(4000)
+    picked = memo.pick(version, recent, 800)
+    np.testing.assert_array_equal(picked, downsample(recent.ts, (recent.global_price, recent.iran_price), 800))
+    assert memo.pick(*buffer.versioned(4000), 800) is picked
+    assert (memo.hits, memo.misses) == (1, 1)
+
+    # بازه دیگر یا تیک تازه کلید تازه است
+    memo.pick(*buffer.versioned(1000), 800)
+    buffer.append(5000, 31.0, 31.0 * 15000, 0.0, 5.0)
+    version, recent = buffer.versioned(4000)
+    assert memo.pick(version, recent, 800) is not picked
+    assert memo.misses == 3
+
+
+def test_memo_evicts_least_recent_versions():
+    """نسخه‌های قدیمی بافر از کش بیرون می‌روند"""
+    buffer = _buffer(100)
+    memo = DownsampleMemo(size=2)
+    for step in range(4):
+        buffer.append(100 + step, 30.0, 450000.0, 0.0, 5.0)
+        memo.pick(*buffer.versioned(100), 10)
+    assert len(memo._picked) == 2
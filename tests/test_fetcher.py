@@ -0,0 +1,156 @@
+"""
+🧪 خطای منبع در دریافت و قطع‌کننده مدار
+
+آزمون‌های سرور ساختگی همان benchmarks/stub_sources.py را روی حلقه رویداد
+کلاینت HTTP اجرا می‌کنند؛ پس درخواست شرطی، استخر اتصال، محدودیت نرخ و
+قطع‌کننده مدار با پاسخ‌های واقعی HTTP آزموده می‌شوند.
+"""
+
+import time
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+from benchmarks.stub_sources import BASE_PRICES, StubSources
+from silver.fetcher import QuoteSource, fetch_quotes
+from silver.http_client import CircuitBreaker, HttpClient
+
+KEYS = tuple(BASE_PRICES)[:3]
+
+
+@pytest.fixture
+def stub():
+    """(منابع ساختگی، کلاینت، سازنده منبع) روی یک سرور محلی"""
+    sources = StubSources()
+    client = HttpClient(failure_threshold=3, reset_timeout=60)
+    server = TestServer(sources.app())
+    client.run(server.start_server())
+
+    def source(key, **options):
+        options.setdefault('min_interval', 0)
+        return QuoteSource(key, key, 'global', url=str(server.make_url(f'/{key}')), **options)
+
+    yield sources, client, source
+    client.run(server.close())
+    client.close()
+
+
+def _client_with_bodies(bodies):
+    client = HttpClient(failure_threshold=1, reset_timeout=0)
+
+    async def get_text(url):
+        return bodies.pop(0)
+
+    client.get_text = get_text
+    return client
+
+
+def test_invalid_body_is_recorded_and_half_open_trial_reopens():
+    """پاسخ {"price": null} خطای همان منبع است؛ آزمایش ناموفق مدار را دوباره باز می‌کند"""
+    client = _client_with_bodies(['{"price": null}', '{"price": null}', '{"price": 77.5}'])
+    source = QuoteSource('stub', 'Stub', 'global', url='http://127.0.0.1:9/', min_interval=0)
+    healthy = QuoteSource('sim', 'Sim', 'global', simulate=lambda: 77.0)
+    try:
+        first, other = fetch_quotes([source, healthy], client=client)
+        assert not first.ok and other.ok
+        assert client.breaker_state('stub') == CircuitBreaker.OPEN
+
+        # درخواست آزمایشی نیمه‌باز هم خطا می‌دهد: مدار باز می‌شود، نه اینکه نیمه‌باز بماند
+        (trial,) = fetch_quotes([source], client=client)
+        assert not trial.ok
+        assert client.breaker_state('stub') == CircuitBreaker.OPEN
+
+        (recovered,) = fetch_quotes([source], client=client)
+        assert recovered.price == 77.5
+        assert client.breaker_state('stub') == CircuitBreaker.CLOSED
+    finally:
+        client.close()
+
+
+def test_simulator_error_is_source_error():
+    """خطای شبیه‌ساز یک منبع بقیه منابع را متوقف نمی‌کند"""
+    broken = QuoteSource('broken', 'Broken', 'global', simulate=lambda: None)
+    healthy = QuoteSource('sim', 'Sim', 'global', simulate=lambda: 77.0)
+    client = HttpClient()
+    try:
+        failed, ok = fetch_quotes([broken, healthy], client=client)
+    finally:
+        client.close()
+    assert failed.error and not failed.ok
+    assert ok.price == 77.0
+
+
+def test_not_modified_reuses_cached_quote(stub):
+    """پاسخ 304 سرور از بدنه ذخیره‌شده همان قیمت را برمی‌گرداند"""
+    sources, client, source = stub
+    feed = [source(KEYS[0])]
+
+    (first,) = fetch_quotes(feed, client=client)
+    (second,) = fetch_quotes(feed, client=client)
+
+    assert first.price == second.price == BASE_PRICES[KEYS[0]]
+    assert sources.hits[KEYS[0]] == 2
+    assert sources.not_modified == 1
+    assert client.stats()['not_modified'] == 1
+
+
+def test_circuit_opens_after_errors_and_serves_last_good(stub):
+    """پس از خطاهای پیاپی مدار باز می‌شود و آخرین قیمت سالم بدون درخواست برمی‌گردد"""
+    sources, client, source = stub
+    key = KEYS[0]
+    feed = [source(key)]
+    (good,) = fetch_quotes(feed, client=client)
+    assert good.ok
+
+    sources.errors[key] = 1.0
+    for _ in range(3):
+        (failed,) = fetch_quotes(feed, client=client)
+        assert not failed.ok
+    assert client.breaker_state(key) == CircuitBreaker.OPEN
+
+    (fallback,) = fetch_quotes(feed, client=client)
+    assert fallback is good
+    assert sources.hits[key] == 4
+    assert client.stats()['short_circuited'] == 1
+
+
+def test_rate_limit_serves_last_good_without_request(stub):
+    """درخواست زودتر از min_interval به منبع نمی‌رسد"""
+    sources, client, source = stub
+    feed = [source(KEYS[0], min_interval=60)]
+
+    (first,) = fetch_quotes(feed, client=client)
+    (second,) = fetch_quotes(feed, client=client)
+
+    assert second is first
+    assert sources.hits[KEYS[0]] == 1
+    assert client.stats()['rate_limited'] == 1
+
+
+def test_connections_are_reused_across_polls(stub):
+    """دورهای بعدی از اتصال‌های keep-alive استخر استفاده می‌کنند"""
+    sources, client, source = stub
+    feed = [source(key) for key in KEYS]
+
+    for _ in range(5):
+        assert all(quote.ok for quote in fetch_quotes(feed, client=client))
+
+    stats = client.stats()
+    assert stats['requests'] == 5 * len(KEYS)
+    assert stats['connections'] <= len(KEYS)
+
+
+def test_slow_source_times_out_without_blocking_others(stub):
+    """منبع کند با خطای timeout برمی‌گردد، بقیه منابع پاسخ می‌دهند و زمان کل نزدیک مهلت است"""
+    sources, client, source = stub
+    slow, *fast = KEYS
+    sources.slow[slow] = 5.0
+    feed = [source(key, timeout=0.3) for key in KEYS]
+
+    started = time.perf_counter()
+    late, *others = fetch_quotes(feed, client=client)
+    elapsed = time.perf_counter() - started
+
+    assert late.error == 'timeout' and late.price is None
+    assert [quote.price for quote in others] == [BASE_PRICES[key] for key in fast]
+    assert 0.3 <= elapsed < 0.8
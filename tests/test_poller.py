@@ -0,0 +1,47 @@
+"""
+🧪 انتشار عکس‌فوری در نخ دریافت
+"""
+
+import os
+import time
+
+from silver.pipeline import build_poller
+from silver.quote_cache import QuoteCache
+from silver.ring_buffer import TickRingBuffer
+from silver.tick_store import TickStore
+
+
+def _poller(tmp_path, ttl):
+    store = TickStore(os.path.join(tmp_path, 'ticks.sqlite3'))
+    return build_poller(cache=QuoteCache(ttl=ttl), store=store, buffer=TickRingBuffer(16), interval=3600)
+
+
+def test_cached_quotes_do_not_publish_a_duplicate_tick(tmp_path):
+    """دور دوباره در TTL کش همان عکس‌فوری را نگه می‌دارد و تیک تکراری نمی‌نویسد"""
+    poller = _poller(tmp_path, ttl=60)
+    first = poller.poll_once()
+    assert poller.poll_once() is first
+    assert len(poller.buffer) == 1 and poller.store.count() == 1
+
+    poller.cache.invalidate()
+    second = poller.poll_once()
+    assert second.version == first.version + 1
+    assert len(poller.buffer) == 2 and poller.store.count() == 2
+
+
+def test_refresh_inside_ttl_returns_without_new_version(tmp_path):
+    """refresh دستی در TTL بدون انتظار تا مهلت و بدون نسخه تازه برمی‌گردد"""
+    poller = _poller(tmp_path, ttl=60)
+    poller.start()
+    try:
+        assert poller.refresh(timeout=5)
+        version = poller.snapshot.version
+
+        started = time.monotonic()
+        assert poller.refresh(timeout=5)
+        assert time.monotonic() - started < 2
+        assert poller.snapshot.version == version
+        assert len(poller.buffer) == 1
+    finally:
+        poller.stop()
+        poller.join(5)
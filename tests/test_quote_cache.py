@@ -0,0 +1,105 @@
+"""
+🧪 کش قیمت تک‌پرواز بین نشست‌ها
+"""
+
+import threading
+import time
+
+import pytest
+
+from silver.fetcher import QuoteSource, SourceQuote
+from silver.quote_cache import QuoteCache
+
+SOURCES = [QuoteSource(key, key, 'global', simulate=lambda: 30.0) for key in ('a', 'b')]
+
+
+def _quotes(sources):
+    return [SourceQuote(source=s.name, key=s.key, instrument=s.instrument, price=30.0) for s in sources]
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_concurrent_requests_share_one_load():
+    """N فراخوانی هم‌زمان get_many فقط یک بار loader را صدا می‌زنند"""
+    cache = QuoteCache(ttl=60)
+    calls = []
+    release = threading.Event()
+    workers = 8
+
+    def loader(sources):
+        calls.append([source.key for source in sources])
+        release.wait(5)
+        return _quotes(sources)
+
+    results = [None] * workers
+
+    def request(index):
+        results[index] = cache.get_many(SOURCES, loader)
+
+    threads = [threading.Thread(target=request, args=(index,)) for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    # همه منتظر همان پرواز شوند، سپس loader تمام شود
+    _wait_for(lambda: cache.coalesced == (workers - 1) * len(SOURCES))
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [['a', 'b']]
+    assert all([quote.price for quote in result] == [30.0, 30.0] for result in results)
+    assert cache.stats()['misses'] == len(SOURCES)
+
+
+def test_loader_error_clears_in_flight_entry():
+    """خطای loader پرواز را پاک می‌کند؛ منتظرها خطا می‌گیرند و درخواست بعدی دوباره دریافت می‌کند"""
+    cache = QuoteCache(ttl=60, wait_timeout=5)
+    entered, release = threading.Event(), threading.Event()
+
+    def broken(sources):
+        entered.set()
+        release.wait(5)
+        raise RuntimeError('upstream down')
+
+    errors, waited = [], []
+
+    def claim():
+        try:
+            cache.get_many(SOURCES, broken)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    owner = threading.Thread(target=claim)
+    owner.start()
+    entered.wait(5)
+    waiter = threading.Thread(target=lambda: waited.extend(cache.get_many(SOURCES, broken)))
+    waiter.start()
+    _wait_for(lambda: cache.coalesced == len(SOURCES))
+    release.set()
+    owner.join()
+    waiter.join()
+
+    assert len(errors) == 1
+    assert [quote.error for quote in waited] == ['loader failed', 'loader failed']
+    assert cache._flights == {}
+
+    calls = []
+    quotes = cache.get_many(SOURCES, lambda sources: calls.append(sources) or _quotes(sources))
+    assert len(calls) == 1
+    assert all(quote.ok for quote in quotes)
+
+
+def test_fresh_entries_are_hits():
+    """در TTL قیمت‌ها بدون loader از کش خوانده می‌شوند"""
+    cache = QuoteCache(ttl=60)
+    cache.get_many(SOURCES, _quotes)
+
+    def unexpected(sources):
+        pytest.fail('loader نباید صدا زده شود')
+
+    assert all(quote.ok for quote in cache.get_many(SOURCES, unexpected))
+    assert cache.stats()['hits'] == len(SOURCES)
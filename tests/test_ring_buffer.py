@@ -0,0 +1,36 @@
+"""
+🧪 نماهای بدون کپی بافر حلقوی
+"""
+
+import numpy as np
+
+from silver.ring_buffer import TickRingBuffer
+from silver.tick_store import TickArrays
+
+
+def _fill(buffer, start, count):
+    for ts in range(start, start + count):
+        buffer.append(ts, float(ts), 0.0, 0.0, 0.0)
+
+
+def test_full_view_survives_next_append():
+    """نمای کامل (n == ظرفیت) با افزودن بعدی عوض نمی‌شود"""
+    buffer = TickRingBuffer(4)
+    _fill(buffer, 1, 6)
+    view = buffer.last(buffer.capacity)
+    assert view.ts.tolist() == [3, 4, 5, 6]
+
+    _fill(buffer, 7, 1)
+    assert view.ts.tolist() == [3, 4, 5, 6]
+    assert view.global_price.tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert buffer.last(4).ts.tolist() == [4, 5, 6, 7]
+
+
+def test_extend_wraps_and_keeps_latest():
+    """افزودن دسته‌ای بزرگ‌تر از ظرفیت فقط آخرین تیک‌ها را نگه می‌دارد"""
+    buffer = TickRingBuffer(3)
+    _fill(buffer, 1, 2)
+    ts = np.arange(10, 15, dtype=np.int64)
+    buffer.extend(TickArrays(ts, *(ts.astype(np.float64) for _ in range(4))))
+    assert len(buffer) == 3
+    assert buffer.last(10).ts.tolist() == [12, 13, 14]
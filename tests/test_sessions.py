@@ -0,0 +1,36 @@
+"""
+🧪 نشست‌های بیکار: توقف، پاک‌سازی فهرست و آزادسازی حالت نشست
+"""
+
+from silver.sessions import SessionRegistry, release_state
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_idle_sessions_are_detected_and_swept():
+    """نشست بی‌تعامل پس از idle_after بیکار است و sweep مدخلش را حذف می‌کند"""
+    clock = FakeClock()
+    sessions = SessionRegistry(idle_after=60, clock=clock)
+    sessions.touch('left')
+    clock.now = 50
+    sessions.touch('active')
+
+    clock.now = 100
+    assert sessions.is_idle('left') and not sessions.is_idle('active')
+    assert sessions.sweep() == 1
+    assert len(sessions) == 1 and sessions.evicted == 1
+    assert sessions.is_idle('left')
+
+
+def test_release_state_keeps_only_user_settings():
+    """حالت نشست بیکار به‌جز تنظیمات کاربر آزاد می‌شود"""
+    state = {'refresh_every': 30, 'manual_rate': True, 'portfolio_file': object(), 'remove_alert': 3}
+
+    assert release_state(state, ('refresh_every', 'manual_rate', 'alert_seq')) == 2
+    assert state == {'refresh_every': 30, 'manual_rate': True}
@@ -0,0 +1,23 @@
+"""
+🧪 خوراک شبیه‌ساز برای همه نمادهای فهرست
+"""
+
+import os
+
+from silver.pipeline import build_poller
+from silver.quote_cache import QuoteCache
+from silver.tick_store import TickStore
+
+
+def test_seeded_poll_prices_registry_instruments(tmp_path, monkeypatch):
+    """با SILVER_SIM_SEED نمادهای بدون ستون در مسیر (مثل طلا) از شبیه‌ساز عمومی قیمت می‌گیرند"""
+    monkeypatch.setenv('SILVER_SIM_SEED', '42')
+    poller = build_poller(cache=QuoteCache(ttl=0), store=TickStore(os.path.join(tmp_path, 'ticks.sqlite3')))
+
+    snapshot = poller.poll_once()
+
+    assert snapshot is not None
+    assert poller.model.feed is not None
+    assert poller.model.feed.price('gold') is None
+    assert snapshot.quotes['gold']['price'] > 0
+    assert snapshot.global_quote['price'] > 0
@@ -0,0 +1,54 @@
+"""
+🧪 انبار تیک‌های SQLite: نوشتن دسته‌ای و پرس‌وجوی بازه‌ای
+"""
+
+import math
+import os
+
+from silver.tick_store import TickStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _count_rows(store):
+    return store._writer.execute('SELECT COUNT(*) FROM ticks').fetchone()[0]
+
+
+def test_range_is_half_open_and_ordered(tmp_path):
+    """بازه [start, end) به ترتیب زمان و با ستون‌های NULL به‌صورت NaN برمی‌گردد"""
+    store = TickStore(os.path.join(tmp_path, 'ticks.sqlite3'))
+    store.append_many([(ts, 30.0 + ts, None if ts % 20 else 70.0, 0.1, 5.0) for ts in (50, 10, 40, 20, 30)])
+
+    ticks = store.range(start_ns=20, end_ns=50)
+    assert ticks.ts.tolist() == [20, 30, 40]
+    assert ticks.global_price.tolist() == [50.0, 60.0, 70.0]
+    assert ticks.iran_price[0] == 70.0 and math.isnan(ticks.iran_price[1])
+    assert store.count(start_ns=20) == 4
+    assert store.last(2).ts.tolist() == [40, 50]
+    assert [chunk.ts.tolist() for chunk in store.iter_chunks(chunk_size=2)] == [[10, 20], [30, 40], [50]]
+
+
+def test_appends_are_batched_by_size_and_age(tmp_path):
+    """تیک‌ها تا پر شدن دسته یا گذشتن max_delay در صف می‌مانند و خواندن صف را می‌نویسد"""
+    clock = FakeClock()
+    store = TickStore(os.path.join(tmp_path, 'ticks.sqlite3'), batch_size=3, max_delay=10, clock=clock)
+
+    store.append(1, 30.0, 70.0, 0.0, 0.0)
+    store.append(2, 30.0, 70.0, 0.0, 0.0)
+    assert _count_rows(store) == 0
+    store.append(3, 30.0, 70.0, 0.0, 0.0)
+    assert _count_rows(store) == 3
+
+    store.append(4, 30.0, 70.0, 0.0, 0.0)
+    clock.now = 11
+    store.append(5, 30.0, 70.0, 0.0, 0.0)
+    assert _count_rows(store) == 5
+
+    store.append(6, 30.0, 70.0, 0.0, 0.0)
+    assert store.range(start_ns=6).ts.tolist() == [6]